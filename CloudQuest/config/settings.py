@@ -6,27 +6,85 @@
 Configuracoes globais do CloudQuest.
 """
 
+import os
+
 from CloudQuest.utils.paths import APP_PATHS
 
 # Exportar caminhos da aplicacao
 BASE_DIR = APP_PATHS['BASE_DIR']
 APP_DIR = APP_PATHS['APP_DIR'] 
 LOGS_DIR = APP_PATHS['LOGS_DIR']
+DATA_DIR = APP_PATHS['DATA_DIR']
+CACHE_DIR = APP_PATHS['CACHE_DIR']
 PROFILES_DIR = APP_PATHS['PROFILES_DIR']
 ASSETS_DIR = APP_PATHS['ASSETS_DIR']
 ICONS_DIR = APP_PATHS['ICONS_DIR']
 TEMP_PROFILE_FILE = APP_PATHS['TEMP_PROFILE_FILE']
 TEMP_PROFILE_PATH = TEMP_PROFILE_FILE
+PROFILE_INDEX_FILE = DATA_DIR / "profiles_index.json"  # indice dos perfis (busca por AppID/processo/remote)
 
 # Configuracoes do Rclone
-RCLONE_TIMEOUT = 120  # segundos
+RCLONE_TIMEOUT = 120  # segundos (operacoes curtas: cat, rcat, mkdir)
+RCLONE_STALL_TIMEOUT = 120  # segundos sem progresso antes de abortar uma transferencia
+RCLONE_STATS_INTERVAL = 0.5  # segundos entre estatisticas do Rclone
+RCLONE_PROGRESS_LOG_INTERVAL = 5  # segundos entre registros de progresso no log
+PROGRESS_UPDATE_INTERVAL = 0.25  # segundos minimos entre atualizacoes do progresso (notificacao)
+RCLONE_LOG_TAIL_LINES = 50  # linhas do Rclone mantidas para mensagens de erro
 RCLONE_MAX_RETRIES = 3
 RCLONE_RETRY_WAIT = 5  # segundos
+RCLONE_STATE_FILE = DATA_DIR / "rclone_state.json"  # cache das verificacoes preliminares
+
+# Transporte do Rclone: "subprocess" (um processo por operacao) ou "rc"
+# (daemon 'rclone rcd' persistente, compartilhado entre sessoes e perfis)
+RCLONE_TRANSPORT = os.environ.get("CLOUDQUEST_RCLONE_TRANSPORT", "subprocess")
+RCLONE_RC_STATE_FILE = DATA_DIR / "rclone_rcd.json"
+RCLONE_RC_START_TIMEOUT = 15  # segundos
+RCLONE_RC_POLL_INTERVAL = 0.5  # segundos
+
+# Modo de sincronizacao: "files" (arquivo a arquivo), "packed" (um unico
+# pacote compactado na nuvem), "chunked" (blocos deduplicados) ou "auto"
+# (empacota muitos arquivos pequenos)
+SYNC_MODE_DEFAULT = "auto"
+PACKED_MIN_FILES = 200  # "auto" empacota a partir desta quantidade de arquivos...
+PACKED_MAX_SIZE = 64 * 1024 * 1024  # ...se o total nao passar deste tamanho (bytes)
+# Modo "chunked": blocos deduplicados para saves grandes que mudam pouco
+CHUNKED_KEEP_VERSIONS = 3  # indices (versoes) mantidos na nuvem
+
+# Localizacao do processo do jogo
+PROCESS_SCAN_INTERVAL = 0.1  # segundos entre verificacoes de novos processos
+PROCESS_SCAN_TIMEOUT = 60  # segundos ate desistir de encontrar o jogo
+SESSION_REFRESH_INTERVAL = 5  # segundos entre buscas por processos novos (sem subreaper ou com o launcher aberto)
+# Processos que nao mantem a sessao aberta (extensiveis pela chave 'IgnoreProcesses' do perfil)
+SESSION_IGNORED_PROCESSES = [
+    "UnityCrashHandler64", "UnityCrashHandler32", "CrashReportClient", "crashpad_handler", "WerFault",
+    # Processos auxiliares do Wine/Proton
+    "wineserver", "winedevice", "services", "plugplay", "explorer", "rpcss", "svchost", "tabtip", "conhost"
+]
+
+# Checkpoints durante o jogo (envio em segundo plano das alteracoes do LocalDir)
+CHECKPOINT_DEBOUNCE = 10  # segundos sem novas alteracoes antes de enviar
+CHECKPOINT_MIN_INTERVAL = 120  # segundos minimos entre checkpoints
+
+# Sincronizacao de varios perfis (--all / --profiles)
+BATCH_SYNC_WORKERS = 8  # sincronizacoes simultaneas no total
+BATCH_SYNC_PER_REMOTE = 4  # sincronizacoes simultaneas por remote
+
+# Fila persistente de uploads que falharam ou foram interrompidos
+UPLOAD_QUEUE_DB = DATA_DIR / "upload_queue.db"
+UPLOAD_QUEUE_BACKOFF = 60  # segundos ate a primeira nova tentativa (dobra a cada falha)
+UPLOAD_QUEUE_MAX_BACKOFF = 6 * 3600  # espera maxima entre tentativas
+UPLOAD_QUEUE_JOIN_TIMEOUT = 30  # segundos aguardando os uploads pendentes ao fim da sessao
 
 # Configuracoes de notificacao
-NOTIFICATION_DISPLAY_TIME = 5000  # milissegundos
+# Backend: "auto", "gui" (janelas do CloudQuest), "desktop" (notify-send), "log" ou "none"
+NOTIFIER_BACKEND = os.environ.get("CLOUDQUEST_NOTIFIER", "auto")
+NOTIFICATION_DISPLAY_TIME = 5000  # milissegundos (tempo minimo de exibicao)
 NOTIFICATION_WIDTH = 300
 NOTIFICATION_HEIGHT = 75
+NOTIFICATION_MAX_VISIBLE = 3  # notificacoes empilhadas ao mesmo tempo
+NOTIFICATION_SPACING = 10  # pixels entre notificacoes empilhadas
+IMAGE_CACHE_DIR = CACHE_DIR / "images"  # icones ja redimensionados para as notificacoes
+HTTP_CACHE_DIR = CACHE_DIR / "http"  # respostas da PCGamingWiki e da Steam (QuestConfig)
 
 # Configuracoes padrao (podem ser sobrescritas pelos perfis)
 DEFAULT_FONT = "Segoe UI"
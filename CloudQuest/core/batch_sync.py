@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Sincronizacao de varios perfis em paralelo.
+
+Usado para backup ou restauracao de todos os jogos de uma vez (PC novo,
+reinstalacao). Os perfis sao sincronizados por um pool de threads limitado e,
+para nao sobrecarregar um mesmo servico de nuvem, cada remote tem seu proprio
+limite de transferencias simultaneas.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from CloudQuest.config.settings import BATCH_SYNC_WORKERS, BATCH_SYNC_PER_REMOTE
+from CloudQuest.core.profile_manager import load_profile
+from CloudQuest.core.sync_manager import sync_saves
+from CloudQuest.core.notifications import show_notification
+from CloudQuest.utils.logger import log
+
+
+class RemoteLimiter:
+    """Limita as sincronizacoes simultaneas por remote."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def acquire(self, remote):
+        """
+        Retorna o semaforo do remote (use com 'with').
+
+        Args:
+            remote (str): Nome do remote
+        """
+        with self._lock:
+            if remote not in self._semaphores:
+                self._semaphores[remote] = threading.BoundedSemaphore(self.limit)
+            return self._semaphores[remote]
+
+
+def _sync_profile(direction, profile_name, limiter):
+    """Sincroniza um perfil respeitando o limite do seu remote."""
+    start = time.perf_counter()
+    try:
+        remote = load_profile(profile_name)['CloudRemote']
+        with limiter.acquire(remote):
+            success = sync_saves(direction, profile_name, notify=False)
+        error = None if success else "falha na sincronizacao (detalhes no log)"
+    except Exception as e:
+        error = str(e)
+    return {
+        'profile': profile_name,
+        'success': error is None,
+        'error': error,
+        'duration': time.perf_counter() - start
+    }
+
+
+def sync_profiles(direction, profile_names, max_workers=BATCH_SYNC_WORKERS, per_remote=BATCH_SYNC_PER_REMOTE,
+                  notify=True):
+    """
+    Sincroniza varios perfis em paralelo.
+
+    Args:
+        direction (str): 'up' (local→nuvem) ou 'down' (nuvem→local)
+        profile_names (list): Perfis a sincronizar (repetidos sao sincronizados uma vez)
+        max_workers (int): Sincronizacoes simultaneas no total
+        per_remote (int): Sincronizacoes simultaneas por remote
+        notify (bool): Exibir notificacao com o resumo ao final
+
+    Returns:
+        list: Resultado de cada perfil (profile, success, error, duration), na ordem recebida
+    """
+    # Um mesmo perfil sincronizado duas vezes ao mesmo tempo disputaria o
+    # diretorio local, o remote e o manifesto
+    profile_names = list(dict.fromkeys(profile_names))
+    total = len(profile_names)
+    log.info(f"Sincronizando {total} perfil(is) ({direction}): {max_workers} em paralelo, {per_remote} por remote")
+
+    start = time.perf_counter()
+    limiter = RemoteLimiter(per_remote)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="batch-sync") as executor:
+        futures = [executor.submit(_sync_profile, direction, name, limiter) for name in profile_names]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['profile']] = result
+            status = "concluido" if result['success'] else f"FALHOU ({result['error']})"
+            log.info(f"[{len(results)}/{total}] {result['profile']}: {status} em {result['duration']:.1f}s")
+
+    ordered = [results[name] for name in profile_names]
+    _log_summary(ordered, time.perf_counter() - start)
+
+    if notify:
+        failed = sum(1 for result in ordered if not result['success'])
+        notification = show_notification(
+            title="CloudQuest",
+            message=f"{total - failed}/{total} perfis sincronizados",
+            game_name="Todos os perfis" if not failed else f"{failed} falha(s)",
+            direction=direction,
+            notification_type="error" if failed else "info"
+        )
+        if notification:
+            notification.close()
+
+    return ordered
+
+
+def _log_summary(results, elapsed):
+    """Registra o relatorio final da sincronizacao em lote."""
+    failed = [result for result in results if not result['success']]
+    serial_time = sum(result['duration'] for result in results)
+
+    log.info("=== Resumo da sincronizacao ===")
+    log.info(f"Perfis: {len(results)} | Sucesso: {len(results) - len(failed)} | Falhas: {len(failed)}")
+    log.info(f"Tempo total: {elapsed:.1f}s (soma das sincronizacoes: {serial_time:.1f}s)")
+    for result in failed:
+        log.error(f"  {result['profile']}: {result['error']}")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Checkpoints dos saves durante o jogo.
+
+Observa o LocalDir enquanto o jogo roda e, apos um periodo sem novas
+alteracoes, envia em segundo plano apenas os arquivos alterados. Assim uma
+queda de energia ou um Steam Deck que nao volta da suspensao perde no maximo
+o ultimo intervalo, e o upload final ao fechar o jogo quase nao tem o que enviar.
+"""
+
+import os
+import sys
+import time
+import threading
+
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+from CloudQuest.config.settings import CHECKPOINT_DEBOUNCE, CHECKPOINT_MIN_INTERVAL
+from CloudQuest.core.profile_manager import load_profile
+from CloudQuest.core.sync_manager import upload_checkpoint
+from CloudQuest.utils.logger import log
+from CloudQuest.utils.rclone import low_priority
+
+
+def _lower_thread_priority():
+    """Reduz a prioridade de CPU e IO da thread atual (apenas Linux permite por thread)."""
+    # Fora do Linux o ID nativo da thread nao e um PID: setpriority alteraria outro processo
+    if not sys.platform.startswith('linux') or not hasattr(threading, 'get_native_id'):
+        return
+    try:
+        thread_id = threading.get_native_id()
+        os.setpriority(os.PRIO_PROCESS, thread_id, 10)
+        import psutil
+        thread = psutil.Process(thread_id)
+        if hasattr(thread, 'ionice') and hasattr(psutil, 'IOPRIO_CLASS_IDLE'):
+            thread.ionice(psutil.IOPRIO_CLASS_IDLE)
+    except Exception as e:
+        log.debug(f"Falha ao reduzir prioridade da thread de checkpoint: {e}")
+
+
+class CheckpointUploader:
+    """Envia checkpoints dos saves em segundo plano enquanto o jogo roda."""
+
+    class ChangeHandler(FileSystemEventHandler):
+        def __init__(self, uploader):
+            self.uploader = uploader
+
+        def on_any_event(self, event):
+            if not event.is_directory:
+                self.uploader.notify_change()
+
+    def __init__(self, profile_name, min_interval=CHECKPOINT_MIN_INTERVAL, debounce=CHECKPOINT_DEBOUNCE):
+        """
+        Args:
+            profile_name (str): Nome do perfil
+            min_interval (float): Segundos minimos entre checkpoints
+            debounce (float): Segundos sem alteracoes antes de enviar
+        """
+        self.profile_name = profile_name
+        self.min_interval = min_interval
+        self.debounce = debounce
+        self.checkpoints = 0
+
+        self._observer = None
+        self._thread = None
+        self._changed = threading.Event()
+        self._stopping = threading.Event()
+        self._last_change = 0.0
+        self._last_checkpoint = 0.0
+
+    def notify_change(self):
+        """Registra uma alteracao no LocalDir (eventos sao agrupados ate o envio)."""
+        self._last_change = time.monotonic()
+        self._changed.set()
+
+    def start(self):
+        """Inicia a observacao do LocalDir e a thread de envio."""
+        local_dir = load_profile(self.profile_name)['LocalDir']
+        self._last_checkpoint = time.monotonic()
+
+        self._observer = Observer()
+        self._observer.schedule(self.ChangeHandler(self), local_dir, recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+
+        self._thread = threading.Thread(target=self._run, name="checkpoint", daemon=True)
+        self._thread.start()
+        log.info(f"Checkpoints ativados em {local_dir} (intervalo minimo: {self.min_interval:.0f}s)")
+
+    def stop(self, timeout=None):
+        """
+        Para a observacao e aguarda um checkpoint em andamento terminar.
+
+        Args:
+            timeout (float, optional): Tempo maximo de espera em segundos
+        """
+        self._stopping.set()
+        self._changed.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer.join(timeout)
+        if self._thread:
+            self._thread.join(timeout)
+        log.info(f"Checkpoints encerrados ({self.checkpoints} concluido(s))")
+
+    def _wait_until_ready(self):
+        """Aguarda o fim da rajada de alteracoes e o intervalo minimo. Retorna False ao parar."""
+        while not self._stopping.is_set():
+            now = time.monotonic()
+            ready_at = max(self._last_change + self.debounce, self._last_checkpoint + self.min_interval)
+            if now >= ready_at:
+                return True
+            self._stopping.wait(ready_at - now)
+        return False
+
+    def _run(self):
+        _lower_thread_priority()
+        while True:
+            self._changed.wait()
+            if self._stopping.is_set() or not self._wait_until_ready():
+                return
+
+            # Alteracoes durante o envio disparam um novo checkpoint
+            self._changed.clear()
+            self._last_checkpoint = time.monotonic()
+            try:
+                with low_priority():
+                    if upload_checkpoint(self.profile_name):
+                        self.checkpoints += 1
+            except Exception as e:
+                log.warning(f"Falha no checkpoint (nova tentativa na proxima alteracao): {e}")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Modo de sincronizacao em blocos deduplicados.
+
+Para saves grandes em que pouco muda por sessao, cada arquivo e dividido em
+blocos definidos pelo conteudo (CloudQuest.utils.cdc) e cada bloco e gravado
+uma unica vez em '.cloudquest_chunks/<hash>'. Cada upload grava um indice
+('.cloudquest_index/<versao>.json') com a lista de blocos de cada arquivo, e o
+manifesto remoto aponta para o indice atual. Upload e download transferem
+apenas blocos ainda ausentes no destino. Tudo e armazenado como objetos
+comuns, funcionando em qualquer remote do Rclone.
+"""
+
+import os
+import json
+import uuid
+import hashlib
+import tempfile
+from datetime import datetime
+
+from CloudQuest.config.settings import CACHE_DIR, PROFILES_DIR, CHUNKED_KEEP_VERSIONS
+from CloudQuest.core.manifest import build_manifest, load_manifest
+from CloudQuest.utils.cdc import chunk_file
+from CloudQuest.utils.fileio import write_json_atomic
+from CloudQuest.utils.logger import log
+from CloudQuest.utils.rclone import (
+    execute_rclone_sync, read_remote_file, write_remote_file, join_remote_path,
+    list_remote_files, delete_remote_files
+)
+
+CHUNKS_DIR_NAME = ".cloudquest_chunks"
+INDEX_DIR_NAME = ".cloudquest_index"
+INDEX_VERSION = 1
+CHUNK_CACHE_VERSION = 1
+CHUNK_CACHE_SUFFIX = ".chunks"
+
+
+def _staging_root():
+    """Diretorio dos blocos temporarios (cache: nao fica junto de perfis e manifestos)."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return CACHE_DIR
+
+
+def _get_cache_path(profile_name):
+    return PROFILES_DIR / f"{profile_name}{CHUNK_CACHE_SUFFIX}"
+
+
+def load_chunk_cache(profile_name):
+    """
+    Carrega a lista de blocos conhecida para cada conteudo (hash do arquivo).
+
+    Como a chave e o hash do conteudo, a lista continua valida mesmo que o
+    arquivo seja renomeado ou tenha o mtime alterado.
+
+    Args:
+        profile_name (str): Nome do perfil
+
+    Returns:
+        dict: {hash do arquivo: [[hash do bloco, tamanho], ...]}
+    """
+    try:
+        with open(_get_cache_path(profile_name), 'r', encoding='utf-8') as file:
+            cache = json.load(file)
+        if cache.get('version') == CHUNK_CACHE_VERSION:
+            return cache.get('files', {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def save_chunk_cache(profile_name, cache, keep_hashes):
+    """
+    Salva a lista de blocos, mantendo apenas os conteudos informados.
+
+    Args:
+        profile_name (str): Nome do perfil
+        cache (dict): Listas de blocos por hash de arquivo
+        keep_hashes (set): Hashes de arquivo a manter
+    """
+    files = {file_hash: chunks for file_hash, chunks in cache.items() if file_hash in keep_hashes}
+    try:
+        write_json_atomic(_get_cache_path(profile_name), {'version': CHUNK_CACHE_VERSION, 'files': files},
+                          separators=(',', ':'))
+    except OSError as e:
+        log.warning(f"Falha ao salvar lista de blocos do perfil {profile_name}: {e}")
+
+
+def _locate_local_chunks(local_dir, manifest, cache):
+    """Mapeia cada bloco ja presente nos arquivos locais para (caminho, deslocamento, tamanho)."""
+    sources = {}
+    for relative, entry in (manifest or {}).get('files', {}).items():
+        offset = 0
+        for chunk_hash, length in cache.get(entry['hash'], []):
+            sources.setdefault(chunk_hash, (os.path.join(local_dir, relative), offset, length))
+            offset += length
+    return sources
+
+
+def upload_chunked(profile_name, rclone_path, local_dir, remote_dir, manifest):
+    """
+    Envia os blocos novos dos arquivos do manifesto e grava um novo indice.
+
+    Args:
+        profile_name (str): Nome do perfil
+        rclone_path (str): Caminho para o executavel do Rclone
+        local_dir (str): Diretorio local dos saves
+        remote_dir (str): Diretorio remoto (remote:dir)
+        manifest (dict): Manifesto dos arquivos enviados
+
+    Returns:
+        dict: Campos do manifesto remoto ({'index': caminho do indice})
+
+    Raises:
+        Exception: Se o envio dos blocos ou do indice falhar
+    """
+    chunks_remote = join_remote_path(remote_dir, CHUNKS_DIR_NAME)
+    remote_chunks = set(list_remote_files(rclone_path, chunks_remote))
+    cache = load_chunk_cache(profile_name)
+
+    index_files = {}
+    new_chunks = []
+    new_bytes = 0
+    total_chunks = set()
+
+    with tempfile.TemporaryDirectory(prefix="cloudquest_chunks_", dir=_staging_root()) as staging_dir:
+        staged = set()
+        for relative, entry in sorted(manifest['files'].items()):
+            chunks = cache.get(entry['hash'])
+            if chunks is None or any(chunk_hash not in remote_chunks for chunk_hash, _ in chunks):
+                # Conteudo novo (ou blocos ausentes na nuvem): dividir o arquivo
+                chunks = []
+                for chunk_hash, data in chunk_file(os.path.join(local_dir, relative)):
+                    chunks.append([chunk_hash, len(data)])
+                    if chunk_hash not in remote_chunks and chunk_hash not in staged:
+                        with open(os.path.join(staging_dir, chunk_hash), 'wb') as file:
+                            file.write(data)
+                        staged.add(chunk_hash)
+                        new_chunks.append(chunk_hash)
+                        new_bytes += len(data)
+                cache[entry['hash']] = chunks
+
+            total_chunks.update(chunk_hash for chunk_hash, _ in chunks)
+            index_files[relative] = dict(entry, chunks=chunks)
+
+        log.info(f"Blocos: {len(new_chunks)} novo(s) de {len(total_chunks)} ({new_bytes} bytes a enviar)")
+        if new_chunks:
+            execute_rclone_sync(rclone_path, staging_dir, chunks_remote, files=new_chunks, update=False)
+
+    index_name = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.json"
+    index_path = f"{INDEX_DIR_NAME}/{index_name}"
+    content = json.dumps({'version': INDEX_VERSION, 'files': index_files}, separators=(',', ':'))
+    if not write_remote_file(rclone_path, join_remote_path(remote_dir, index_path), content):
+        raise Exception(f"Falha ao gravar indice de blocos: {index_path}")
+
+    save_chunk_cache(profile_name, cache, {entry['hash'] for entry in manifest['files'].values()})
+    return {'index': index_path}
+
+
+def _read_index(rclone_path, remote_dir, index_path):
+    content = read_remote_file(rclone_path, join_remote_path(remote_dir, index_path))
+    if not content:
+        raise Exception(f"Indice de blocos nao encontrado: {index_path}")
+    return json.loads(content)
+
+
+def download_chunked(profile_name, rclone_path, remote_dir, local_dir, remote_manifest, files=None, update=True):
+    """
+    Reconstroi os arquivos alterados a partir dos blocos locais e dos que faltam na nuvem.
+
+    Os arquivos sao montados em temporarios no proprio diretorio, conferidos
+    pelo hash e so entao substituem os originais.
+
+    Args:
+        profile_name (str): Nome do perfil
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_dir (str): Diretorio remoto (remote:dir)
+        local_dir (str): Diretorio local dos saves
+        remote_manifest (dict): Manifesto remoto (com o campo 'index')
+        files (list, optional): Limitar aos caminhos informados
+        update (bool): Manter arquivos locais mais novos que os da nuvem
+    """
+    index = _read_index(rclone_path, remote_dir, remote_manifest['index'])
+    wanted = set(files) if files is not None else None
+    local_manifest = build_manifest(local_dir, load_manifest(profile_name))
+    local_files = local_manifest['files']
+    cache = load_chunk_cache(profile_name)
+
+    targets = {}
+    for relative, entry in index['files'].items():
+        cache[entry['hash']] = entry['chunks']
+        if wanted is not None and relative not in wanted:
+            continue
+        known = local_files.get(relative)
+        if known and known['hash'] == entry['hash']:
+            continue
+        if update and known and known['mtime'] > entry.get('mtime', 0):
+            log.debug(f"Arquivo local mais novo mantido: {relative}")
+            continue
+        targets[relative] = entry
+
+    keep_hashes = {entry['hash'] for entry in index['files'].values()}
+    keep_hashes.update(entry['hash'] for entry in local_files.values())
+
+    if not targets:
+        log.info("Nenhum arquivo a reconstruir")
+        save_chunk_cache(profile_name, cache, keep_hashes)
+        return
+
+    # Versoes locais ainda nao divididas (ex: alteradas fora de uma sincronizacao)
+    # costumam compartilhar a maior parte dos blocos com a versao da nuvem
+    for relative in targets:
+        known = local_files.get(relative)
+        if known and known['hash'] not in cache:
+            try:
+                cache[known['hash']] = [[chunk_hash, len(data)] for chunk_hash, data
+                                        in chunk_file(os.path.join(local_dir, relative))]
+            except OSError as e:
+                log.debug(f"Falha ao dividir {relative}: {e}")
+
+    sources = _locate_local_chunks(local_dir, local_manifest, cache)
+    needed = sorted({chunk_hash for entry in targets.values() for chunk_hash, _ in entry['chunks']
+                     if chunk_hash not in sources})
+    log.info(f"Reconstruindo {len(targets)} arquivo(s): {len(needed)} bloco(s) a baixar")
+
+    with tempfile.TemporaryDirectory(prefix="cloudquest_chunks_", dir=_staging_root()) as fetched_dir:
+        if needed:
+            execute_rclone_sync(rclone_path, join_remote_path(remote_dir, CHUNKS_DIR_NAME), fetched_dir,
+                                files=needed, update=False)
+
+        handles = {}
+        staged = {}
+        try:
+            # Montar todos antes de substituir: os blocos locais vem dos arquivos atuais
+            for relative, entry in targets.items():
+                target = os.path.join(local_dir, relative)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(prefix=".cloudquest-", dir=os.path.dirname(target))
+                staged[relative] = temp_path
+
+                digest = hashlib.sha256()
+                with os.fdopen(fd, 'wb') as output:
+                    for chunk_hash, length in entry['chunks']:
+                        if chunk_hash in sources:
+                            path, offset, _ = sources[chunk_hash]
+                            if path not in handles:
+                                handles[path] = open(path, 'rb')
+                            handles[path].seek(offset)
+                            data = handles[path].read(length)
+                        else:
+                            with open(os.path.join(fetched_dir, chunk_hash), 'rb') as file:
+                                data = file.read()
+                        digest.update(data)
+                        output.write(data)
+
+                if digest.hexdigest() != entry['hash']:
+                    raise ValueError(f"Hash divergente ao reconstruir {relative}")
+                if entry.get('mtime'):
+                    os.utime(temp_path, ns=(entry['mtime'], entry['mtime']))
+        except BaseException:
+            for temp_path in staged.values():
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+            raise
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+        for relative, temp_path in staged.items():
+            os.replace(temp_path, os.path.join(local_dir, relative))
+
+    save_chunk_cache(profile_name, cache, keep_hashes)
+    log.info("Arquivos reconstruidos")
+
+
+def prune_chunk_store(rclone_path, remote_dir, current_index):
+    """
+    Remove indices antigos e os blocos referenciados apenas por eles.
+
+    Mantem as ultimas CHUNKED_KEEP_VERSIONS versoes. Blocos sem indice (ex:
+    envio em andamento em outra maquina) nunca sao removidos.
+
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_dir (str): Diretorio remoto (remote:dir)
+        current_index (str): Indice recem-publicado (sempre mantido)
+    """
+    index_remote = join_remote_path(remote_dir, INDEX_DIR_NAME)
+    names = sorted(list_remote_files(rclone_path, index_remote))
+    current_name = current_index.split('/', 1)[1]
+    previous = [name for name in names if name != current_name]
+    kept = (previous[-(CHUNKED_KEEP_VERSIONS - 1):] if CHUNKED_KEEP_VERSIONS > 1 else []) + [current_name]
+    dropped = [name for name in names if name not in kept]
+    if not dropped:
+        return
+
+    def referenced(names):
+        chunks = set()
+        for name in names:
+            index = _read_index(rclone_path, remote_dir, f"{INDEX_DIR_NAME}/{name}")
+            for entry in index['files'].values():
+                chunks.update(chunk_hash for chunk_hash, _ in entry['chunks'])
+        return chunks
+
+    orphaned = sorted(referenced(dropped) - referenced(kept))
+    delete_remote_files(rclone_path, join_remote_path(remote_dir, CHUNKS_DIR_NAME), orphaned)
+    delete_remote_files(rclone_path, index_remote, dropped)
+    log.info(f"Versoes antigas removidas: {len(dropped)} indice(s), {len(orphaned)} bloco(s)")
@@ -5,13 +5,16 @@ CloudQuest - Gerenciador de inicializacao do jogo.
 """
 
 import os
-import time
+import signal
 import subprocess
 import psutil
 
+from CloudQuest.config.settings import PROCESS_SCAN_TIMEOUT
 from CloudQuest.core.profile_manager import load_profile
+from CloudQuest.core.process_finder import find_game_process
+from CloudQuest.core.session_tracker import SessionTracker, enable_subreaper
 from CloudQuest.utils.logger import log
-from CloudQuest.core.notification_ui import show_notification
+from CloudQuest.core.notifications import show_notification
 
 def launch_game(profile_name):
     """
@@ -21,7 +24,7 @@ def launch_game(profile_name):
         profile_name (str): Nome do perfil a ser usado
         
     Returns:
-        process: Objeto do processo do jogo
+        tuple: (objeto do processo do jogo, PID do launcher)
     """
     profile = load_profile(profile_name)
     launcher_path = profile['ExecutablePath']
@@ -39,7 +42,6 @@ def launch_game(profile_name):
             game_name=profile.get('GameName', 'Erro'),
             notification_type="error"
         )
-        time.sleep(5)
         if error_notification:
             error_notification.close()
             
@@ -59,30 +61,12 @@ def launch_game(profile_name):
         
         # Aguardar o processo do jogo iniciar
         log.info(f"Aguardando processo do jogo: {game_process_name}")
-        timeout = 60  # segundos
-        start_time = time.time()
-        game_process = None
-        
-        while not game_process and (time.time() - start_time) < timeout:
-            # Procurar pelo processo do jogo
-            for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    # Verificar se o nome do processo corresponde, independente da extensao
-                    base_name = os.path.splitext(proc.info['name'])[0].lower()
-                    if base_name == game_process_name.lower():
-                        game_process = proc
-                        log.info(f"Processo do jogo encontrado (PID: {proc.pid})")
-                        break
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-                    
-            if not game_process:
-                time.sleep(1)
+        game_process = find_game_process(game_process_name, launcher_pid=launcher_process.pid)
         
         if not game_process:
-            raise TimeoutError(f"Processo do jogo nao iniciado apos {timeout} segundos")
+            raise TimeoutError(f"Processo do jogo nao iniciado apos {PROCESS_SCAN_TIMEOUT} segundos")
             
-        return game_process
+        return game_process, launcher_process.pid
         
     except Exception as e:
         log.error(f"Erro ao iniciar o launcher: {str(e)}")
@@ -94,32 +78,95 @@ def launch_game(profile_name):
             game_name=profile.get('GameName', 'Erro'),
             notification_type="error"
         )
-        time.sleep(5)
         if error_notification:
             error_notification.close()
             
         raise
 
 
-def wait_for_game(game_process):
+def start_wrapped_game(command):
+    """
+    Inicia o comando do jogo como processo filho (modo --wrap).
+    
+    Usado como opcao de inicializacao do Steam (cloudquest --wrap <perfil> -- %command%):
+    o processo do jogo e o proprio filho, sem precisar procura-lo pelo nome.
+    Sinais de encerramento recebidos pelo CloudQuest sao repassados ao jogo,
+    para que os saves ainda sejam enviados depois que ele fechar.
+    
+    Args:
+        command (list): Comando do jogo e seus argumentos
+        
+    Returns:
+        subprocess.Popen: Processo do jogo
+    """
+    log.info(f"Iniciando comando do jogo: {subprocess.list2cmdline(command)}")
+    enable_subreaper()
+    game_process = subprocess.Popen(command)
+    log.info(f"Jogo iniciado (PID: {game_process.pid})")
+    
+    def forward_signal(signum, frame):
+        log.info(f"Sinal {signum} recebido, repassando ao jogo")
+        game_process.send_signal(signum)
+    
+    for name in ('SIGTERM', 'SIGINT', 'SIGHUP'):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), forward_signal)
+    
+    return game_process
+
+
+def exit_status(game_process):
+    """
+    Converte o codigo de saida do processo do jogo para repassa-lo ao shell/Steam.
+    
+    Args:
+        game_process (subprocess.Popen): Processo finalizado
+        
+    Returns:
+        int: Codigo de saida (128 + sinal se encerrado por sinal)
+    """
+    returncode = game_process.returncode
+    if returncode is None:
+        return 0
+    return 128 - returncode if returncode < 0 else returncode
+
+
+def wait_for_game(game_process, profile=None, launcher_pid=None):
     """
-    Aguarda o jogo ser finalizado.
+    Aguarda o fim da sessao de jogo.
+    
+    Alem do processo do jogo, acompanha todos os seus descendentes e, se o
+    CloudQuest iniciou um launcher, os processos do jogo reiniciados por ele.
+    A espera e feita pelo sistema operacional (pidfd no Linux, kqueue no
+    macOS/BSD), sem consumir CPU durante o jogo; veja session_tracker.
     
     Args:
-        game_process: Objeto do processo do jogo
+        game_process: Objeto do processo do jogo (psutil.Process ou
+            subprocess.Popen no modo --wrap)
+        profile (dict, optional): Perfil com as chaves opcionais 'IgnoreProcesses'
+            (nomes que nao mantem a sessao aberta) e 'WaitForLauncher'
+        launcher_pid (int, optional): PID do launcher iniciado pelo CloudQuest
     """
+    profile = profile or {}
     log.info(f"Monitorando processo do jogo (PID: {game_process.pid})...")
     
     try:
-        # Verificar se o processo ainda esta em execucao
-        while game_process.is_running() and not game_process.status() == psutil.STATUS_ZOMBIE:
-            # Aguardar, verificando periodicamente
-            time.sleep(0.5)
-            
+        tracker = SessionTracker(
+            game_process.pid,
+            game_process_name=profile.get('GameProcess'),
+            launcher_pid=launcher_pid,
+            ignore_names=profile.get('IgnoreProcesses'),
+            wait_for_launcher=bool(profile.get('WaitForLauncher', False))
+        )
+        tracker.wait()
     except psutil.NoSuchProcess:
         log.info(f"Processo nao encontrado (PID: {game_process.pid})")
     except Exception as e:
         log.error(f"Erro ao monitorar processo: {str(e)}")
+    
+    if isinstance(game_process, subprocess.Popen):
+        # Processo filho: coletar o codigo de saida
+        game_process.wait()
         
     log.info(f"Processo finalizado (PID: {game_process.pid})")
 
@@ -140,28 +187,10 @@ def unix_launch_game(profile_name):
     # Procurar pelo processo do jogo
     try:
         log.info(f"Procurando pelo processo do jogo no Linux: {game_process_name}")
-        timeout = 60  # segundos
-        start_time = time.time()
-        game_process = None
-        
-        while not game_process and (time.time() - start_time) < timeout:
-            # Procurar pelo processo do jogo
-            for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    # Verificar se o nome do processo corresponde, independente da extensao
-                    base_name = os.path.splitext(proc.info['name'])[0].lower()
-                    if base_name == game_process_name.lower():
-                        game_process = proc
-                        log.info(f"Processo do jogo encontrado (PID: {proc.pid})")
-                        break
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-                    
-            if not game_process:
-                time.sleep(1)
+        game_process = find_game_process(game_process_name)
         
         if not game_process:
-            raise TimeoutError(f"Processo do jogo '{game_process_name}' nao encontrado apos {timeout} segundos")
+            raise TimeoutError(f"Processo do jogo '{game_process_name}' nao encontrado apos {PROCESS_SCAN_TIMEOUT} segundos")
             
         return game_process
         
@@ -175,7 +204,6 @@ def unix_launch_game(profile_name):
             game_name=profile.get('GameName', 'Erro'),
             notification_type="error"
         )
-        time.sleep(5)
         if error_notification:
             error_notification.close()
             
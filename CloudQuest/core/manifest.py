@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Manifestos dos saves.
+
+O manifesto local registra caminho, tamanho, mtime e hash de cada arquivo do
+LocalDir apos cada sincronizacao bem-sucedida, permitindo pular o Rclone
+quando nada mudou. Uma copia com numero de revisao e publicada no CloudDir a
+cada upload, para que o download decida o que transferir com uma unica leitura.
+"""
+
+import os
+import json
+import uuid
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+from CloudQuest.config.settings import PROFILES_DIR
+from CloudQuest.utils.fileio import write_json_atomic
+from CloudQuest.utils.logger import log
+from CloudQuest.utils.rclone import read_remote_file, write_remote_file, join_remote_path
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest"
+REMOTE_MANIFEST_NAME = ".cloudquest_manifest.json"
+HASH_BLOCK_SIZE = 1024 * 1024  # 1 MiB
+
+
+def get_manifest_path(profile_name):
+    """
+    Retorna o caminho do manifesto de um perfil (ao lado do JSON do perfil).
+
+    Args:
+        profile_name (str): Nome do perfil
+
+    Returns:
+        Path: Caminho do arquivo de manifesto
+    """
+    return PROFILES_DIR / f"{profile_name}{MANIFEST_SUFFIX}"
+
+
+def hash_file(path):
+    """
+    Calcula o hash SHA-256 do conteudo de um arquivo.
+
+    Args:
+        path (str | Path): Caminho do arquivo
+
+    Returns:
+        str: Hash em hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _scan_files(root):
+    """
+    Percorre recursivamente o diretorio retornando (caminho relativo, DirEntry).
+
+    Links simbolicos (para arquivos ou diretorios) sao ignorados, como no
+    Rclone sem --copy-links: nenhum modo de sincronizacao os envia.
+    """
+    stack = [(root, "")]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    relative = f"{prefix}{entry.name}"
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, f"{relative}/"))
+                        elif entry.is_file(follow_symlinks=False):
+                            yield relative, entry
+                    except OSError:
+                        continue
+        except OSError as e:
+            log.warning(f"Falha ao listar diretorio {current}: {e}")
+
+
+def build_manifest(local_dir, previous=None):
+    """
+    Gera o manifesto atual do diretorio local.
+
+    Arquivos com tamanho e mtime iguais aos do manifesto anterior reaproveitam
+    o hash registrado, evitando reler o conteudo.
+
+    Args:
+        local_dir (str | Path): Diretorio local dos saves
+        previous (dict, optional): Manifesto anterior
+
+    Returns:
+        dict: Manifesto com as entradas de cada arquivo
+    """
+    previous_files = (previous or {}).get('files', {})
+    files = {}
+
+    root = Path(local_dir)
+    if root.is_dir():
+        for relative, entry in _scan_files(str(root)):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            known = previous_files.get(relative)
+            if known and known.get('size') == stat.st_size and known.get('mtime') == stat.st_mtime_ns:
+                file_hash = known['hash']
+            else:
+                try:
+                    file_hash = hash_file(entry.path)
+                except OSError as e:
+                    log.warning(f"Falha ao calcular hash de {entry.path}: {e}")
+                    continue
+
+            files[relative] = {
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'hash': file_hash
+            }
+
+    return {'version': MANIFEST_VERSION, 'files': files}
+
+
+def diff_manifests(old, new):
+    """
+    Compara dois manifestos pelo conteudo (tamanho e hash) dos arquivos.
+
+    Args:
+        old (dict): Manifesto anterior
+        new (dict): Manifesto atual
+
+    Returns:
+        list: Caminhos relativos adicionados, alterados ou removidos
+    """
+    old_files = (old or {}).get('files', {})
+    new_files = (new or {}).get('files', {})
+
+    changed = []
+    for relative, entry in new_files.items():
+        known = old_files.get(relative)
+        if not known or known.get('size') != entry['size'] or known.get('hash') != entry['hash']:
+            changed.append(relative)
+
+    changed.extend(relative for relative in old_files if relative not in new_files)
+    return sorted(changed)
+
+
+def load_manifest(profile_name):
+    """
+    Carrega o manifesto salvo de um perfil.
+
+    Args:
+        profile_name (str): Nome do perfil
+
+    Returns:
+        dict: Manifesto ou None se inexistente/invalido
+    """
+    manifest_path = get_manifest_path(profile_name)
+    if not manifest_path.exists():
+        return None
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+
+        if manifest.get('version') != MANIFEST_VERSION or not isinstance(manifest.get('files'), dict):
+            log.warning(f"Manifesto em formato desconhecido, ignorando: {manifest_path}")
+            return None
+
+        return manifest
+    except (OSError, ValueError) as e:
+        log.warning(f"Falha ao ler manifesto {manifest_path}: {e}")
+        return None
+
+
+def files_to_download(remote_manifest, local_manifest):
+    """
+    Lista os arquivos do manifesto remoto ausentes ou diferentes no local.
+
+    Args:
+        remote_manifest (dict): Manifesto publicado na nuvem
+        local_manifest (dict): Manifesto atual do diretorio local
+
+    Returns:
+        list: Caminhos relativos a serem baixados
+    """
+    local_files = local_manifest.get('files', {})
+    needed = []
+    for relative, entry in remote_manifest.get('files', {}).items():
+        known = local_files.get(relative)
+        if not known or known['size'] != entry.get('size') or known['hash'] != entry.get('hash'):
+            needed.append(relative)
+    return sorted(needed)
+
+
+def common_manifest(remote_manifest, local_manifest):
+    """
+    Gera o manifesto do ultimo estado comum entre nuvem e local.
+
+    Arquivos identicos mantem os dados locais (mtime incluso); os demais usam a
+    entrada remota, de modo que diferencas locais continuem pendentes de upload.
+
+    Args:
+        remote_manifest (dict): Manifesto publicado na nuvem
+        local_manifest (dict): Manifesto atual do diretorio local
+
+    Returns:
+        dict: Manifesto do estado comum
+    """
+    local_files = local_manifest.get('files', {})
+    files = {}
+    for relative, entry in remote_manifest.get('files', {}).items():
+        known = local_files.get(relative)
+        if known and known['size'] == entry.get('size') and known['hash'] == entry.get('hash'):
+            files[relative] = known
+        else:
+            files[relative] = dict(entry)
+    return {'version': MANIFEST_VERSION, 'files': files}
+
+
+def fetch_remote_manifest(rclone_path, remote_dir):
+    """
+    Le o manifesto publicado no diretorio remoto.
+
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_dir (str): Diretorio remoto (remote:dir)
+
+    Returns:
+        dict: Manifesto remoto ou None se inexistente/invalido
+    """
+    content = read_remote_file(rclone_path, join_remote_path(remote_dir, REMOTE_MANIFEST_NAME))
+    if not content or not content.strip():
+        log.info("Manifesto remoto nao encontrado")
+        return None
+
+    try:
+        manifest = json.loads(content)
+    except ValueError as e:
+        log.warning(f"Manifesto remoto invalido, ignorando: {e}")
+        return None
+
+    if (manifest.get('version') != MANIFEST_VERSION or not manifest.get('revision')
+            or not isinstance(manifest.get('files'), dict)):
+        log.warning("Manifesto remoto em formato desconhecido, ignorando")
+        return None
+
+    log.info(f"Manifesto remoto: revisao {manifest['revision']} ({len(manifest['files'])} arquivos)")
+    return manifest
+
+
+def publish_remote_manifest(rclone_path, remote_dir, manifest, mode="files", extra=None):
+    """
+    Publica o manifesto no diretorio remoto com uma nova revisao.
+
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_dir (str): Diretorio remoto (remote:dir)
+        manifest (dict): Manifesto do estado enviado
+        mode (str): Formato dos saves na nuvem ('files', 'packed' ou 'chunked')
+        extra (dict, optional): Campos adicionais do modo (ex: indice de blocos)
+
+    Returns:
+        str: Revisao publicada ou None em caso de falha
+    """
+    revision = uuid.uuid4().hex
+    remote_manifest = {
+        'version': MANIFEST_VERSION,
+        'revision': revision,
+        'mode': mode,
+        'synced_at': datetime.now().isoformat(),
+        'files': manifest.get('files', {})
+    }
+    remote_manifest.update(extra or {})
+
+    content = json.dumps(remote_manifest, separators=(',', ':'), ensure_ascii=False)
+    if write_remote_file(rclone_path, join_remote_path(remote_dir, REMOTE_MANIFEST_NAME), content):
+        log.info(f"Manifesto remoto publicado: revisao {revision}")
+        return revision
+    return None
+
+
+def invalidate_remote_manifest(rclone_path, remote_dir):
+    """
+    Esvazia o manifesto remoto, forcando downloads completos ate o proximo upload.
+
+    Usado quando o conteudo da nuvem mudou mas o novo manifesto nao pode ser publicado.
+
+    Returns:
+        bool: True se invalidado com sucesso
+    """
+    if write_remote_file(rclone_path, join_remote_path(remote_dir, REMOTE_MANIFEST_NAME), ""):
+        log.warning("Manifesto remoto invalidado")
+        return True
+    log.error("Falha ao invalidar o manifesto remoto; downloads podem ignorar alteracoes recentes")
+    return False
+
+
+def save_manifest(profile_name, manifest, direction, remote_revision=None):
+    """
+    Salva o manifesto de um perfil apos uma sincronizacao bem-sucedida.
+
+    Args:
+        profile_name (str): Nome do perfil
+        manifest (dict): Manifesto a ser salvo
+        direction (str): Direcao da sincronizacao que originou o manifesto
+        remote_revision (str, optional): Revisao do manifesto remoto sincronizado
+
+    Returns:
+        bool: True se salvo com sucesso
+    """
+    manifest_path = get_manifest_path(profile_name)
+    manifest = dict(manifest)
+    manifest['direction'] = direction
+    manifest['synced_at'] = datetime.now().isoformat()
+    manifest['remote_revision'] = remote_revision
+
+    try:
+        write_json_atomic(manifest_path, manifest, indent=1)
+        log.debug(f"Manifesto atualizado: {manifest_path} ({len(manifest['files'])} arquivos)")
+        return True
+    except OSError as e:
+        log.warning(f"Falha ao salvar manifesto {manifest_path}: {e}")
+        return False
@@ -2,341 +2,277 @@
 # -*- coding: utf-8 -*-
 """
 CloudQuest - Interface de notificacoes personalizadas.
+
+Todas as notificacoes sao exibidas por um unico host: uma thread com o loop
+do Tk, iniciada na primeira notificacao e mantida ate o fim da sessao. Quem
+exibe uma notificacao apenas a coloca na fila do host e segue em frente; as
+janelas sao empilhadas no canto da tela, as animacoes rodam no loop do Tk e
+uma nova notificacao do mesmo jogo substitui o conteudo da anterior. O
+progresso da transferencia (update_progress) e apenas registrado na
+notificacao; o host redesenha a barra e o texto na proxima verificacao.
+
+O customtkinter e o Pillow so sao importados na thread do host: importar
+este modulo (ex: em modo silencioso ou em sincronizacoes sem janela) nao
+carrega as bibliotecas graficas.
 """
 
 import os
 import sys
+import queue
 import threading
-import customtkinter as ctk
-from PIL import Image
 import time
-from pathlib import Path
 
-from CloudQuest.config.settings import COLORS, NOTIFICATION_WIDTH, NOTIFICATION_HEIGHT, ICONS_DIR
+from CloudQuest.config.settings import (
+    COLORS, NOTIFICATION_WIDTH, NOTIFICATION_HEIGHT, NOTIFICATION_DISPLAY_TIME, NOTIFICATION_MAX_VISIBLE,
+    NOTIFICATION_SPACING
+)
+from CloudQuest.utils.image_cache import load_image
 from CloudQuest.utils.logger import log
+from CloudQuest.utils.progress import event_fraction
+from CloudQuest.utils.rclone import format_size
 
-# Definir BASE_DIR para usado no _find_icon_path
-if getattr(sys, 'frozen', False):
-    # Executando como aplicativo compilado
-    BASE_DIR = Path(sys._MEIPASS)
-else:
-    # Executando como script
-    BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent.parent
+POLL_INTERVAL = 50  # milissegundos entre verificacoes da fila do host
+FADE_STEP = 0.1  # variacao da opacidade por quadro
+FADE_INTERVAL = 20  # milissegundos entre quadros
 
-class NotificationWindow:
-    """Janela de notificacao personalizada."""
+# Notificacoes ainda nao fechadas (aguardadas ao final da sessao)
+_active_notifications = []
+_active_lock = threading.Lock()
+
+# Tamanhos (largura, altura) do icone e do fundo da notificacao
+ICON_SIZE = (55, 44)
+BACKGROUND_SIZE = (103, 83)
+
+# Biblioteca grafica, carregada pelo host
+ctk = None
+_gui_lock = threading.Lock()
+
+
+def _load_gui():
+    """Importa o customtkinter (apenas uma vez)."""
+    global ctk
+    with _gui_lock:
+        if ctk is None:
+            import customtkinter
+            ctk = customtkinter
+
+
+class Notification:
+    """Notificacao enviada ao host; permite solicitar e aguardar o fechamento."""
     
     def __init__(self, title, message, game_name, direction="down", notification_type="info"):
         """
-        Inicializa a janela de notificacao.
-        
         Args:
             title (str): Titulo da notificacao
             message (str): Mensagem da notificacao
-            game_name (str): Nome do jogo
+            game_name (str): Nome do jogo (notificacoes do mesmo jogo se substituem)
             direction (str): Direcao da sincronizacao ('down' ou 'up')
             notification_type (str): Tipo da notificacao ('info' ou 'error')
         """
-        self.root = ctk.CTk()
-        self.root.withdraw()  # Esconde a janela principal
-        self.root.title("CloudQuest Notification")
+        self.title = title
+        self.message = message
+        self.game_name = game_name
+        self.direction = direction
+        self.notification_type = notification_type
+        self.progress = None
+        self._close_requested = threading.Event()
+        self._closed = threading.Event()
+        with _active_lock:
+            _active_notifications.append(self)
+    
+    @property
+    def closed(self):
+        return self._closed.is_set()
+    
+    @property
+    def close_requested(self):
+        return self._close_requested.is_set()
+    
+    def close(self):
+        """
+        Solicita o fechamento da notificacao sem bloquear.
+        
+        A janela permanece visivel ate completar o tempo minimo de exibicao
+        (NOTIFICATION_DISPLAY_TIME) e entao e fechada pelo host.
+        """
+        self._close_requested.set()
+    
+    def wait_closed(self, timeout=None):
+        """
+        Aguarda a notificacao ser fechada (ou substituida).
+        
+        Args:
+            timeout (float, optional): Tempo maximo de espera em segundos
+        
+        Returns:
+            bool: True se foi fechada
+        """
+        return self._closed.wait(timeout)
+    
+    def update_progress(self, event):
+        """
+        Registra o progresso da transferencia (ouvinte de ProgressReporter).
+        
+        Nao bloqueia: a janela e atualizada pelo host na proxima verificacao,
+        com o evento mais recente.
+        
+        Args:
+            event (ProgressEvent): Evento de progresso
+        """
+        self.progress = event
+    
+    def _set_closed(self):
+        self._closed.set()
+        with _active_lock:
+            if self in _active_notifications:
+                _active_notifications.remove(self)
+
+
+class NotificationWindow:
+    """Janela de notificacao; criada e manipulada apenas na thread do host."""
+    
+    def __init__(self, host, notification):
+        """
+        Args:
+            host (NotificationHost): Host que exibe a janela
+            notification (Notification): Notificacao exibida
+        """
+        self.host = host
+        self.notification = notification
+        self.frame = None
+        self.status_label = None
+        self.progress_bar = None
+        self.rendered_progress = None
+        self.closing = False
+        self.shown_at = None
+        self._fade_job = None
+        
+        self.window = ctk.CTkToplevel(host.root)
+        self.window.withdraw()
+        self.window.title("CloudQuest Notification")
         
         # Configuracoes da janela
-        self.root.overrideredirect(True)  # Remove bordas e titulo
-        self.root.geometry(f"{NOTIFICATION_WIDTH}x{NOTIFICATION_HEIGHT}")
-        self.root.configure(fg_color=self._rgb_to_hex(COLORS["background"]))
+        self.window.overrideredirect(True)  # Remove bordas e titulo
+        self.window.geometry(f"{NOTIFICATION_WIDTH}x{NOTIFICATION_HEIGHT}")
+        self.window.configure(fg_color=self._rgb_to_hex(COLORS["background"]))
         
         # Garantir que a janela fique sempre no topo
-        self.root.attributes("-topmost", True)
+        self.window.attributes("-topmost", True)
         
         # Em Windows, configuracoes adicionais para transparencia
         if sys.platform == "win32":
-            self.root.attributes("-transparentcolor", "")
-            self.root.wm_attributes("-toolwindow", True)
+            self.window.attributes("-transparentcolor", "")
+            self.window.wm_attributes("-toolwindow", True)
         
-        # Posicionamento na tela (canto inferior direito)
-        self._position_window()
+        self.window.attributes("-alpha", 0.0)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.show(notification)
+    
+    def show(self, notification):
+        """
+        Exibe uma notificacao, substituindo o conteudo atual da janela.
         
-        # Configuracao do conteudo
-        self._setup_ui(title, message, game_name, direction, notification_type)
+        Args:
+            notification (Notification): Notificacao a exibir
+        """
+        if self.frame:
+            self.frame.destroy()
+        self.notification = notification
+        self.progress_bar = None
+        self.rendered_progress = None
+        self._setup_ui(notification.title, notification.message, notification.game_name,
+                       notification.direction, notification.notification_type)
+        self.render_progress()
+        self.shown_at = time.monotonic()
+        self.closing = False
+        self.window.deiconify()
+        self._fade(1.0)
+    
+    def render_progress(self):
+        """Atualiza a barra e o texto de progresso com o ultimo evento da notificacao."""
+        event = self.notification.progress
+        if event is None or event is self.rendered_progress:
+            return
+        self.rendered_progress = event
         
-        # Mostrar a janela com efeito de fade-in
-        self.root.update_idletasks()
-        self.root.deiconify()
-        self._fade_in()
+        if event.finished:
+            if event.success and self.progress_bar:
+                self.progress_bar.set(1.0)
+            return
         
-        # Configuracao para fechar a janela
-        self.closed = False
-        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        if self.progress_bar is None:
+            self.progress_bar = ctk.CTkProgressBar(
+                self.frame,
+                width=120,
+                height=4,
+                progress_color=self._rgb_to_hex(COLORS["text_primary"]),
+                fg_color=self._rgb_to_hex(COLORS["dark_bg"])
+            )
+            self.progress_bar.place(x=80, y=66)
+            self.progress_bar.set(0)
+        fraction = event_fraction(event)
+        if fraction is not None:
+            self.progress_bar.set(fraction)
         
-        # Iniciar loop de eventos de forma assincrona
-        self.root.after(100, self._update_loop)  # Novo metodo
+        text = format_size(event.transferred)
+        if event.total:
+            text += f" / {format_size(event.total)}"
+        if event.speed:
+            text += f" · {format_size(event.speed)}/s"
+        self.status_label.configure(text=text)
     
-    def _rgb_to_hex(self, rgb):
-        """Converte RGB para formato hexadecimal."""
-        return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+    def move(self, x_position, y_position):
+        """Posiciona a janela."""
+        self.window.geometry(f"+{x_position}+{y_position}")
     
-    def _position_window(self):
-        """Posiciona a janela no canto inferior direito do monitor principal."""
-        try:
-            # Se estamos no Windows, vamos usar a API Win32 para detectar o monitor principal
-            if sys.platform == "win32":
-                try:
-                    # Tenta importar a biblioteca win32
-                    import win32api
-                    
-                    # Obtém informações do monitor principal (monitor com flags = 1)
-                    monitors = win32api.EnumDisplayMonitors()
-                    monitor_info = win32api.GetMonitorInfo(monitors[0][0])
-                    
-                    # Para cada monitor, verifica se é o primário
-                    for monitor in monitors:
-                        info = win32api.GetMonitorInfo(monitor[0])
-                        if info['Flags'] == 1:  # Primary monitor
-                            monitor_info = info
-                            break
-                    
-                    # Obtém as coordenadas da área de trabalho (sem a barra de tarefas)
-                    work_area = monitor_info['Work']
-                    
-                    # Calcula a posição no canto inferior direito
-                    x_position = work_area[2] - NOTIFICATION_WIDTH - 90
-                    y_position = work_area[3] - NOTIFICATION_HEIGHT - 25
-                    
-                    self.root.geometry(f"+{x_position}+{y_position}")
-                    return
-                except ImportError:
-                    log.warning("Módulo win32api não encontrado. Usando método padrão.")
-                except Exception as e:
-                    log.warning(f"Erro ao obter monitor primário no Windows: {e}")
-            
-            # Se estamos no Linux, vamos tentar obter informação do Wayland primeiro, depois X11
-            elif sys.platform.startswith('linux'):
-                import subprocess
-                import re
-                import json
-                
-                # Primeiro, tente obter informações via Wayland
-                try:
-                    # Verificar se estamos rodando em uma sessão Wayland
-                    wayland_session = (
-                        os.environ.get('WAYLAND_DISPLAY') or 
-                        os.environ.get('XDG_SESSION_TYPE') == 'wayland' or
-                        os.environ.get('DESKTOP_SESSION', '').lower().find('wayland') >= 0
-                    )
-                    
-                    if wayland_session:
-                        log.debug("Detectada sessão Wayland, tentando obter informações de monitor")
-                        
-                        # Método 1: Tenta usar wlr-randr para obter informações de monitor (para compositors baseados em wlroots)
-                        try:
-                            wlr_output = subprocess.check_output(['wlr-randr'], stderr=subprocess.DEVNULL).decode()
-                            
-                            # Procura por linhas como "HDMI-A-1 2560x1440@59.951000Hz (preferred)"
-                            monitors = re.findall(r'(\S+)\s+(\d+)x(\d+)@.+?\s+\(preferred\)', wlr_output)
-                            
-                            if monitors:
-                                display_name, width, height = monitors[0]
-                                primary_screen_width = int(width)
-                                primary_screen_height = int(height)
-                                
-                                # Calcular posição
-                                x_position = primary_screen_width - NOTIFICATION_WIDTH - 00
-                                y_position = primary_screen_height - NOTIFICATION_HEIGHT - 60
-                                
-                                self.root.geometry(f"+{x_position}+{y_position}")
-                                log.debug(f"Posição definida via wlr-randr: {x_position}x{y_position}")
-                                return
-                        except (subprocess.SubprocessError, FileNotFoundError):
-                            log.debug("wlr-randr não encontrado ou falhou")
-                        
-                        # Método 2: Tenta usar swaymsg para obter informações de monitor (para Sway WM)
-                        try:
-                            sway_output = subprocess.check_output(['swaymsg', '-t', 'get_outputs'], stderr=subprocess.DEVNULL).decode()
-                            
-                            # Se conseguiu obter as informações, tenta extrair dimensões do monitor principal
-                            if 'focused' in sway_output:
-                                outputs = json.loads(sway_output)
-                                
-                                for output in outputs:
-                                    if output.get('focused', False):
-                                        rect = output.get('rect', {})
-                                        primary_screen_width = rect.get('width', 0)
-                                        primary_screen_height = rect.get('height', 0)
-                                        x_offset = rect.get('x', 0)
-                                        y_offset = rect.get('y', 0)
-                                        
-                                        # Calcular posição
-                                        x_position = x_offset + primary_screen_width - NOTIFICATION_WIDTH - 00
-                                        y_position = y_offset + primary_screen_height - NOTIFICATION_HEIGHT - 60
-                                        
-                                        self.root.geometry(f"+{x_position}+{y_position}")
-                                        log.debug(f"Posição definida via swaymsg: {x_position}x{y_position}")
-                                        return
-                        except (subprocess.SubprocessError, FileNotFoundError, json.JSONDecodeError):
-                            log.debug("swaymsg não encontrado ou falhou")
-                        
-                        # Método 3: Tenta usar hyprctl para obter informações de monitor (para Hyprland)
-                        try:
-                            hypr_output = subprocess.check_output(['hyprctl', 'monitors', '-j'], stderr=subprocess.DEVNULL).decode()
-                            monitors = json.loads(hypr_output)
-                            
-                            for monitor in monitors:
-                                if monitor.get('focused', False):
-                                    width = monitor.get('width', 0)
-                                    height = monitor.get('height', 0)
-                                    x = monitor.get('x', 0)
-                                    y = monitor.get('y', 0)
-                                    
-                                    # Calcular posição
-                                    x_position = x + width - NOTIFICATION_WIDTH - 00
-                                    y_position = y + height - NOTIFICATION_HEIGHT - 60
-                                    
-                                    self.root.geometry(f"+{x_position}+{y_position}")
-                                    log.debug(f"Posição definida via hyprctl: {x_position}x{y_position}")
-                                    return
-                        except (subprocess.SubprocessError, FileNotFoundError, json.JSONDecodeError):
-                            log.debug("hyprctl não encontrado ou falhou")
-                        
-                        # Método 4: Para KDE Plasma Wayland
-                        try:
-                            kscreen_output = subprocess.check_output(['kscreen-doctor', '-j'], stderr=subprocess.DEVNULL).decode()
-                            kscreen_data = json.loads(kscreen_output)
-                            
-                            for output in kscreen_data.get('outputs', []):
-                                if output.get('enabled', False):
-                                    width = output.get('size', {}).get('width', 0)
-                                    height = output.get('size', {}).get('height', 0)
-                                    x = output.get('pos', {}).get('x', 0)
-                                    y = output.get('pos', {}).get('y', 0)
-                                    
-                                    # Calcular posição
-                                    x_position = x + width - NOTIFICATION_WIDTH - 00
-                                    y_position = y + height - NOTIFICATION_HEIGHT - 60
-                                    
-                                    self.root.geometry(f"+{x_position}+{y_position}")
-                                    log.debug(f"Posição definida via kscreen-doctor: {x_position}x{y_position}")
-                                    return
-                        except (subprocess.SubprocessError, FileNotFoundError, json.JSONDecodeError):
-                            log.debug("kscreen-doctor não encontrado ou falhou")
-                        
-                        # Método 5: Para GNOME Wayland
-                        try:
-                            gnome_output = subprocess.check_output(['gnome-shell', '--version'], stderr=subprocess.DEVNULL).decode()
-                            if 'GNOME Shell' in gnome_output:
-                                # Se é GNOME, usamos o método padrão do Tkinter, mas ajustamos para GNOME
-                                screen_width = self.root.winfo_screenwidth()
-                                screen_height = self.root.winfo_screenheight()
-                                
-                                x_position = screen_width - NOTIFICATION_WIDTH - 00
-                                y_position = screen_height - NOTIFICATION_HEIGHT - 60  # Mais espaço para a barra inferior
-                                
-                                self.root.geometry(f"+{x_position}+{y_position}")
-                                log.debug(f"Posição definida para GNOME Wayland: {x_position}x{y_position}")
-                                return
-                        except (subprocess.SubprocessError, FileNotFoundError):
-                            log.debug("Detecção GNOME falhou")
-                            
-                        # Se todos os métodos específicos falharam, usar o método Tkinter com ajustes para Wayland
-                        screen_width = self.root.winfo_screenwidth()
-                        screen_height = self.root.winfo_screenheight()
-                        
-                        if screen_width > 0 and screen_height > 0:
-                            x_position = screen_width - NOTIFICATION_WIDTH - 00
-                            y_position = screen_height - NOTIFICATION_HEIGHT - 60
-                            
-                            self.root.geometry(f"+{x_position}+{y_position}")
-                            log.debug(f"Posição definida via Tkinter em Wayland: {x_position}x{y_position}")
-                            return
-                        
-                        log.warning("Não foi possível obter informações do monitor via métodos Wayland")
-                except Exception as e:
-                    log.warning(f"Erro ao detectar informações de monitor via Wayland: {e}")
-                
-                # Se Wayland falhou, tenta via X11
-                try:
-                    # Obtém a string de configuração do Xrandr
-                    xrandr_output = subprocess.check_output(['xrandr', '--query']).decode()
-                    
-                    # Procura pelo monitor marcado como "primary"
-                    primary_info = re.search(r'(\d+x\d+\+\d+\+\d+) primary', xrandr_output)
-                    
-                    if primary_info:
-                        geometry = primary_info.group(1)
-                        # Formato: 1920x1080+0+0
-                        width, rest = geometry.split('x')
-                        height, x_offset, y_offset = rest.split('+')
-                        
-                        primary_screen_width = int(width)
-                        primary_screen_height = int(height)
-                        x_offset = int(x_offset)
-                        y_offset = int(y_offset)
-                        
-                        # Calcular posição no monitor principal
-                        x_position = x_offset + primary_screen_width - NOTIFICATION_WIDTH - 00
-                        y_position = y_offset + primary_screen_height - NOTIFICATION_HEIGHT - 60
-                        
-                        self.root.geometry(f"+{x_position}+{y_position}")
-                        return
-                except Exception as e:
-                    log.warning(f"Não foi possível detectar o monitor primário via xrandr: {e}")
-            
-            # # Método padrão do Tkinter (fallback)
-            # # Isso deve funcionar para a maioria dos casos simples onde o monitor primário é o único ou o primeiro
-            # primary_screen_width = self.root.winfo_screenwidth()
-            # primary_screen_height = self.root.winfo_screenheight()
-            
-            # x_position = primary_screen_width - NOTIFICATION_WIDTH - 0
-            # y_position = primary_screen_height - NOTIFICATION_HEIGHT - 0
-            
-        except Exception as e:
-            log.warning(f"Erro ao determinar monitor primário: {e}")
-            # Fallback absoluto para o comportamento mais simples possível
-            screen_width = self.root.winfo_screenwidth()
-            screen_height = self.root.winfo_screenheight()
-            x_position = screen_width - NOTIFICATION_WIDTH - 90
-            y_position = screen_height - NOTIFICATION_HEIGHT - 25
-        
-        self.root.geometry(f"+{x_position}+{y_position}")
-    
-    def _find_icon_path(self, icon_name):
+    def close_due(self):
         """
-        Localiza um ícone no diretório correto.
-        
-        Args:
-            icon_name (str): Nome do arquivo de ícone
-        
         Returns:
-            Path: Caminho do arquivo de ícone ou None se não encontrado
+            bool: True se o fechamento foi solicitado e o tempo minimo de exibicao passou
         """
-        # Caminho da aplicação atual
-        if getattr(sys, 'frozen', False):
-            # Executando como aplicativo compilado
-            # BASE_DIR aqui se refere ao diretório _MEIPASS onde os assets estão embutidos
-            possible_dirs = [
-                BASE_DIR / "assets" / "icons",
-            ]
-        else:
-            # Executando como script
-            possible_dirs = [
-                Path("assets") / "icons",
-                ICONS_DIR
-            ]
+        elapsed_ms = (time.monotonic() - self.shown_at) * 1000
+        return self.notification.close_requested and elapsed_ms >= NOTIFICATION_DISPLAY_TIME
+    
+    def close(self):
+        """Fecha a janela com efeito de fade-out."""
+        if not self.closing:
+            self.closing = True
+            self._fade(0.0, self.destroy)
+    
+    def destroy(self):
+        """Remove a janela imediatamente."""
+        if self._fade_job:
+            self.window.after_cancel(self._fade_job)
+            self._fade_job = None
+        try:
+            self.window.destroy()
+        finally:
+            self.host.window_closed(self)
+    
+    def _fade(self, target, on_done=None):
+        """Anima a opacidade ate o valor informado, sem bloquear o loop do Tk."""
+        if self._fade_job:
+            self.window.after_cancel(self._fade_job)
+            self._fade_job = None
         
-        # Buscar o arquivo em todos os diretórios possíveis
-        for dir_path in possible_dirs:
-            icon_path = dir_path / icon_name
-            if icon_path.exists():
-                log.debug(f"Ícone encontrado: {icon_path}")
-                return icon_path
+        opacity = float(self.window.attributes("-alpha"))
+        if abs(target - opacity) <= FADE_STEP:
+            self.window.attributes("-alpha", target)
+            if on_done:
+                on_done()
+            return
         
-        log.warning(f"Ícone não encontrado: {icon_name}")
-        return None
+        self.window.attributes("-alpha", opacity + (FADE_STEP if target > opacity else -FADE_STEP))
+        self._fade_job = self.window.after(FADE_INTERVAL, self._fade, target, on_done)
+    
+    def _rgb_to_hex(self, rgb):
+        """Converte RGB para formato hexadecimal."""
+        return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
     
     def _setup_ui(self, title, message, game_name, direction, notification_type):
         """Configura os elementos visuais da notificacao."""
         # Frame principal com gradiente
-        self.frame = ctk.CTkFrame(self.root, fg_color=self._rgb_to_hex(COLORS["background"]), width=NOTIFICATION_WIDTH, height=NOTIFICATION_HEIGHT)
+        self.frame = ctk.CTkFrame(self.window, fg_color=self._rgb_to_hex(COLORS["background"]), width=NOTIFICATION_WIDTH, height=NOTIFICATION_HEIGHT)
         self.frame.pack(fill="both", expand=True)
         self.frame.pack_propagate(False)  # Impede que o frame se redimensione
         
@@ -345,37 +281,19 @@ class NotificationWindow:
         icon_name = f"{icon_prefix}{'down' if direction == 'down' else 'up'}.png"
         bg_name = f"{icon_prefix}{'down' if direction == 'down' else 'up'}_background.png"
         
-        # Buscar caminhos de icones usando o metodo melhorado
-        icon_path = self._find_icon_path(icon_name)
-        bg_path = self._find_icon_path(bg_name)
-        
         # Adicionar icone (se existir)
-        if icon_path:
-            try:
-                icon_img = Image.open(icon_path)
-                icon_img = icon_img.resize((55, 44), Image.LANCZOS)
-                icon_photo = ctk.CTkImage(light_image=icon_img, dark_image=icon_img, size=(55, 44))
-                
-                icon_label = ctk.CTkLabel(self.frame, image=icon_photo, text="", fg_color=self._rgb_to_hex(COLORS["background"]))
-                icon_label.image = icon_photo  # Manter referencia
-                icon_label.place(x=10, y=16)
-            except Exception as e:
-                log.error(f"Erro ao carregar icone {icon_path}: {e}")
+        icon_photo = self.host.get_image(icon_name, ICON_SIZE)
+        if icon_photo:
+            icon_label = ctk.CTkLabel(self.frame, image=icon_photo, text="", fg_color=self._rgb_to_hex(COLORS["background"]))
+            icon_label.place(x=10, y=16)
         else:
             log.warning(f"Nao foi possivel encontrar o icone: {icon_name}")
         
         # Adicionar background (se existir)
-        if bg_path:
-            try:
-                bg_img = Image.open(bg_path)
-                bg_img = bg_img.resize((103, 83), Image.LANCZOS) # o numero 103 e 83 sao a largura e altura do background
-                bg_photo = ctk.CTkImage(light_image=bg_img, dark_image=bg_img, size=(103, 83))
-                
-                bg_label = ctk.CTkLabel(self.frame, image=bg_photo, text="", fg_color=self._rgb_to_hex(COLORS["background"]))
-                bg_label.image = bg_photo  # Manter referencia
-                bg_label.place(x=201, y=-4)
-            except Exception as e:
-                log.error(f"Erro ao carregar background {bg_path}: {e}")
+        bg_photo = self.host.get_image(bg_name, BACKGROUND_SIZE)
+        if bg_photo:
+            bg_label = ctk.CTkLabel(self.frame, image=bg_photo, text="", fg_color=self._rgb_to_hex(COLORS["background"]))
+            bg_label.place(x=201, y=-4)
         else:
             log.warning(f"Nao foi possivel encontrar o background: {bg_name}")
         
@@ -405,63 +323,422 @@ class NotificationWindow:
         else:
             status_message = "Updating your progress..." if direction == "down" else "Syncing to the cloud..."
             status_color = self._rgb_to_hex(COLORS["text_secondary"])
-        status_label = ctk.CTkLabel(
+        self.status_label = ctk.CTkLabel(
             self.frame, 
             text=status_message,
             font=("Segoe UI", 9),
             text_color=status_color,
             fg_color=self._rgb_to_hex(COLORS["background"])
         )
-        status_label.place(x=75, y=44)
-    
-    def _fade_in(self):
-        """Anima a janela com efeito de fade-in."""
-        opacity = 0.0
-        while opacity < 1.0:
-            opacity += 0.1
-            self.root.attributes("-alpha", opacity)
-            self.root.update()
-            time.sleep(0.02)
-    
-    def _fade_out(self):
-        """Anima a janela com efeito de fade-out."""
-        opacity = 1.0
-        while opacity > 0.0:
-            opacity -= 0.1
-            self.root.attributes("-alpha", opacity)
-            self.root.update()
-            time.sleep(0.02)
-    
-    def _update_loop(self):
-        """Atualiza a janela periodicamente sem bloquear a thread principal."""
+        self.status_label.place(x=75, y=44)
+
+
+class NotificationHost:
+    """Thread unica com o loop do Tk que exibe todas as notificacoes."""
+    
+    def __init__(self):
+        self.root = None
+        self.windows = []
+        self.failed = False
+        self._origin = None
+        self._scale = 1.0
+        self._images = {}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="notification-host", daemon=True)
+        self._thread.start()
+    
+    def submit(self, notification):
+        """
+        Coloca uma notificacao na fila de exibicao (nao bloqueia).
+        
+        Args:
+            notification (Notification): Notificacao a exibir
+        """
+        with self._lock:
+            if not self._stopped:
+                self._queue.put(notification)
+                return
+        notification._set_closed()
+    
+    def stop(self, timeout=None):
+        """
+        Fecha as janelas restantes e encerra a thread do host.
+        
+        Args:
+            timeout (float, optional): Tempo maximo de espera em segundos
+        """
+        self._queue.put(None)
+        self._thread.join(timeout)
+    
+    def is_running(self):
+        return self._thread.is_alive() and not self._stopped
+    
+    def _run(self):
+        """Cria a janela raiz (oculta) e executa o loop do Tk."""
         try:
-            if not self.closed:
-                self.root.update()
-                self.root.after(100, self._update_loop)  # Reagendar
+            _load_gui()
+            self.root = ctk.CTk()
+            self.root.withdraw()  # Esconde a janela principal
+            self._origin = _screen_position(self.root)
+            try:
+                self._scale = ctk.ScalingTracker.get_window_scaling(self.root)
+            except Exception:
+                self._scale = 1.0
+            self.root.after(0, self._poll)
+            self.root.mainloop()
         except Exception as e:
-            log.error(f"Erro no loop de eventos da notificacao: {e}")
+            self.failed = True
+            log.error(f"Erro no host de notificacoes: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._stopped = True
+            for window in list(self.windows):
+                try:
+                    window.window.destroy()
+                except Exception:
+                    pass
+                window.notification._set_closed()
+            self.windows = []
+            self._images = {}
+            while True:
+                try:
+                    notification = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if notification:
+                    notification._set_closed()
+            try:
+                if self.root:
+                    self.root.destroy()
+            except Exception:
+                pass
+            self.root = None
     
-    def close(self):
-        """Fecha a janela de notificacao."""
-        if not self.closed:
+    def _poll(self):
+        """Exibe as notificacoes da fila e fecha as que ja podem ser fechadas."""
+        while True:
+            try:
+                notification = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if notification is None:
+                self.root.quit()
+                return
             try:
-                self._fade_out()
-                self.root.destroy()
-                self.closed = True
+                self._display(notification)
             except Exception as e:
-                log.error(f"Erro ao fechar notificacao: {e}")
-                # Tentar destruir diretamente em caso de erro
-                try:
-                    self.root.destroy()
-                except:
-                    pass
-                self.closed = True
+                log.error(f"Erro ao exibir notificacao: {e}", exc_info=True)
+                notification._set_closed()
+        
+        for window in list(self.windows):
+            if window.closing:
+                continue
+            try:
+                window.render_progress()
+            except Exception as e:
+                log.debug(f"Erro ao atualizar progresso da notificacao: {e}")
+            if window.close_due():
+                window.close()
+        self.root.after(POLL_INTERVAL, self._poll)
+    
+    def _display(self, notification):
+        """Substitui a notificacao do mesmo jogo ou abre uma nova janela."""
+        for window in self.windows:
+            if window.notification.game_name == notification.game_name:
+                replaced = window.notification
+                window.show(notification)
+                replaced._set_closed()
+                return
+        
+        # Limite de janelas empilhadas: a mais antiga da lugar a nova
+        visible = [window for window in self.windows if not window.closing]
+        if len(visible) >= NOTIFICATION_MAX_VISIBLE:
+            visible[0].close()
+        
+        self.windows.append(NotificationWindow(self, notification))
+        self._layout()
+    
+    def get_image(self, name, size):
+        """
+        Imagem de um icone para as notificacoes, criada uma unica vez por tamanho.
+        
+        Args:
+            name (str): Nome do arquivo de icone
+            size (tuple): Tamanho (largura, altura)
+        
+        Returns:
+            CTkImage: Imagem ou None se o icone nao puder ser carregado
+        """
+        key = (name, size)
+        if key not in self._images:
+            try:
+                # Ja redimensionada na escala da tela: o CTkImage nao precisa reamostrar
+                image = load_image(name, size, self._scale)
+            except Exception as e:
+                log.error(f"Erro ao carregar icone {name}: {e}")
+                image = None
+            self._images[key] = ctk.CTkImage(light_image=image, dark_image=image, size=size) if image else None
+        return self._images[key]
+    
+    def window_closed(self, window):
+        """Remove uma janela fechada e reorganiza as restantes."""
+        if window in self.windows:
+            self.windows.remove(window)
+        window.notification._set_closed()
+        self._layout()
+    
+    def _layout(self):
+        """Empilha as janelas a partir do canto inferior direito."""
+        x_position, y_position = self._origin
+        for index, window in enumerate(self.windows):
+            window.move(x_position, y_position - index * (NOTIFICATION_HEIGHT + NOTIFICATION_SPACING))
+
+
+_host = None
+_host_lock = threading.Lock()
+
+
+def _get_host():
+    """Retorna o host de notificacoes, iniciando-o se necessario."""
+    global _host
+    with _host_lock:
+        if _host is None or (not _host.failed and not _host.is_running()):
+            _host = NotificationHost()
+        return _host
+
+
+def _screen_position(root):
+    """
+    Calcula a posicao da notificacao no canto inferior direito do monitor principal.
+    
+    Args:
+        root: Janela raiz do Tk (usada como alternativa para obter o tamanho da tela)
+    
+    Returns:
+        tuple: Coordenadas (x, y) da primeira notificacao
+    """
+    try:
+        # Se estamos no Windows, vamos usar a API Win32 para detectar o monitor principal
+        if sys.platform == "win32":
+            try:
+                # Tenta importar a biblioteca win32
+                import win32api
+
+                # Obtém informações do monitor principal (monitor com flags = 1)
+                monitors = win32api.EnumDisplayMonitors()
+                monitor_info = win32api.GetMonitorInfo(monitors[0][0])
+
+                # Para cada monitor, verifica se é o primário
+                for monitor in monitors:
+                    info = win32api.GetMonitorInfo(monitor[0])
+                    if info['Flags'] == 1:  # Primary monitor
+                        monitor_info = info
+                        break
+
+                # Obtém as coordenadas da área de trabalho (sem a barra de tarefas)
+                work_area = monitor_info['Work']
+
+                # Calcula a posição no canto inferior direito
+                x_position = work_area[2] - NOTIFICATION_WIDTH - 90
+                y_position = work_area[3] - NOTIFICATION_HEIGHT - 25
+
+                return x_position, y_position
+            except ImportError:
+                log.warning("Módulo win32api não encontrado. Usando método padrão.")
+            except Exception as e:
+                log.warning(f"Erro ao obter monitor primário no Windows: {e}")
+
+        # Se estamos no Linux, vamos tentar obter informação do Wayland primeiro, depois X11
+        elif sys.platform.startswith('linux'):
+            import subprocess
+            import re
+            import json
+
+            # Primeiro, tente obter informações via Wayland
+            try:
+                # Verificar se estamos rodando em uma sessão Wayland
+                wayland_session = (
+                    os.environ.get('WAYLAND_DISPLAY') or 
+                    os.environ.get('XDG_SESSION_TYPE') == 'wayland' or
+                    os.environ.get('DESKTOP_SESSION', '').lower().find('wayland') >= 0
+                )
+
+                if wayland_session:
+                    log.debug("Detectada sessão Wayland, tentando obter informações de monitor")
+
+                    # Método 1: Tenta usar wlr-randr para obter informações de monitor (para compositors baseados em wlroots)
+                    try:
+                        wlr_output = subprocess.check_output(['wlr-randr'], stderr=subprocess.DEVNULL).decode()
+
+                        # Procura por linhas como "HDMI-A-1 2560x1440@59.951000Hz (preferred)"
+                        monitors = re.findall(r'(\S+)\s+(\d+)x(\d+)@.+?\s+\(preferred\)', wlr_output)
+
+                        if monitors:
+                            display_name, width, height = monitors[0]
+                            primary_screen_width = int(width)
+                            primary_screen_height = int(height)
+
+                            # Calcular posição
+                            x_position = primary_screen_width - NOTIFICATION_WIDTH - 00
+                            y_position = primary_screen_height - NOTIFICATION_HEIGHT - 60
+
+                            log.debug(f"Posição definida via wlr-randr: {x_position}x{y_position}")
+                            return x_position, y_position
+                    except (subprocess.SubprocessError, FileNotFoundError):
+                        log.debug("wlr-randr não encontrado ou falhou")
+
+                    # Método 2: Tenta usar swaymsg para obter informações de monitor (para Sway WM)
+                    try:
+                        sway_output = subprocess.check_output(['swaymsg', '-t', 'get_outputs'], stderr=subprocess.DEVNULL).decode()
+
+                        # Se conseguiu obter as informações, tenta extrair dimensões do monitor principal
+                        if 'focused' in sway_output:
+                            outputs = json.loads(sway_output)
+
+                            for output in outputs:
+                                if output.get('focused', False):
+                                    rect = output.get('rect', {})
+                                    primary_screen_width = rect.get('width', 0)
+                                    primary_screen_height = rect.get('height', 0)
+                                    x_offset = rect.get('x', 0)
+                                    y_offset = rect.get('y', 0)
+
+                                    # Calcular posição
+                                    x_position = x_offset + primary_screen_width - NOTIFICATION_WIDTH - 00
+                                    y_position = y_offset + primary_screen_height - NOTIFICATION_HEIGHT - 60
+
+                                    log.debug(f"Posição definida via swaymsg: {x_position}x{y_position}")
+                                    return x_position, y_position
+                    except (subprocess.SubprocessError, FileNotFoundError, json.JSONDecodeError):
+                        log.debug("swaymsg não encontrado ou falhou")
+
+                    # Método 3: Tenta usar hyprctl para obter informações de monitor (para Hyprland)
+                    try:
+                        hypr_output = subprocess.check_output(['hyprctl', 'monitors', '-j'], stderr=subprocess.DEVNULL).decode()
+                        monitors = json.loads(hypr_output)
+
+                        for monitor in monitors:
+                            if monitor.get('focused', False):
+                                width = monitor.get('width', 0)
+                                height = monitor.get('height', 0)
+                                x = monitor.get('x', 0)
+                                y = monitor.get('y', 0)
+
+                                # Calcular posição
+                                x_position = x + width - NOTIFICATION_WIDTH - 00
+                                y_position = y + height - NOTIFICATION_HEIGHT - 60
+
+                                log.debug(f"Posição definida via hyprctl: {x_position}x{y_position}")
+                                return x_position, y_position
+                    except (subprocess.SubprocessError, FileNotFoundError, json.JSONDecodeError):
+                        log.debug("hyprctl não encontrado ou falhou")
+
+                    # Método 4: Para KDE Plasma Wayland
+                    try:
+                        kscreen_output = subprocess.check_output(['kscreen-doctor', '-j'], stderr=subprocess.DEVNULL).decode()
+                        kscreen_data = json.loads(kscreen_output)
+
+                        for output in kscreen_data.get('outputs', []):
+                            if output.get('enabled', False):
+                                width = output.get('size', {}).get('width', 0)
+                                height = output.get('size', {}).get('height', 0)
+                                x = output.get('pos', {}).get('x', 0)
+                                y = output.get('pos', {}).get('y', 0)
+
+                                # Calcular posição
+                                x_position = x + width - NOTIFICATION_WIDTH - 00
+                                y_position = y + height - NOTIFICATION_HEIGHT - 60
+
+                                log.debug(f"Posição definida via kscreen-doctor: {x_position}x{y_position}")
+                                return x_position, y_position
+                    except (subprocess.SubprocessError, FileNotFoundError, json.JSONDecodeError):
+                        log.debug("kscreen-doctor não encontrado ou falhou")
+
+                    # Método 5: Para GNOME Wayland
+                    try:
+                        gnome_output = subprocess.check_output(['gnome-shell', '--version'], stderr=subprocess.DEVNULL).decode()
+                        if 'GNOME Shell' in gnome_output:
+                            # Se é GNOME, usamos o método padrão do Tkinter, mas ajustamos para GNOME
+                            screen_width = root.winfo_screenwidth()
+                            screen_height = root.winfo_screenheight()
+
+                            x_position = screen_width - NOTIFICATION_WIDTH - 00
+                            y_position = screen_height - NOTIFICATION_HEIGHT - 60  # Mais espaço para a barra inferior
+
+                            log.debug(f"Posição definida para GNOME Wayland: {x_position}x{y_position}")
+                            return x_position, y_position
+                    except (subprocess.SubprocessError, FileNotFoundError):
+                        log.debug("Detecção GNOME falhou")
+
+                    # Se todos os métodos específicos falharam, usar o método Tkinter com ajustes para Wayland
+                    screen_width = root.winfo_screenwidth()
+                    screen_height = root.winfo_screenheight()
+
+                    if screen_width > 0 and screen_height > 0:
+                        x_position = screen_width - NOTIFICATION_WIDTH - 00
+                        y_position = screen_height - NOTIFICATION_HEIGHT - 60
+
+                        log.debug(f"Posição definida via Tkinter em Wayland: {x_position}x{y_position}")
+                        return x_position, y_position
+
+                    log.warning("Não foi possível obter informações do monitor via métodos Wayland")
+            except Exception as e:
+                log.warning(f"Erro ao detectar informações de monitor via Wayland: {e}")
+
+            # Se Wayland falhou, tenta via X11
+            try:
+                # Obtém a string de configuração do Xrandr
+                xrandr_output = subprocess.check_output(['xrandr', '--query']).decode()
+
+                # Procura pelo monitor marcado como "primary"
+                primary_info = re.search(r'(\d+x\d+\+\d+\+\d+) primary', xrandr_output)
+
+                if primary_info:
+                    geometry = primary_info.group(1)
+                    # Formato: 1920x1080+0+0
+                    width, rest = geometry.split('x')
+                    height, x_offset, y_offset = rest.split('+')
+
+                    primary_screen_width = int(width)
+                    primary_screen_height = int(height)
+                    x_offset = int(x_offset)
+                    y_offset = int(y_offset)
+
+                    # Calcular posição no monitor principal
+                    x_position = x_offset + primary_screen_width - NOTIFICATION_WIDTH - 00
+                    y_position = y_offset + primary_screen_height - NOTIFICATION_HEIGHT - 60
+
+                    return x_position, y_position
+            except Exception as e:
+                log.warning(f"Não foi possível detectar o monitor primário via xrandr: {e}")
+    except Exception as e:
+        log.warning(f"Erro ao determinar monitor primário: {e}")
+    
+    # Fallback absoluto para o comportamento mais simples possível
+    screen_width = root.winfo_screenwidth()
+    screen_height = root.winfo_screenheight()
+    x_position = screen_width - NOTIFICATION_WIDTH - 90
+    y_position = screen_height - NOTIFICATION_HEIGHT - 25
+    return x_position, y_position
+
+
+def gui_available():
+    """
+    Returns:
+        bool: False se a interface grafica ja falhou nesta sessao (ex: sem tela)
+    """
+    host = _host
+    return host is None or not host.failed
 
 
 def show_notification(title, message, game_name, direction="down", notification_type="info"):
     """
     Mostra uma notificacao personalizada ao usuario.
     
+    Retorna imediatamente: a janela e criada e animada pela thread do host.
+    
     Args:
         title (str): Titulo da notificacao
         message (str): Mensagem da notificacao
@@ -470,17 +747,43 @@ def show_notification(title, message, game_name, direction="down", notification_
         notification_type (str): Tipo da notificacao ('info' ou 'error')
         
     Returns:
-        NotificationWindow: Objeto da janela de notificacao ou None em caso de erro
+        Notification: Notificacao enviada ao host ou None em caso de erro
     """
     try:
-        notification = NotificationWindow(
+        notification = Notification(
             title=title,
             message=message,
             game_name=game_name,
             direction=direction,
             notification_type=notification_type
         )
+        _get_host().submit(notification)
         return notification
     except Exception as e:
         log.error(f"Erro ao criar notificacao: {e}", exc_info=True)
-        return None
\ No newline at end of file
+        return None
+
+
+def wait_for_notifications(timeout=None):
+    """
+    Aguarda o fechamento das notificacoes abertas e encerra o host, antes de encerrar o processo.
+    
+    Notificacoes sem pedido de fechamento sao fechadas apos o tempo minimo de exibicao.
+    
+    Args:
+        timeout (float, optional): Tempo maximo de espera total em segundos
+    """
+    global _host
+    with _active_lock:
+        notifications = list(_active_notifications)
+    
+    deadline = None if timeout is None else time.monotonic() + timeout
+    for notification in notifications:
+        notification.close()
+        remaining = None if deadline is None else max(0, deadline - time.monotonic())
+        notification.wait_closed(remaining)
+    
+    with _host_lock:
+        host, _host = _host, None
+    if host:
+        host.stop(None if deadline is None else max(1, deadline - time.monotonic()))
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Notificacoes ao usuario com backends intercambiaveis.
+
+show_notification encaminha as notificacoes para o backend ativo:
+    gui      janelas do proprio CloudQuest (customtkinter, notification_ui)
+    desktop  notificacoes do sistema (freedesktop, via notify-send)
+    log      apenas registro no log
+    none     nada
+
+Em "auto" (padrao) o backend e escolhido pelo ambiente: log em modo
+silencioso ou no Modo Jogo do Steam Deck (gamescope), desktop quando nao ha
+tela grafica ou o customtkinter nao esta instalado, e gui nos demais casos.
+No macOS o backend gui nao e usado (o Tk so funciona na thread principal).
+Apenas o backend gui importa o tkinter, o customtkinter e o Pillow.
+"""
+
+import os
+import sys
+import shutil
+import importlib.util
+import subprocess
+import threading
+import time
+
+from CloudQuest.config.settings import NOTIFIER_BACKEND, NOTIFICATION_DISPLAY_TIME
+from CloudQuest.utils.logger import log
+
+NOTIFIER_BACKENDS = ("auto", "gui", "desktop", "log", "none")
+
+
+class _DeliveredNotification:
+    """Notificacao entregue de uma vez (sem janela para fechar ou aguardar)."""
+
+    closed = True
+
+    def close(self):
+        pass
+
+    def wait_closed(self, timeout=None):
+        return True
+
+    def update_progress(self, event):
+        pass
+
+
+class NullNotifier:
+    """Descarta as notificacoes."""
+
+    name = "none"
+
+    def show(self, title, message, game_name, direction="down", notification_type="info"):
+        return _DeliveredNotification()
+
+    def wait(self, timeout=None):
+        pass
+
+
+class LogNotifier(NullNotifier):
+    """Registra as notificacoes apenas no log."""
+
+    name = "log"
+
+    def show(self, title, message, game_name, direction="down", notification_type="info"):
+        text = f"[Notificacao] {game_name}: {title} - {message}"
+        if notification_type == "error":
+            log.warning(text)
+        else:
+            log.info(text)
+        return _DeliveredNotification()
+
+
+class DesktopNotifier(LogNotifier):
+    """Notificacoes do sistema pelo padrao freedesktop (notify-send), sem bloquear."""
+
+    name = "desktop"
+
+    def __init__(self, notify_send=None):
+        """
+        Args:
+            notify_send (str, optional): Caminho do notify-send (padrao: procurado no PATH)
+        """
+        self.notify_send = notify_send or shutil.which("notify-send")
+        # Processos do notify-send ainda nao coletados (evita zumbis)
+        self._processes = []
+        self._lock = threading.Lock()
+
+    def _reap(self):
+        with self._lock:
+            self._processes = [process for process in self._processes if process.poll() is None]
+
+    def show(self, title, message, game_name, direction="down", notification_type="info"):
+        super().show(title, message, game_name, direction, notification_type)
+        if not self.notify_send:
+            return _DeliveredNotification()
+
+        from CloudQuest.utils.image_cache import find_asset
+
+        icon_prefix = "error_" if notification_type == "error" else ""
+        icon = find_asset(f"{icon_prefix}{'down' if direction == 'down' else 'up'}.png")
+        tag = f"cloudquest-{game_name}"
+        command = [
+            self.notify_send,
+            "--app-name=CloudQuest",
+            f"--urgency={'critical' if notification_type == 'error' else 'normal'}",
+            f"--expire-time={NOTIFICATION_DISPLAY_TIME}",
+            # Notificacoes do mesmo jogo se substituem (servidores que suportam as dicas)
+            f"--hint=string:x-canonical-private-synchronous:{tag}",
+            f"--hint=string:x-dunst-stack-tag:{tag}",
+        ]
+        if icon:
+            command.append(f"--icon={icon.resolve()}")
+        command += [game_name, f"{title}: {message}"]
+
+        self._reap()
+        try:
+            process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.DEVNULL)
+        except OSError as e:
+            log.warning(f"Falha ao enviar notificacao do sistema: {e}")
+        else:
+            with self._lock:
+                self._processes.append(process)
+        return _DeliveredNotification()
+
+    def wait(self, timeout=None):
+        with self._lock:
+            processes = list(self._processes)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for process in processes:
+            try:
+                process.wait(None if deadline is None else max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                break
+        self._reap()
+
+
+class GuiNotifier:
+    """Janelas de notificacao do CloudQuest (customtkinter)."""
+
+    name = "gui"
+
+    def __init__(self, fallback=None):
+        """
+        Args:
+            fallback: Backend usado se a interface grafica falhar (ex: sem tela)
+        """
+        self.fallback = fallback or LogNotifier()
+
+    def show(self, title, message, game_name, direction="down", notification_type="info"):
+        from CloudQuest.core import notification_ui
+
+        if not notification_ui.gui_available():
+            return self.fallback.show(title, message, game_name, direction, notification_type)
+        return notification_ui.show_notification(title, message, game_name, direction, notification_type)
+
+    def wait(self, timeout=None):
+        # Sem notificacoes exibidas, o modulo da interface nem chegou a ser importado
+        notification_ui = sys.modules.get("CloudQuest.core.notification_ui")
+        if notification_ui:
+            notification_ui.wait_for_notifications(timeout)
+
+
+def _gui_supported():
+    """
+    A janela de notificacao roda o Tk em uma thread propria; no macOS o Tk
+    (Cocoa) so funciona na thread principal, que fica ocupada pela sessao.
+    """
+    return sys.platform != "darwin"
+
+
+def _has_display():
+    if sys.platform == "win32":
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def _in_gamescope():
+    """Modo Jogo do Steam Deck (sessao gamescope): janelas e notificacoes nao aparecem sobre o jogo."""
+    return (os.environ.get("XDG_CURRENT_DESKTOP", "").lower() == "gamescope"
+            or bool(os.environ.get("GAMESCOPE_WAYLAND_DISPLAY")))
+
+
+def _gui_installed():
+    """Verifica se o customtkinter esta instalado, sem importa-lo."""
+    try:
+        return importlib.util.find_spec("customtkinter") is not None
+    except (ImportError, ValueError):
+        return "customtkinter" in sys.modules
+
+
+def _desktop_available():
+    return (sys.platform.startswith("linux") and bool(os.environ.get("DBUS_SESSION_BUS_ADDRESS"))
+            and shutil.which("notify-send") is not None)
+
+
+def create_notifier(backend="auto", silent=False):
+    """
+    Cria o backend de notificacao.
+
+    Args:
+        backend (str): Um de NOTIFIER_BACKENDS
+        silent (bool): Modo silencioso (em "auto", apenas registra no log)
+
+    Returns:
+        Backend com os metodos show(...) e wait(timeout)
+    """
+    if backend not in NOTIFIER_BACKENDS:
+        log.warning(f"Backend de notificacao desconhecido: {backend}. Usando escolha automatica.")
+        backend = "auto"
+
+    if backend == "auto":
+        if silent or _in_gamescope():
+            backend = "log"
+        elif _gui_supported() and _has_display() and _gui_installed():
+            backend = "gui"
+        elif _desktop_available():
+            backend = "desktop"
+        else:
+            backend = "log"
+
+    if backend == "gui" and not _gui_supported():
+        log.warning("Notificacoes graficas nao sao suportadas neste sistema. Usando o log.")
+        backend = "log"
+
+    if backend == "gui":
+        return GuiNotifier(fallback=DesktopNotifier() if _desktop_available() else LogNotifier())
+    if backend == "desktop":
+        return DesktopNotifier()
+    if backend == "log":
+        return LogNotifier()
+    return NullNotifier()
+
+
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
+def set_notifier(backend="auto", silent=False):
+    """
+    Define o backend de notificacao usado por esta execucao.
+
+    Args:
+        backend (str): Um de NOTIFIER_BACKENDS
+        silent (bool): Modo silencioso
+    """
+    global _notifier
+    notifier = create_notifier(backend, silent)
+    with _notifier_lock:
+        _notifier = notifier
+    log.debug(f"Backend de notificacao: {notifier.name}")
+
+
+def get_notifier():
+    """
+    Returns:
+        Backend de notificacao ativo (escolhido automaticamente na primeira chamada)
+    """
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            _notifier = create_notifier(NOTIFIER_BACKEND)
+        return _notifier
+
+
+def show_notification(title, message, game_name, direction="down", notification_type="info"):
+    """
+    Mostra uma notificacao ao usuario pelo backend ativo, sem bloquear.
+
+    Args:
+        title (str): Titulo da notificacao
+        message (str): Mensagem da notificacao
+        game_name (str): Nome do jogo
+        direction (str): Direcao da sincronizacao ('down' para download, 'up' para upload)
+        notification_type (str): Tipo da notificacao ('info' ou 'error')
+
+    Returns:
+        Notificacao com close() e wait_closed(timeout), ou None em caso de erro
+    """
+    try:
+        return get_notifier().show(title, message, game_name, direction, notification_type)
+    except Exception as e:
+        log.error(f"Erro ao criar notificacao: {e}", exc_info=True)
+        return None
+
+
+def wait_for_notifications(timeout=None):
+    """
+    Aguarda o fechamento das notificacoes abertas, antes de encerrar o processo.
+
+    Args:
+        timeout (float, optional): Tempo maximo de espera total em segundos
+    """
+    with _notifier_lock:
+        notifier = _notifier
+    if notifier:
+        notifier.wait(timeout)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Modo de sincronizacao empacotado.
+
+Jogos que gravam milhares de arquivos pequenos por save geram uma chamada de
+API por arquivo no 'rclone copy'. No modo empacotado o LocalDir e enviado como
+um unico .tar.gz (gerado em fluxo direto para o Rclone) e, no download, o
+pacote e extraido em um diretorio temporario que substitui o LocalDir de uma
+so vez.
+"""
+
+import os
+import gzip
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path
+
+from CloudQuest.config.settings import SYNC_MODE_DEFAULT, PACKED_MIN_FILES, PACKED_MAX_SIZE
+from CloudQuest.utils.logger import log
+from CloudQuest.utils.rclone import upload_stream, download_stream, join_remote_path
+
+BUNDLE_NAME = ".cloudquest_bundle.tar.gz"
+SYNC_MODES = ("files", "packed", "chunked", "auto")
+COMPRESS_LEVEL = 6
+# Precisao do mtime no formato tar
+MTIME_TOLERANCE = 1  # segundos
+
+
+def resolve_sync_mode(profile, local_manifest):
+    """
+    Determina o modo de sincronizacao de um perfil.
+
+    No modo 'auto' o pacote e usado quando ha muitos arquivos e o total e pequeno.
+
+    Args:
+        profile (dict): Perfil carregado (chave opcional 'SyncMode')
+        local_manifest (dict): Manifesto atual do diretorio local ou None
+
+    Returns:
+        str: 'files', 'packed' ou 'chunked'
+    """
+    mode = profile.get('SyncMode') or SYNC_MODE_DEFAULT
+    if mode not in SYNC_MODES:
+        log.warning(f"SyncMode invalido no perfil ({mode}), usando 'auto'")
+        mode = "auto"
+
+    if mode != "auto":
+        return mode
+    if not local_manifest:
+        return "files"
+
+    files = local_manifest['files']
+    total_size = sum(entry['size'] for entry in files.values())
+    if len(files) >= PACKED_MIN_FILES and total_size <= PACKED_MAX_SIZE:
+        log.info(f"Modo empacotado: {len(files)} arquivos, {total_size} bytes")
+        return "packed"
+    return "files"
+
+
+def upload_bundle(rclone_path, local_dir, remote_dir, manifest):
+    """
+    Envia os arquivos do manifesto como um unico pacote .tar.gz.
+
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        local_dir (str): Diretorio local dos saves
+        remote_dir (str): Diretorio remoto (remote:dir)
+        manifest (dict): Manifesto com os arquivos a empacotar
+    """
+    files = sorted(manifest['files'])
+    log.info(f"Enviando pacote com {len(files)} arquivo(s): {join_remote_path(remote_dir, BUNDLE_NAME)}")
+
+    def write_bundle(stream):
+        with gzip.GzipFile(fileobj=stream, mode='wb', compresslevel=COMPRESS_LEVEL, mtime=0) as compressed:
+            with tarfile.open(fileobj=compressed, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+                for relative in files:
+                    tar.add(os.path.join(local_dir, relative), arcname=relative, recursive=False)
+
+    upload_stream(rclone_path, join_remote_path(remote_dir, BUNDLE_NAME), write_bundle)
+    log.info("Pacote enviado")
+
+
+def _check_member(member):
+    """Aceita apenas arquivos e diretorios com caminhos relativos dentro do destino."""
+    path = Path(member.name)
+    if path.is_absolute() or path.drive or '..' in path.parts:
+        raise ValueError(f"Caminho invalido no pacote: {member.name}")
+    if not (member.isfile() or member.isdir()):
+        raise ValueError(f"Tipo de entrada nao suportado no pacote: {member.name}")
+
+
+def _extract_bundle(stream, staging_dir):
+    """Extrai o pacote recebido em fluxo para o diretorio temporario."""
+    # Filtro 'data' do tarfile quando disponivel (Python 3.12+ e backports)
+    options = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+    with tarfile.open(fileobj=stream, mode='r|gz') as tar:
+        for member in tar:
+            _check_member(member)
+            member.mode = (member.mode | 0o600) & 0o777
+            tar.extract(member, staging_dir, set_attrs=member.isfile(), **options)
+
+
+def _keep_local_files(local_dir, staging_dir, update):
+    """
+    Leva para o diretorio temporario os arquivos locais que devem ser mantidos.
+
+    Arquivos ausentes no pacote sao sempre mantidos; com 'update', tambem os
+    mais novos que a versao do pacote (mesma regra do --update do Rclone).
+    """
+    kept = 0
+    for current, dirs, files in os.walk(local_dir):
+        relative_dir = os.path.relpath(current, local_dir)
+        target_dir = os.path.normpath(os.path.join(staging_dir, relative_dir))
+        os.makedirs(target_dir, exist_ok=True)
+
+        # Links para diretorios nao sao percorridos; recriar o proprio link
+        for name in [name for name in dirs if os.path.islink(os.path.join(current, name))]:
+            dirs.remove(name)
+            target = os.path.join(target_dir, name)
+            if not os.path.lexists(target):
+                os.symlink(os.readlink(os.path.join(current, name)), target)
+
+        for name in files:
+            source = os.path.join(current, name)
+            target = os.path.join(target_dir, name)
+            if os.path.lexists(target):
+                if not update or os.path.getmtime(source) <= os.path.getmtime(target) + MTIME_TOLERANCE:
+                    continue
+                os.unlink(target)
+
+            # Hard link evita copiar o conteudo; a copia e o fallback
+            try:
+                os.link(source, target, follow_symlinks=False)
+            except OSError:
+                shutil.copy2(source, target, follow_symlinks=False)
+            kept += 1
+    return kept
+
+
+def _replace_dir(local_dir, staging_dir):
+    """Substitui o diretorio local pelo diretorio temporario."""
+    if not os.path.isdir(local_dir):
+        os.rename(staging_dir, local_dir)
+        return
+
+    backup_dir = f"{staging_dir}.old"
+    try:
+        shutil.copymode(local_dir, staging_dir)
+        os.rename(local_dir, backup_dir)
+    except OSError as e:
+        # Diretorio em uso ou ponto de montagem: substituir arquivo a arquivo
+        log.warning(f"Nao foi possivel substituir o diretorio de uma vez ({e}); substituindo arquivos")
+        for current, dirs, files in os.walk(staging_dir):
+            target_dir = os.path.join(local_dir, os.path.relpath(current, staging_dir))
+            os.makedirs(target_dir, exist_ok=True)
+            for name in files:
+                os.replace(os.path.join(current, name), os.path.join(target_dir, name))
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return
+
+    try:
+        os.rename(staging_dir, local_dir)
+    except OSError:
+        os.rename(backup_dir, local_dir)
+        raise
+    shutil.rmtree(backup_dir, ignore_errors=True)
+
+
+def download_bundle(rclone_path, remote_dir, local_dir, update=True):
+    """
+    Baixa e extrai o pacote remoto, substituindo o diretorio local de uma vez.
+
+    O pacote e extraido em um diretorio temporario ao lado do LocalDir; os
+    arquivos locais a manter sao adicionados a ele e so entao o diretorio
+    e trocado. Uma falha no meio do caminho deixa o LocalDir intacto.
+
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_dir (str): Diretorio remoto (remote:dir)
+        local_dir (str): Diretorio local dos saves
+        update (bool): Manter arquivos locais mais novos que os do pacote
+    """
+    # Resolver links para trocar o diretorio real, nao o link
+    local_dir = os.path.realpath(local_dir)
+    remote_path = join_remote_path(remote_dir, BUNDLE_NAME)
+    log.info(f"Baixando pacote: {remote_path} -> {local_dir}")
+
+    parent_dir = os.path.dirname(local_dir)
+    staging_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(local_dir)}.cloudquest-", dir=parent_dir)
+    try:
+        download_stream(rclone_path, remote_path, lambda stream: _extract_bundle(stream, staging_dir))
+        kept = _keep_local_files(local_dir, staging_dir, update) if os.path.isdir(local_dir) else 0
+        if kept:
+            log.info(f"{kept} arquivo(s) local(is) mantido(s)")
+        _replace_dir(local_dir, staging_dir)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    log.info("Pacote extraido")
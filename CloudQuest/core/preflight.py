@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Verificacoes preliminares do Rclone.
+
+Executa em paralelo as verificacoes independentes (versao, remotes e criacao
+do diretorio remoto) e guarda os resultados em um arquivo de estado. O cache
+e invalidado quando o executavel do Rclone ou o rclone.conf mudam.
+"""
+
+import os
+import json
+import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from CloudQuest.config.settings import RCLONE_STATE_FILE
+from CloudQuest.utils.fileio import write_json_atomic, file_lock
+from CloudQuest.utils.logger import log
+from CloudQuest.utils.rclone import locate_rclone, list_remotes, get_rclone_version, create_remote_dir
+
+STATE_VERSION = 1
+
+# Serializa leitura/escrita do arquivo de estado entre threads (file_lock cobre outros processos)
+_state_lock = threading.Lock()
+
+
+def get_rclone_config_path():
+    """
+    Determina o caminho do rclone.conf sem executar o Rclone.
+
+    Returns:
+        Path: Caminho do arquivo de configuracao (pode nao existir)
+    """
+    if os.environ.get("RCLONE_CONFIG"):
+        return Path(os.environ["RCLONE_CONFIG"])
+
+    if platform.system() == "Windows":
+        return Path(os.environ.get("APPDATA", "")) / "rclone" / "rclone.conf"
+
+    config_home = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+    config_path = Path(config_home) / "rclone" / "rclone.conf"
+    legacy_path = Path.home() / ".rclone.conf"
+    if not config_path.exists() and legacy_path.exists():
+        return legacy_path
+    return config_path
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_state():
+    try:
+        with open(RCLONE_STATE_FILE, 'r', encoding='utf-8') as file:
+            state = json.load(file)
+        if state.get('version') == STATE_VERSION:
+            return state
+    except (OSError, ValueError):
+        pass
+    return {'version': STATE_VERSION, 'entries': {}}
+
+
+def _save_state(state):
+    try:
+        write_json_atomic(RCLONE_STATE_FILE, state, indent=4)
+    except OSError as e:
+        log.warning(f"Falha ao salvar estado do Rclone: {e}")
+
+
+def run_preflight(rclone_path, cloud_remote, cloud_dir):
+    """
+    Verifica o Rclone e garante o diretorio remoto, reaproveitando o cache.
+
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        cloud_remote (str): Nome do remote
+        cloud_dir (str): Diretorio remoto
+
+    Returns:
+        dict: Entrada do cache (binario, versao, remotes, diretorios conhecidos)
+
+    Raises:
+        FileNotFoundError: Se o Rclone nao for encontrado
+        ValueError: Se o remote nao estiver configurado
+    """
+    log.info("Verificando configuracao do Rclone...")
+    binary = locate_rclone(rclone_path)
+    config_path = get_rclone_config_path()
+    remote_dir = f"{cloud_remote}:{cloud_dir}"
+
+    with _state_lock:
+        state = _load_state()
+    cached = state['entries'].get(rclone_path)
+
+    fingerprint = {
+        'binary': binary,
+        'binary_mtime': _mtime(binary),
+        'config_path': str(config_path),
+        'config_mtime': _mtime(config_path)
+    }
+    if cached and all(cached.get(key) == value for key, value in fingerprint.items()):
+        entry = cached
+        log.debug("Cache de verificacao do Rclone valido")
+    else:
+        entry = dict(fingerprint, version=None, remotes=None, remote_dirs=[])
+
+    # Apenas as verificacoes ausentes do cache sao executadas, em paralelo
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="preflight") as executor:
+        version_future = None if entry['version'] else executor.submit(get_rclone_version, rclone_path)
+        remotes_future = None if entry['remotes'] is not None else executor.submit(list_remotes, rclone_path)
+        mkdir_future = None
+        if remote_dir not in entry['remote_dirs']:
+            mkdir_future = executor.submit(create_remote_dir, rclone_path, cloud_remote, cloud_dir)
+
+        if version_future:
+            try:
+                entry['version'] = version_future.result()
+            except Exception as e:
+                log.warning(f"Falha ao obter versao do Rclone: {e}")
+        if remotes_future:
+            entry['remotes'] = remotes_future.result()
+        if mkdir_future and mkdir_future.result():
+            entry['remote_dirs'] = entry['remote_dirs'] + [remote_dir]
+
+    log.info(f"Rclone {entry['version'] or ''} encontrado em: {binary}")
+
+    with _state_lock, file_lock(RCLONE_STATE_FILE):
+        # Recarrega para nao sobrescrever entradas gravadas por outras sessoes
+        state = _load_state()
+        stored = state['entries'].get(rclone_path)
+        if stored and all(stored.get(key) == value for key, value in fingerprint.items()):
+            entry['remote_dirs'] = sorted(set(entry['remote_dirs']) | set(stored.get('remote_dirs', [])))
+        state['entries'][rclone_path] = entry
+        _save_state(state)
+
+    if cloud_remote not in entry['remotes']:
+        raise ValueError(f"Remote '{cloud_remote}' nao configurado")
+
+    log.info("Configuracao do Rclone validada")
+    return entry
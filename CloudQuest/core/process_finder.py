@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Localizacao do processo do jogo.
+
+Em vez de percorrer a tabela de processos inteira a cada segundo, apenas a
+primeira varredura inspeciona todos os processos; as seguintes comparam a
+lista de PIDs (no Linux, uma leitura de /proc) e inspecionam so os novos.
+Processos descendentes do launcher iniciado pelo CloudQuest tem prioridade.
+Alem do nome, o processo e reconhecido pelo executavel ou pelo primeiro
+argumento da linha de comando, que e como o Wine/Proton expoe o .exe do jogo
+(o nome do processo pode ser 'wine64-preloader' ou vir truncado).
+"""
+
+import os
+import re
+import time
+
+import psutil
+
+from CloudQuest.config.settings import PROCESS_SCAN_INTERVAL, PROCESS_SCAN_TIMEOUT
+from CloudQuest.utils.logger import log
+
+# Nomes de processo no Linux (comm) sao truncados em 15 caracteres
+COMM_MAX_LENGTH = 15
+
+
+def _list_pids():
+    """Lista os PIDs atuais sem consultar os dados de cada processo."""
+    if os.path.isdir('/proc/self'):
+        return {int(name) for name in os.listdir('/proc') if name.isdigit()}
+    return set(psutil.pids())
+
+
+def _base_name(path):
+    """Nome do executavel sem diretorio (separadores Unix ou Windows) e sem extensao."""
+    return os.path.splitext(re.split(r'[\\/]', path)[-1])[0].lower()
+
+
+def process_matches(proc, process_name):
+    """
+    Verifica se o processo corresponde ao nome do processo do jogo.
+
+    Args:
+        proc (psutil.Process): Processo candidato
+        process_name (str): Nome do processo do jogo (com ou sem extensao)
+
+    Returns:
+        bool: True se o nome, o executavel ou o primeiro argumento corresponder
+    """
+    target = _base_name(process_name)
+    target_file = re.split(r'[\\/]', process_name)[-1].lower()
+    try:
+        name = proc.name().lower()
+        if os.path.splitext(name)[0] == target:
+            return True
+
+        # Nome truncado: confirmar pelo executavel ou pela linha de comando
+        truncated = len(name) == COMM_MAX_LENGTH and target_file.startswith(name)
+        if not truncated and not name.startswith('wine') and not name.endswith('.exe'):
+            return False
+
+        try:
+            if _base_name(proc.exe()) == target:
+                return True
+        except (psutil.AccessDenied, OSError):
+            pass
+
+        cmdline = proc.cmdline()
+        return bool(cmdline) and _base_name(cmdline[0]) == target
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return False
+
+
+def _is_descendant(proc, ancestor_pid):
+    try:
+        return any(parent.pid == ancestor_pid for parent in proc.parents())
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+
+
+def find_game_process(process_name, timeout=PROCESS_SCAN_TIMEOUT, launcher_pid=None,
+                      interval=PROCESS_SCAN_INTERVAL):
+    """
+    Aguarda o processo do jogo aparecer.
+
+    Args:
+        process_name (str): Nome do processo do jogo
+        timeout (float): Tempo maximo de espera em segundos
+        launcher_pid (int, optional): PID do launcher iniciado (descendentes tem prioridade)
+        interval (float): Intervalo entre verificacoes em segundos
+
+    Returns:
+        psutil.Process: Processo do jogo ou None se nao encontrado no tempo limite
+    """
+    deadline = time.monotonic() + timeout
+    seen = set()
+    scans = 0
+
+    while True:
+        pids = _list_pids()
+        new_pids = sorted(pids - seen)
+        # PIDs encerrados saem do conjunto para que um PID reutilizado seja inspecionado
+        seen = pids
+        scans += 1
+
+        matches = []
+        for pid in new_pids:
+            try:
+                proc = psutil.Process(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            if process_matches(proc, process_name):
+                matches.append(proc)
+
+        if matches:
+            if launcher_pid:
+                descendants = [proc for proc in matches if _is_descendant(proc, launcher_pid)]
+                matches = descendants or matches
+            game_process = matches[0]
+            log.info(f"Processo do jogo encontrado (PID: {game_process.pid}, {scans} verificacao(oes))")
+            return game_process
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(interval, remaining))
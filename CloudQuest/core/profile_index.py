@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Indice dos perfis.
+
+Mantem em um arquivo compacto (profiles_index.json) os dados mais consultados
+de cada perfil: nome do jogo, AppID, processo, remote, diretorios e a ultima
+sincronizacao (data, direcao, quantidade e tamanho dos arquivos, obtidos do
+manifesto local). O indice e atualizado de forma incremental: uma listagem
+do diretorio de perfis compara mtime e tamanho, e apenas perfis e manifestos
+alterados sao lidos novamente. As buscas por AppID, processo e remote usam
+dicionarios em memoria.
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+
+from CloudQuest.config.settings import PROFILES_DIR, PROFILE_INDEX_FILE
+from CloudQuest.core.manifest import MANIFEST_SUFFIX
+from CloudQuest.core.profile_manager import KEY_MAPPING
+from CloudQuest.utils.fileio import write_json_atomic
+from CloudQuest.utils.logger import log
+
+INDEX_VERSION = 1
+PROFILE_SUFFIX = ".json"
+# Nomes de processo no Linux (comm) sao truncados em 15 caracteres
+COMM_MAX_LENGTH = 15
+
+
+def normalize_process_name(process_name):
+    """
+    Normaliza um nome de processo para busca (sem diretorio, sem extensao, minusculo).
+
+    Args:
+        process_name (str): Nome ou caminho do executavel
+
+    Returns:
+        str: Nome normalizado
+    """
+    name = process_name.replace('\\', '/').rsplit('/', 1)[-1]
+    return os.path.splitext(name)[0].lower()
+
+
+def _profile_fields(path):
+    """Le os campos indexados de um arquivo de perfil (formato atual ou antigo)."""
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    profile = {new_key: data[old_key] for old_key, new_key in KEY_MAPPING.items() if old_key in data}
+    profile.update(data)
+    app_id = profile.get('AppID') or profile.get('app_id')
+    return {
+        'game_name': profile.get('GameName'),
+        'app_id': str(app_id) if app_id else None,
+        'process': profile.get('GameProcess'),
+        'remote': profile.get('CloudRemote'),
+        'cloud_dir': profile.get('CloudDir'),
+        'local_dir': profile.get('LocalDir')
+    }
+
+
+def _manifest_fields(path):
+    """Le a ultima sincronizacao registrada no manifesto local."""
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+        files = manifest.get('files') or {}
+        return {
+            'last_sync': manifest.get('synced_at'),
+            'last_sync_direction': manifest.get('direction'),
+            'files': len(files),
+            'size': sum(entry.get('size', 0) for entry in files.values())
+        }
+    except (OSError, ValueError, AttributeError) as e:
+        log.warning(f"Falha ao ler manifesto {path}: {e}")
+        return {}
+
+
+def _stat_key(entry):
+    stat = entry.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class ProfileIndex:
+    """Indice dos perfis com busca por AppID, processo e remote."""
+
+    def __init__(self, profiles_dir=None, index_file=PROFILE_INDEX_FILE):
+        """
+        Args:
+            profiles_dir (Path, optional): Diretorio dos perfis (padrao: PROFILES_DIR)
+            index_file (Path): Arquivo onde o indice e mantido entre execucoes
+        """
+        self.profiles_dir = Path(profiles_dir or PROFILES_DIR)
+        self.index_file = Path(index_file)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._build_lookups()
+
+    def _load(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as file:
+                index = json.load(file)
+            if index.get('version') == INDEX_VERSION and index.get('profiles_dir') == str(self.profiles_dir):
+                return index['profiles']
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def _save(self):
+        index = {'version': INDEX_VERSION, 'profiles_dir': str(self.profiles_dir), 'profiles': self._entries}
+        try:
+            write_json_atomic(self.index_file, index, separators=(',', ':'))
+        except OSError as e:
+            log.warning(f"Falha ao salvar indice de perfis: {e}")
+
+    def _build_lookups(self):
+        self._by_app_id = {}
+        self._by_process = {}
+        self._by_remote = {}
+        for name, entry in sorted(self._entries.items()):
+            if entry.get('app_id'):
+                self._by_app_id.setdefault(entry['app_id'], []).append(name)
+            if entry.get('process'):
+                self._by_process.setdefault(normalize_process_name(entry['process']), []).append(name)
+            if entry.get('remote'):
+                self._by_remote.setdefault(entry['remote'], []).append(name)
+
+    def refresh(self):
+        """
+        Atualiza o indice lendo apenas os perfis e manifestos alterados.
+
+        Returns:
+            ProfileIndex: O proprio indice
+        """
+        with self._lock:
+            try:
+                listing = {entry.name: entry for entry in os.scandir(self.profiles_dir) if entry.is_file()}
+            except OSError as e:
+                log.error(f"Erro ao listar perfis: {e}")
+                return self
+
+            entries = {}
+            changed = False
+            for file_name, dir_entry in listing.items():
+                if not file_name.endswith(PROFILE_SUFFIX) or file_name.startswith('.'):
+                    continue
+                name = file_name[:-len(PROFILE_SUFFIX)]
+                entry = dict(self._entries.get(name) or {})
+
+                profile_stat = _stat_key(dir_entry)
+                if entry.get('profile_stat') != profile_stat:
+                    try:
+                        entry.update(_profile_fields(dir_entry.path))
+                    except (OSError, ValueError) as e:
+                        log.warning(f"Perfil invalido ignorado no indice: {file_name} ({e})")
+                        continue
+                    entry['profile_stat'] = profile_stat
+                    changed = True
+
+                manifest_entry = listing.get(f"{name}{MANIFEST_SUFFIX}")
+                manifest_stat = _stat_key(manifest_entry) if manifest_entry else None
+                if entry.get('manifest_stat', False) != manifest_stat:
+                    for key in ('last_sync', 'last_sync_direction', 'files', 'size'):
+                        entry.pop(key, None)
+                    if manifest_entry:
+                        entry.update(_manifest_fields(manifest_entry.path))
+                    entry['manifest_stat'] = manifest_stat
+                    changed = True
+
+                entries[name] = entry
+
+            if changed or entries.keys() != self._entries.keys():
+                self._entries = entries
+                self._build_lookups()
+                self._save()
+        return self
+
+    def get(self, profile_name):
+        """
+        Args:
+            profile_name (str): Nome do perfil
+
+        Returns:
+            dict: Dados indexados do perfil ou None
+        """
+        entry = self._entries.get(profile_name)
+        return dict(entry, name=profile_name) if entry else None
+
+    def all(self):
+        """
+        Returns:
+            list: Dados indexados de todos os perfis, ordenados pelo nome
+        """
+        return [self.get(name) for name in sorted(self._entries)]
+
+    def find_by_app_id(self, app_id):
+        """
+        Args:
+            app_id (str | int): AppID do jogo
+
+        Returns:
+            list: Nomes dos perfis
+        """
+        return list(self._by_app_id.get(str(app_id), []))
+
+    def find_by_process(self, process_name):
+        """
+        Localiza os perfis de um processo (ex: um processo recem-iniciado).
+
+        Args:
+            process_name (str): Nome ou caminho do executavel (aceita o nome
+                truncado do Linux)
+
+        Returns:
+            list: Nomes dos perfis
+        """
+        key = normalize_process_name(process_name)
+        if key in self._by_process:
+            return list(self._by_process[key])
+
+        if len(process_name) == COMM_MAX_LENGTH:
+            prefix = process_name.lower()
+            return [name for process, names in self._by_process.items()
+                    if process.startswith(prefix) or f"{process}.exe".startswith(prefix) for name in names]
+        return []
+
+    def find_by_remote(self, remote):
+        """
+        Args:
+            remote (str): Nome do remote do Rclone
+
+        Returns:
+            list: Nomes dos perfis
+        """
+        return list(self._by_remote.get(remote, []))
+
+    def search(self, text):
+        """
+        Busca perfis pelo nome do perfil ou do jogo.
+
+        Args:
+            text (str): Trecho a procurar (sem diferenciar maiusculas)
+
+        Returns:
+            list: Nomes dos perfis
+        """
+        text = text.lower()
+        return [name for name, entry in sorted(self._entries.items())
+                if text in name.lower() or text in (entry.get('game_name') or '').lower()]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_profile_index():
+    """
+    Retorna o indice compartilhado de PROFILES_DIR, ja atualizado.
+
+    Returns:
+        ProfileIndex: Indice dos perfis
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ProfileIndex()
+    return _index.refresh()
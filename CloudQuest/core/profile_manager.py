@@ -3,146 +3,261 @@
 """
 Gerenciador de perfis do CloudQuest.
 Este modulo centraliza as operacoes relacionadas aos perfis de jogos.
+
+Os perfis sao lidos e normalizados uma unica vez por processo e mantidos em
+cache ate o arquivo mudar (mtime/tamanho). Perfis no formato antigo (chaves
+'name', 'save_location' etc., gravadas pelo QuestConfig) sao convertidos
+para as chaves atuais e o arquivo e regravado, para que a conversao nao se
+repita. O mesmo modulo e usado pelo QuestConfig para gravar e ler perfis.
 """
 
 import json
-from pathlib import Path
 import platform
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from collections.abc import Mapping
 
 from CloudQuest.config.settings import PROFILES_DIR
+from CloudQuest.utils.fileio import write_json_atomic, file_lock
 from CloudQuest.utils.logger import log
 
-def load_profile(profile_name):
+# Mapa de chaves: antigo -> novo
+KEY_MAPPING = {
+    'name': 'GameName',
+    'executable_path': 'ExecutablePath',
+    'process_name': 'GameProcess',
+    'save_location': 'LocalDir',
+    'cloud_remote': 'CloudRemote',
+    'cloud_dir': 'CloudDir'
+}
+REQUIRED_KEYS = list(KEY_MAPPING.values()) + ['RclonePath']
+
+if platform.system() == "Windows":
+    DEFAULT_RCLONE_PATH = "C:\\Program Files\\rclone\\rclone.exe"
+else:  # Linux, macOS, etc. (esperado no PATH)
+    DEFAULT_RCLONE_PATH = "rclone"
+
+# Perfis carregados: caminho -> Profile
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class Profile(Mapping):
+    """
+    Perfil normalizado e imutavel.
+
+    Acessado como um dicionario somente leitura (profile['GameName'],
+    profile.get('SyncMode')); use to_dict() para obter uma copia editavel.
+    """
+
+    __slots__ = ('name', 'path', 'mtime_ns', 'size', '_data')
+
+    def __init__(self, name, path, mtime_ns, size, data):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'path', path)
+        object.__setattr__(self, 'mtime_ns', mtime_ns)
+        object.__setattr__(self, 'size', size)
+        object.__setattr__(self, '_data', _freeze(data))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Perfil imutavel")
+
+    def __delattr__(self, key):
+        raise AttributeError("Perfil imutavel")
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"Profile({self.name!r}, {dict(self._data)!r})"
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Copia editavel dos dados do perfil
+        """
+        return _thaw(self._data)
+
+
+def normalize_profile(data):
+    """
+    Converte as chaves do formato antigo para as atuais.
+
+    Args:
+        data (dict): Dados do perfil
+
+    Returns:
+        tuple: (dados normalizados, True se algo foi alterado)
+    """
+    normalized = {}
+    changed = False
+    for key, value in data.items():
+        if key in KEY_MAPPING:
+            changed = True
+            # Se o arquivo tiver as duas versoes, a chave atual prevalece
+            if KEY_MAPPING[key] not in data:
+                normalized[KEY_MAPPING[key]] = value
+        else:
+            normalized[key] = value
+
+    # Se nao ha RclonePath, adiciona um valor padrao
+    if 'RclonePath' not in normalized:
+        normalized['RclonePath'] = DEFAULT_RCLONE_PATH
+        log.info(f"RclonePath nao encontrado, usando valor padrao: {DEFAULT_RCLONE_PATH}")
+        changed = True
+
+    return normalized, changed
+
+
+def _profile_path(profile_name, profiles_dir=None):
+    return Path(profiles_dir or PROFILES_DIR) / f"{profile_name}.json"
+
+
+def _read_profile(profile_name, profile_path):
+    """Le, normaliza e valida o arquivo do perfil (migrando o formato antigo)."""
+    with open(profile_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+
+    normalized, changed = normalize_profile(data)
+
+    # Verifica se todas as chaves obrigatorias estao presentes
+    missing_keys = [key for key in REQUIRED_KEYS if key not in normalized]
+    if missing_keys:
+        raise ValueError(f"Chaves obrigatorias ausentes no perfil: {', '.join(missing_keys)}")
+
+    if changed:
+        try:
+            with file_lock(profile_path):
+                # Outro processo pode ter convertido ou alterado o perfil enquanto isso
+                with open(profile_path, 'r', encoding='utf-8') as file:
+                    if json.load(file) == data:
+                        write_json_atomic(profile_path, normalized, indent=4)
+            log.info(f"Perfil convertido para o formato atual: {profile_name}")
+        except (OSError, ValueError) as e:
+            # Sem permissao de escrita: o perfil continua utilizavel
+            log.warning(f"Nao foi possivel regravar o perfil no formato atual: {e}")
+
+    # Garantir que o diretorio local exista
+    local_dir = Path(normalized['LocalDir'])
+    if not local_dir.exists():
+        log.info(f"Criando diretorio local: {local_dir}")
+        local_dir.mkdir(parents=True, exist_ok=True)
+
+    return normalized
+
+
+def load_profile(profile_name, profiles_dir=None):
     """
     Carrega as configuracoes do perfil do usuario.
-    
+
+    O perfil e lido do disco apenas na primeira chamada ou quando o arquivo
+    muda; as demais chamadas retornam o mesmo objeto.
+
     Args:
         profile_name (str): O nome do perfil a ser carregado
-        
+        profiles_dir (Path, optional): Diretorio dos perfis (padrao: PROFILES_DIR)
+
     Returns:
-        dict: O perfil carregado
-        
+        Profile: O perfil carregado (somente leitura)
+
     Raises:
         FileNotFoundError: Se o arquivo de perfil nao existir
         ValueError: Se faltar dados obrigatorios no perfil
     """
-    profile_path = PROFILES_DIR / f"{profile_name}.json"
-    
-    if not profile_path.exists():
+    profile_path = _profile_path(profile_name, profiles_dir)
+
+    try:
+        stat = profile_path.stat()
+    except FileNotFoundError:
         log.error(f"Arquivo de configuracao nao encontrado: {profile_path}")
         raise FileNotFoundError(f"Arquivo de configuracao do usuario nao encontrado: {profile_path}")
-    
-    try:
-        with open(profile_path, 'r', encoding='utf-8') as file:
-            profile = json.load(file)
-            
-        # Mapa de chaves: antigo -> novo
-        key_mapping = {
-            'name': 'GameName',
-            'executable_path': 'ExecutablePath',
-            'process_name': 'GameProcess',
-            'save_location': 'LocalDir',
-            'cloud_remote': 'CloudRemote',
-            'cloud_dir': 'CloudDir'
-        }
-        
-        # Lista de pares de chaves obrigatórias (formato antigo, formato novo)
-        required_key_pairs = [
-            ('name', 'GameName'),
-            ('executable_path', 'ExecutablePath'),
-            ('process_name', 'GameProcess'),
-            ('save_location', 'LocalDir'),
-            ('cloud_remote', 'CloudRemote'),
-            ('cloud_dir', 'CloudDir')
-        ]
-        
-        # Normaliza as chaves do perfil
-        normalized_profile = {}
-        
-        # Primeiro copia todas as chaves existentes para o perfil normalizado
-        for key, value in profile.items():
-            normalized_profile[key] = value
-            
-            # Se esta é uma chave antiga, adiciona também com o novo nome
-            if key in key_mapping:
-                normalized_profile[key_mapping[key]] = value
-                
-        # Se não há RclonePath, adiciona um valor padrão
-        if 'RclonePath' not in normalized_profile:
-            if platform.system() == "Windows":
-                normalized_profile['RclonePath'] = "C:\\Program Files\\rclone\\rclone.exe"
-                log.info(f"RclonePath não encontrado, usando valor padrão do Windows.")
-            else: # Linux, macOS, etc.
-                normalized_profile['RclonePath'] = "rclone"
-                log.info(f"RclonePath não encontrado, usando valor padrão 'rclone' (esperado no PATH).")
-            
-        # Verifica se todas as chaves obrigatórias estão presentes
-        missing_keys = []
-        for old_key, new_key in required_key_pairs:
-            # Se nem a chave antiga nem a nova estão presentes, é um erro
-            if old_key not in profile and new_key not in profile:
-                missing_keys.append(f"{old_key}/{new_key}")
-        
-        # Adiciona RclonePath à verificação
-        if 'RclonePath' not in normalized_profile:
-            missing_keys.append("RclonePath")
-            
-        if missing_keys:
-            raise ValueError(f"Chaves obrigatorias ausentes no perfil: {', '.join(missing_keys)}")
-            
-        # Garantir que o diretorio local exista
-        local_dir_key = 'LocalDir' if 'LocalDir' in normalized_profile else 'save_location'
-        local_dir = Path(normalized_profile[local_dir_key])
-        if not local_dir.exists():
-            log.info(f"Criando diretorio local: {local_dir}")
-            local_dir.mkdir(parents=True, exist_ok=True)
-            
-        return normalized_profile
-    
-    except json.JSONDecodeError as e:
-        log.error(f"Erro ao processar JSON do perfil: {e}")
-        raise
-    except Exception as e:
-        log.error(f"Erro ao carregar perfil: {e}")
-        raise
-        
-def list_profiles():
+
+    with _cache_lock:
+        cached = _cache.get(profile_path)
+        if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            return cached
+
+        try:
+            data = _read_profile(profile_name, profile_path)
+        except json.JSONDecodeError as e:
+            log.error(f"Erro ao processar JSON do perfil: {e}")
+            raise
+        except Exception as e:
+            log.error(f"Erro ao carregar perfil: {e}")
+            raise
+
+        # A migracao pode ter regravado o arquivo
+        stat = profile_path.stat()
+        profile = Profile(profile_name, profile_path, stat.st_mtime_ns, stat.st_size, data)
+        _cache[profile_path] = profile
+        return profile
+
+
+def list_profiles(profiles_dir=None):
     """
     Lista todos os perfis disponiveis.
-    
+
+    Args:
+        profiles_dir (Path, optional): Diretorio dos perfis (padrao: PROFILES_DIR)
+
     Returns:
         list: Lista com nomes dos perfis disponiveis
     """
-    profiles = []
-    
     try:
-        for profile_file in PROFILES_DIR.glob("*.json"):
-            profiles.append(profile_file.stem)
-            
-        return profiles
+        return [profile_file.stem for profile_file in Path(profiles_dir or PROFILES_DIR).glob("*.json")]
     except Exception as e:
         log.error(f"Erro ao listar perfis: {e}")
         return []
 
-def save_profile(profile_name, profile_data):
+
+def save_profile(profile_name, profile_data, profiles_dir=None):
     """
-    Salva um perfil.
-    
+    Salva um perfil (sempre no formato atual).
+
     Args:
         profile_name (str): Nome do perfil
-        profile_data (dict): Dados do perfil
-        
+        profile_data (dict | Profile): Dados do perfil
+        profiles_dir (Path, optional): Diretorio dos perfis (padrao: PROFILES_DIR)
+
     Returns:
         bool: True se salvo com sucesso, False caso contrario
     """
-    profile_path = PROFILES_DIR / f"{profile_name}.json"
-    
+    profile_path = _profile_path(profile_name, profiles_dir)
+    if isinstance(profile_data, Profile):
+        profile_data = profile_data.to_dict()
+
     try:
-        with open(profile_path, 'w', encoding='utf-8') as file:
-            json.dump(profile_data, file, indent=4, ensure_ascii=False)
-        
+        normalized, _ = normalize_profile(profile_data)
+        profile_path.parent.mkdir(parents=True, exist_ok=True)
+        with _cache_lock, file_lock(profile_path):
+            write_json_atomic(profile_path, normalized, indent=4)
+            _cache.pop(profile_path, None)
+
         log.info(f"Perfil salvo com sucesso: {profile_name}")
         return True
     except Exception as e:
         log.error(f"Erro ao salvar perfil: {e}")
-        return False 
\ No newline at end of file
+        return False
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Entrega do nome do perfil a uma sessao.
+
+Launchers externos que nao passam o perfil na linha de comando entregam-no
+por um arquivo proprio da sessao (--handoff ARQUIVO ou CLOUDQUEST_HANDOFF),
+pela variavel CLOUDQUEST_PROFILE ou pelo arquivo temporario global
+(cloudquest_profile.txt). Cada arquivo e reivindicado com uma renomeacao
+atomica antes da leitura, de modo que apenas uma instancia o consome mesmo
+com varias sessoes iniciando ao mesmo tempo.
+"""
+
+import os
+import uuid
+
+from CloudQuest.config.settings import TEMP_PROFILE_PATH
+from CloudQuest.utils.logger import log
+
+HANDOFF_ENV = "CLOUDQUEST_HANDOFF"
+PROFILE_ENV = "CLOUDQUEST_PROFILE"
+
+
+def claim_handoff(path):
+    """
+    Le e remove um arquivo de entrega, garantindo que so uma sessao o consuma.
+
+    Args:
+        path (str | Path): Arquivo de entrega
+
+    Returns:
+        str: Nome do perfil ou None se o arquivo nao existir (ou ja foi consumido)
+    """
+    path = os.fspath(path)
+    claimed_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.claimed"
+    try:
+        os.replace(path, claimed_path)
+    except FileNotFoundError:
+        return None
+
+    try:
+        with open(claimed_path, 'r', encoding='utf-8') as file:
+            return file.read().strip() or None
+    finally:
+        try:
+            os.unlink(claimed_path)
+        except OSError:
+            pass
+
+
+def receive_profile(handoff_path=None):
+    """
+    Obtem o perfil entregue a esta sessao por um launcher externo.
+
+    Ordem: arquivo informado em --handoff, CLOUDQUEST_HANDOFF,
+    CLOUDQUEST_PROFILE e, por fim, o arquivo temporario global antigo.
+
+    Args:
+        handoff_path (str, optional): Arquivo informado em --handoff
+
+    Returns:
+        str: Nome do perfil ou None
+    """
+    for source, path in (("--handoff", handoff_path), (HANDOFF_ENV, os.environ.get(HANDOFF_ENV))):
+        if not path:
+            continue
+        try:
+            profile_name = claim_handoff(path)
+        except OSError as e:
+            log.error(f"Erro ao ler arquivo de entrega do perfil ({source}): {e}")
+            continue
+        if profile_name:
+            log.info(f"Perfil recebido por {source}: {profile_name}")
+            return profile_name
+        log.warning(f"Arquivo de entrega do perfil ausente ou vazio: {path}")
+
+    profile_name = os.environ.get(PROFILE_ENV, "").strip()
+    if profile_name:
+        log.info(f"Perfil recebido por {PROFILE_ENV}: {profile_name}")
+        return profile_name
+
+    try:
+        profile_name = claim_handoff(TEMP_PROFILE_PATH)
+    except OSError as e:
+        log.error(f"Erro ao ler arquivo de perfil: {e}")
+        return None
+    if profile_name:
+        log.info(f"Perfil lido do arquivo temporario: {profile_name}")
+    return profile_name
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Acompanhamento da arvore de processos da sessao de jogo.
+
+Muitos jogos sao iniciados por um launcher e o processo que grava os saves e
+um neto dele; o launcher, por sua vez, pode continuar aberto depois que o
+jogo fecha. A sessao acompanha todos os descendentes do jogo (inclusive os
+reiniciados pelo launcher e os filhos orfaos) e termina quando nenhum deles,
+exceto os ignorados, esta em execucao.
+
+Os descendentes sao descobertos percorrendo apenas a propria arvore (no
+Linux, /proc/<pid>/task/<tid>/children), nunca a tabela de processos
+inteira, e apenas quando um processo acompanhado termina. No Linux o
+CloudQuest se registra como "subreaper", para que filhos orfaos sejam
+adotados por ele em vez do init e continuem visiveis. A espera usa pidfds
+(Linux), kqueue (macOS/BSD) ou WaitForMultipleObjects (Windows) sem tempo
+limite: durante o jogo a sessao nao acorda. A unica verificacao periodica
+acontece enquanto o launcher iniciado pelo CloudQuest esta aberto, para
+encontrar o jogo iniciado (ou reiniciado) por ele.
+"""
+
+import os
+import sys
+import glob
+import time
+import select
+
+import psutil
+
+from CloudQuest.config.settings import SESSION_REFRESH_INTERVAL, SESSION_IGNORED_PROCESSES
+from CloudQuest.core.process_finder import process_matches
+from CloudQuest.utils.logger import log
+
+PR_SET_CHILD_SUBREAPER = 36
+# Processos do proprio CloudQuest que nao fazem parte da sessao
+OWN_HELPER_PROCESSES = ("rclone",)
+
+# WaitForMultipleObjects (Windows)
+WINDOWS_SYNCHRONIZE = 0x00100000
+WINDOWS_INFINITE = 0xFFFFFFFF
+WINDOWS_MAX_WAIT_OBJECTS = 64
+
+# Filhos do CloudQuest antes do jogo iniciar (ex: daemon do Rclone): nao sao orfaos adotados
+_children_before_launch = None
+
+
+def enable_subreaper():
+    """
+    Faz com que descendentes orfaos sejam adotados por este processo (Linux).
+
+    Deve ser chamado antes de iniciar o jogo/launcher.
+
+    Returns:
+        bool: True se ativado
+    """
+    global _children_before_launch
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0) == 0:
+            _children_before_launch = _child_pids(psutil.Process())
+            return True
+        log.debug(f"prctl(PR_SET_CHILD_SUBREAPER) falhou: errno {ctypes.get_errno()}")
+    except (OSError, AttributeError) as e:
+        log.debug(f"Subreaper indisponivel: {e}")
+    return False
+
+
+def _child_pids(proc):
+    """Lista os filhos diretos de um processo sem varrer a tabela de processos."""
+    paths = glob.glob(f"/proc/{proc.pid}/task/*/children")
+    if paths:
+        pids = set()
+        for path in paths:
+            try:
+                with open(path, 'r') as file:
+                    pids.update(int(pid) for pid in file.read().split())
+            except OSError:
+                pass
+        return pids
+    # Sem /proc: o psutil consulta a relacao pai/filho do sistema
+    try:
+        return {child.pid for child in proc.children()}
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return set()
+
+
+def _is_alive(proc):
+    try:
+        return proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+def _process_name(proc):
+    try:
+        return os.path.splitext(proc.name())[0].lower()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return ""
+
+
+class SessionTracker:
+    """Aguarda o fim de todos os processos de uma sessao de jogo."""
+
+    def __init__(self, game_pid, game_process_name=None, launcher_pid=None, ignore_names=None,
+                 wait_for_launcher=False, refresh_interval=SESSION_REFRESH_INTERVAL):
+        """
+        Args:
+            game_pid (int): PID do processo do jogo (ou do comando em --wrap)
+            game_process_name (str, optional): Nome do processo do jogo, para
+                reconhecer o jogo reiniciado pelo launcher
+            launcher_pid (int, optional): PID do launcher iniciado pelo CloudQuest
+            ignore_names (list, optional): Nomes de processos que nao mantem a sessao aberta
+            wait_for_launcher (bool): Aguardar tambem o launcher terminar
+            refresh_interval (float): Segundos entre buscas por novos processos
+                (sem subreaper, ou enquanto o launcher estiver aberto)
+        """
+        self.game_pid = game_pid
+        self.game_process_name = game_process_name
+        self.launcher_pid = launcher_pid
+        self.wait_for_launcher = wait_for_launcher
+        self.refresh_interval = refresh_interval
+        self.ignore_names = {name.lower() for name in SESSION_IGNORED_PROCESSES}
+        self.ignore_names.update(os.path.splitext(name)[0].lower() for name in ignore_names or [])
+
+        self._self = psutil.Process()
+        self._adopting = _children_before_launch is not None
+        self._own_children = _children_before_launch or set()
+        self._known = {}
+        self._tracked = set()
+        self._adopted = set()
+
+        self._add(game_pid, tracked=True)
+        if launcher_pid and launcher_pid != game_pid:
+            self._add(launcher_pid, tracked=wait_for_launcher)
+
+    def _add(self, pid, tracked, adopted=False):
+        try:
+            proc = psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return
+        self._known[pid] = proc
+        if adopted:
+            self._adopted.add(pid)
+        if tracked and _process_name(proc) not in self.ignore_names:
+            self._tracked.add(pid)
+            if pid != self.game_pid:
+                log.info(f"Processo da sessao: {proc.name() if _is_alive(proc) else '?'} (PID: {pid})")
+
+    def refresh(self):
+        """Adiciona os descendentes novos dos processos conhecidos."""
+        pending = [pid for pid, proc in self._known.items() if _is_alive(proc)]
+        while pending:
+            pid = pending.pop()
+            parent_tracked = pid in self._tracked
+            for child_pid in _child_pids(self._known[pid]) - self._known.keys():
+                self._add(child_pid, tracked=parent_tracked or self._is_game(child_pid))
+                if child_pid in self._known:
+                    pending.append(child_pid)
+
+        if self._adopting:
+            self._adopt_orphans()
+
+    def _is_game(self, pid):
+        """Processo com o nome do jogo na arvore do launcher (jogo reiniciado)."""
+        if not self.game_process_name:
+            return False
+        try:
+            return process_matches(psutil.Process(pid), self.game_process_name)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+
+    def _adopt_orphans(self):
+        """Acompanha os orfaos da sessao adotados pelo CloudQuest (subreaper)."""
+        for pid in _child_pids(self._self) - self._own_children - self._known.keys():
+            try:
+                proc = psutil.Process(pid)
+                if _process_name(proc) in OWN_HELPER_PROCESSES:
+                    continue
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            self._add(pid, tracked=True, adopted=True)
+
+    def _reap(self, pid):
+        """Coleta o codigo de saida de um orfao adotado (evita processos zumbis)."""
+        if pid not in self._adopted:
+            return
+        try:
+            if os.waitpid(pid, os.WNOHANG)[0]:
+                self._adopted.discard(pid)
+        except ChildProcessError:
+            self._adopted.discard(pid)
+
+    def active_processes(self):
+        """
+        Returns:
+            list: Processos acompanhados ainda em execucao
+        """
+        for pid in list(self._adopted):
+            if not _is_alive(self._known[pid]):
+                self._reap(pid)
+        return [self._known[pid] for pid in self._tracked if _is_alive(self._known[pid])]
+
+    def _wait_timeout(self):
+        """
+        Intervalo da verificacao periodica (None: apenas o fim de um processo acorda a espera).
+
+        Sem subreaper, um filho iniciado por um processo acompanhado que termina
+        em seguida deixa a arvore sem acordar a espera: a busca periodica e mantida.
+        Com subreaper, so o launcher aberto (que nao e aguardado) pode iniciar
+        processos novos sem que a espera acorde.
+        """
+        if not self._adopting:
+            return self.refresh_interval
+        launcher = self._known.get(self.launcher_pid)
+        if launcher is not None and self.launcher_pid not in self._tracked and _is_alive(launcher):
+            return self.refresh_interval
+        return None
+
+    def wait(self):
+        """Aguarda ate que nenhum processo acompanhado esteja em execucao."""
+        start = time.monotonic()
+        while True:
+            self.refresh()
+            active = self.active_processes()
+            if not active:
+                break
+            _wait_any(active, self._wait_timeout())
+
+        log.info(f"Sessao de jogo encerrada apos {time.monotonic() - start:.0f}s "
+                 f"({len(self._tracked)} processo(s) acompanhado(s))")
+
+
+def _wait_pidfd(processes, timeout):
+    """
+    Aguarda o fim de um dos processos por pidfds (Linux 5.3+).
+
+    Returns:
+        bool: False se o mecanismo nao estiver disponivel
+    """
+    if not hasattr(os, 'pidfd_open') or not hasattr(select, 'poll'):
+        return False
+    poller = select.poll()
+    pidfds = []
+    try:
+        for proc in processes:
+            try:
+                pidfd = os.pidfd_open(proc.pid)
+            except ProcessLookupError:
+                return True
+            except OSError as e:
+                log.debug(f"pidfd indisponivel ({e}), usando alternativa")
+                return False
+            pidfds.append(pidfd)
+            poller.register(pidfd, select.POLLIN)
+        # O PID pode ter sido reutilizado antes do pidfd ser aberto
+        if all(_is_alive(proc) for proc in processes):
+            # O pidfd fica legivel quando o processo termina
+            poller.poll(None if timeout is None else timeout * 1000)
+    finally:
+        for pidfd in pidfds:
+            os.close(pidfd)
+    return True
+
+
+def _wait_kqueue(processes, timeout):
+    """
+    Aguarda o fim de um dos processos por kqueue (macOS/BSD).
+
+    Returns:
+        bool: False se o mecanismo nao estiver disponivel
+    """
+    if not hasattr(select, 'kqueue'):
+        return False
+    queue = select.kqueue()
+    try:
+        events = [select.kevent(proc.pid, filter=select.KQ_FILTER_PROC,
+                                flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT, fflags=select.KQ_NOTE_EXIT)
+                  for proc in processes]
+        try:
+            queue.control(events, 0)
+        except ProcessLookupError:
+            return True
+        except OSError as e:
+            log.debug(f"kqueue indisponivel ({e}), usando alternativa")
+            return False
+        if all(_is_alive(proc) for proc in processes):
+            queue.control(None, 1, timeout)
+    finally:
+        queue.close()
+    return True
+
+
+def _wait_windows(processes, timeout):
+    """
+    Aguarda o fim de um dos processos por WaitForMultipleObjects (Windows).
+
+    Returns:
+        bool: False se o mecanismo nao estiver disponivel
+    """
+    if sys.platform != 'win32':
+        return False
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    handles = []
+    try:
+        # WaitForMultipleObjects aceita ate MAXIMUM_WAIT_OBJECTS handles; os
+        # demais processos sao verificados quando a espera retornar
+        for proc in processes[:WINDOWS_MAX_WAIT_OBJECTS]:
+            handle = kernel32.OpenProcess(WINDOWS_SYNCHRONIZE, False, proc.pid)
+            if not handle:
+                log.debug(f"OpenProcess falhou para o PID {proc.pid}, usando alternativa")
+                return False
+            handles.append(handle)
+        if all(_is_alive(proc) for proc in processes):
+            array = (wintypes.HANDLE * len(handles))(*handles)
+            milliseconds = WINDOWS_INFINITE if timeout is None else int(timeout * 1000)
+            kernel32.WaitForMultipleObjects(len(handles), array, False, milliseconds)
+    finally:
+        for handle in handles:
+            kernel32.CloseHandle(handle)
+    return True
+
+
+def _wait_any(processes, timeout=None):
+    """
+    Aguarda ate um dos processos terminar, pelo sistema operacional.
+
+    Args:
+        processes (list): Processos (psutil.Process) em execucao
+        timeout (float, optional): Tempo limite em segundos (None: sem limite)
+    """
+    if _wait_pidfd(processes, timeout) or _wait_kqueue(processes, timeout) or _wait_windows(processes, timeout):
+        return
+    # Alternativa sem suporte do sistema: verificacao periodica pelo psutil
+    psutil.wait_procs(processes, timeout=timeout or SESSION_REFRESH_INTERVAL)
@@ -4,87 +4,324 @@
 CloudQuest - Gerenciador de sincronizacao.
 """
 
-import time
 
 from CloudQuest.core.profile_manager import load_profile
+from CloudQuest.core.manifest import (
+    REMOTE_MANIFEST_NAME, build_manifest, diff_manifests, load_manifest, save_manifest,
+    files_to_download, common_manifest, fetch_remote_manifest, publish_remote_manifest,
+    invalidate_remote_manifest
+)
 from CloudQuest.utils.logger import log
-from CloudQuest.utils.rclone import execute_rclone_sync, test_rclone_config, create_remote_dir
-from CloudQuest.core.notification_ui import show_notification
+from CloudQuest.utils.progress import ProgressReporter
+from CloudQuest.core.preflight import run_preflight
+from CloudQuest.core.packed import BUNDLE_NAME, resolve_sync_mode, upload_bundle, download_bundle
+from CloudQuest.core.chunked import (
+    CHUNKS_DIR_NAME, INDEX_DIR_NAME, upload_chunked, download_chunked, prune_chunk_store
+)
+from CloudQuest.utils.rclone import execute_rclone_sync
+from CloudQuest.core.notifications import show_notification
+from CloudQuest.core import upload_queue
 
-def sync_saves(direction, profile_name):
+# O manifesto remoto e os dados dos modos empacotado e em blocos nunca sao
+# copiados junto com os saves
+SYNC_EXCLUDES = [
+    f"/{REMOTE_MANIFEST_NAME}",
+    f"/{BUNDLE_NAME}",
+    f"/{CHUNKS_DIR_NAME}/**",
+    f"/{INDEX_DIR_NAME}/**"
+]
+
+def _scan_local_dir(profile_name, local_dir):
+    """
+    Le o manifesto salvo e gera o manifesto atual do diretorio local.
+    
+    Returns:
+        tuple: (manifesto salvo ou None, manifesto atual ou None em caso de erro)
+    """
+    previous = load_manifest(profile_name)
+    try:
+        current = build_manifest(local_dir, previous)
+    except Exception as e:
+        log.warning(f"Aviso: Falha ao gerar manifesto local. Continuando: {e}")
+        current = None
+    return previous, current
+
+def _fetch_remote(profile_name, profile, remote_dir, remote_manifest, files=None):
+    """
+    Copia os saves da nuvem para o LocalDir, mantendo arquivos locais mais novos.
+    
+    O formato e definido pelo manifesto remoto: pacote unico, blocos
+    deduplicados ou arquivos soltos ('files' limita a copia nos dois ultimos).
+    """
+    mode = remote_manifest.get('mode') if remote_manifest else None
+    if mode == "packed":
+        download_bundle(profile['RclonePath'], remote_dir, profile['LocalDir'])
+    elif mode == "chunked":
+        download_chunked(profile_name, profile['RclonePath'], remote_dir, profile['LocalDir'],
+                         remote_manifest, files=files)
+    else:
+        execute_rclone_sync(profile['RclonePath'], remote_dir, profile['LocalDir'],
+                            files=files, excludes=SYNC_EXCLUDES)
+
+def _download(profile_name, profile, remote_dir, remote_manifest, files, local_changes):
+    """
+    Baixa os saves da nuvem e registra o novo estado sincronizado.
+    
+    Args:
+        profile_name (str): Nome do perfil
+        profile (dict): Perfil carregado
+        remote_dir (str): Diretorio remoto (remote:dir)
+        remote_manifest (dict): Manifesto remoto ou None
+        files (list): Arquivos a baixar ou None para copia completa
+        local_changes (list): Alteracoes locais pendentes ou None se desconhecidas
+    """
+    _fetch_remote(profile_name, profile, remote_dir, remote_manifest, files)
+    
+    _, synced_manifest = _scan_local_dir(profile_name, profile['LocalDir'])
+    if not synced_manifest:
+        return
+    
+    if remote_manifest:
+        # Arquivos locais mais novos preservados pelo --update continuam
+        # como diferenca e serao enviados no proximo upload
+        save_manifest(profile_name, common_manifest(remote_manifest, synced_manifest),
+                      "down", remote_manifest['revision'])
+    elif local_changes == []:
+        # Sem manifesto remoto: so e seguro registrar o estado quando nao
+        # havia alteracoes locais pendentes
+        save_manifest(profile_name, synced_manifest, "down")
+
+def _upload(profile_name, profile, remote_dir, remote_manifest, previous_manifest, local_manifest, local_changes):
+    """
+    Envia os saves para a nuvem e publica o novo manifesto remoto.
+    
+    Quando a nuvem continua na revisao registrada localmente, apenas os arquivos
+    alterados sao enviados. Caso contrario (outra maquina enviou saves ou nao ha
+    manifesto remoto) e feita uma mescla completa nos dois sentidos, mantendo o
+    arquivo mais novo, para que o manifesto publicado corresponda a nuvem.
+    
+    No modo empacotado o LocalDir inteiro e enviado como um unico pacote; no
+    modo em blocos apenas os blocos ainda ausentes na nuvem sao enviados.
+    """
+    rclone_path = profile['RclonePath']
+    local_dir = profile['LocalDir']
+    mode = resolve_sync_mode(profile, local_manifest)
+    
+    clean = (
+        remote_manifest is not None
+        and previous_manifest is not None
+        and local_changes is not None
+        and previous_manifest.get('remote_revision') == remote_manifest['revision']
+    )
+    
+    extra = None
+    merge_failed = False
+    if clean:
+        synced_manifest = local_manifest
+        if mode == "chunked":
+            extra = upload_chunked(profile_name, rclone_path, local_dir, remote_dir, local_manifest)
+        elif mode == "packed":
+            upload_bundle(rclone_path, local_dir, remote_dir, local_manifest)
+        elif remote_manifest.get('mode', "files") != "files":
+            # Saida do modo empacotado: os arquivos soltos na nuvem estao desatualizados
+            execute_rclone_sync(rclone_path, local_dir, remote_dir, update=False, excludes=SYNC_EXCLUDES)
+        else:
+            changed_files = [path for path in local_changes if path in local_manifest['files']]
+            execute_rclone_sync(rclone_path, local_dir, remote_dir,
+                                files=changed_files, update=False, excludes=SYNC_EXCLUDES)
+    else:
+        log.info("Nuvem alterada ou sem manifesto: mesclando saves nos dois sentidos")
+        try:
+            _fetch_remote(profile_name, profile, remote_dir, remote_manifest)
+        except Exception as e:
+            merge_failed = True
+            log.warning(f"Aviso: Falha ao mesclar saves da nuvem. Enviando sem publicar o manifesto: {e}")
+        _, synced_manifest = _scan_local_dir(profile_name, local_dir)
+        
+        if mode == "chunked" and synced_manifest:
+            extra = upload_chunked(profile_name, rclone_path, local_dir, remote_dir, synced_manifest)
+        elif mode == "packed" and synced_manifest:
+            upload_bundle(rclone_path, local_dir, remote_dir, synced_manifest)
+        else:
+            mode = "files"
+            execute_rclone_sync(rclone_path, local_dir, remote_dir, excludes=SYNC_EXCLUDES)
+    
+    if merge_failed:
+        # Arquivos mais novos na nuvem foram preservados pelo --update e nao
+        # estao no manifesto local: publica-lo faria a nuvem e o manifesto
+        # divergirem. A proxima sincronizacao faz a mescla completa.
+        invalidate_remote_manifest(rclone_path, remote_dir)
+        if previous_manifest:
+            save_manifest(profile_name, previous_manifest, "up")
+        return
+    
+    revision = None
+    if synced_manifest:
+        revision = publish_remote_manifest(rclone_path, remote_dir, synced_manifest, mode, extra)
+    
+    if revision:
+        save_manifest(profile_name, synced_manifest, "up", revision)
+        if extra:
+            try:
+                prune_chunk_store(rclone_path, remote_dir, extra['index'])
+            except Exception as e:
+                log.warning(f"Aviso: Falha ao remover versoes antigas dos blocos: {e}")
+    else:
+        # A nuvem mudou sem manifesto correspondente
+        invalidate_remote_manifest(rclone_path, remote_dir)
+
+def upload_checkpoint(profile_name):
+    """
+    Envia as alteracoes locais feitas durante o jogo, sem baixar nada.
+    
+    So envia quando a nuvem continua na revisao da ultima sincronizacao; caso
+    contrario a mescla fica para o upload final, com o jogo fechado.
+    
+    Args:
+        profile_name (str): Nome do perfil
+        
+    Returns:
+        bool: True se a nuvem ficou com o estado local atual
+    """
+    profile = load_profile(profile_name)
+    remote_dir = f"{profile['CloudRemote']}:{profile['CloudDir']}"
+    
+    previous_manifest, local_manifest = _scan_local_dir(profile_name, profile['LocalDir'])
+    if not previous_manifest or not local_manifest:
+        log.info("Checkpoint ignorado: sem manifesto da ultima sincronizacao")
+        return False
+    
+    local_changes = diff_manifests(previous_manifest, local_manifest)
+    if not local_changes:
+        return True
+    
+    remote_manifest = fetch_remote_manifest(profile['RclonePath'], remote_dir)
+    if not remote_manifest or previous_manifest.get('remote_revision') != remote_manifest['revision']:
+        log.info("Checkpoint adiado: nuvem alterada desde a ultima sincronizacao")
+        return False
+    
+    log.info(f"Checkpoint: {len(local_changes)} arquivo(s) alterado(s)")
+    _upload(profile_name, profile, remote_dir, remote_manifest,
+            previous_manifest, local_manifest, local_changes)
+    return True
+
+def sync_saves(direction, profile_name, notify=True):
     """
     Sincroniza os saves do jogo.
     
+    Uploads sao registrados na fila persistente antes de comecar e so saem
+    dela ao terminar; falhas (ou um encerramento no meio do envio) ficam para
+    a proxima execucao.
+    
     Args:
         direction (str): Direcao da sincronizacao ('up' para local→nuvem, 'down' para nuvem→local)
         profile_name (str): Nome do perfil a ser usado
+        notify (bool): Exibir notificacoes de progresso e erro
+    
+    Returns:
+        bool: True se a sincronizacao terminou (ou nao era necessaria), False em caso de erro
     """
     notification = None
+    error = None
     profile = load_profile(profile_name)
+    reporter = ProgressReporter(profile_name, direction)
+    remote_dir = f"{profile['CloudRemote']}:{profile['CloudDir']}"
+    
+    if direction == "up" and not upload_queue.mark_running(profile_name):
+        log.warning(f"Outra instancia do CloudQuest esta com o perfil '{profile_name}'. Upload ignorado.")
+        return False
     
     try:
-        # Verificar configuracao do Rclone (nao critico)
-        try:
-            test_rclone_config(profile['RclonePath'], profile['CloudRemote'])
-        except Exception as e:
-            log.warning(f"Aviso: Verificacao do Rclone falhou. Continuando: {e}")
+        # Estado do diretorio local antes da transferencia. O manifesto salvo
+        # representa o ultimo estado em que local e nuvem estavam iguais.
+        previous_manifest, local_manifest = _scan_local_dir(profile_name, profile['LocalDir'])
+        local_changes = None
+        if previous_manifest and local_manifest:
+            local_changes = diff_manifests(previous_manifest, local_manifest)
         
-        # Criar diretorio remoto se necessario (nao critico)
+        if direction == "up" and local_changes == []:
+            log.info("Nenhuma alteracao local desde a ultima sincronizacao. Upload ignorado.")
+            # Atualiza os mtimes registrados para evitar recalcular hashes
+            save_manifest(profile_name, local_manifest, direction, previous_manifest.get('remote_revision'))
+            return True
+        
+        # Uma unica leitura do manifesto remoto decide o que transferir
+        remote_manifest = fetch_remote_manifest(profile['RclonePath'], remote_dir)
+        download_files = None
+        
+        if direction == "down" and remote_manifest:
+            if previous_manifest and previous_manifest.get('remote_revision') == remote_manifest['revision']:
+                log.info(f"Nuvem sem alteracoes (revisao {remote_manifest['revision']}). Download ignorado.")
+                return True
+            
+            if local_manifest:
+                download_files = files_to_download(remote_manifest, local_manifest)
+                if not download_files:
+                    log.info("Saves locais ja correspondem a nuvem. Download ignorado.")
+                    save_manifest(profile_name, common_manifest(remote_manifest, local_manifest),
+                                  direction, remote_manifest['revision'])
+                    return True
+        
+        # Verificar configuracao do Rclone e criar diretorio remoto (nao critico)
         try:
-            create_remote_dir(profile['RclonePath'], profile['CloudRemote'], profile['CloudDir'])
+            run_preflight(profile['RclonePath'], profile['CloudRemote'], profile['CloudDir'])
         except Exception as e:
-            log.warning(f"Aviso: Falha ao criar diretorio remoto. Continuando: {e}")
+            log.warning(f"Aviso: Verificacao do Rclone falhou. Continuando: {e}")
         
         # Determinar origem e destino com base na direcao
-        if direction == "down":
-            # Nuvem → Local
+        if notify:
             notification = show_notification(
                 title="CloudQuest",
-                message="Sincronizando",
+                message="Sincronizando" if direction == "down" else "Atualizando",
                 game_name=profile['GameName'],
-                direction="down"
+                direction=direction
             )
-            source = f"{profile['CloudRemote']}:{profile['CloudDir']}"
-            destination = profile['LocalDir']
-        else:
-            # Local → Nuvem
-            notification = show_notification(
-                title="CloudQuest",
-                message="Atualizando",
-                game_name=profile['GameName'],
-                direction="up"
-            )
-            source = profile['LocalDir']
-            destination = f"{profile['CloudRemote']}:{profile['CloudDir']}"
-        
-        # Executar sincronizacao
-        execute_rclone_sync(profile['RclonePath'], source, destination)
+            # A notificacao acompanha as estatisticas do Rclone (barra de progresso)
+            if notification and hasattr(notification, 'update_progress'):
+                reporter.add_listener(notification.update_progress)
         
-        # Aguardar tempo minimo de exibicao da notificacao
-        time.sleep(5)  # 5 segundos
+        with reporter:
+            if direction == "down":
+                # Nuvem → Local
+                _download(profile_name, profile, remote_dir, remote_manifest, download_files, local_changes)
+            else:
+                # Local → Nuvem
+                _upload(profile_name, profile, remote_dir, remote_manifest,
+                        previous_manifest, local_manifest, local_changes)
         
     except Exception as e:
+        error = e
         log.error(f"Erro na sincronizacao: {str(e)}")
         
         # Fechar notificacao anterior se existir
         if notification:
             notification.close()
+            notification = None
 
         # Mostrar notificacao de erro
-        error_notification = show_notification(
-            title="Erro",
-            message="Falha na sincronizacao",
-            game_name=profile.get('GameName', 'Erro'),
-            direction=direction,
-            notification_type="error"
-        )
-        
-        # Aguardar antes de fechar a notificacao de erro
-        time.sleep(5)
-        if error_notification:
-            error_notification.close()
+        if notify:
+            error_notification = show_notification(
+                title="Erro",
+                message="Falha na sincronizacao",
+                game_name=profile.get('GameName', 'Erro'),
+                direction=direction,
+                notification_type="error"
+            )
+            
+            # A notificacao permanece visivel pelo tempo minimo em sua propria thread
+            if error_notification:
+                error_notification.close()
             
     finally:
-        # Garantir que a notificacao seja fechada
+        reporter.finish(error is None)
+        # Fechamento nao bloqueante: a janela respeita o tempo minimo de exibicao
         if notification:
-            notification.close()
\ No newline at end of file
+            notification.close()
+        
+        if direction == "up":
+            if error is None:
+                upload_queue.mark_done(profile_name)
+            else:
+                upload_queue.mark_failed(profile_name, error)
+    
+    return error is None
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Fila persistente de uploads pendentes.
+
+Cada upload e registrado em um banco SQLite no diretorio de dados antes de
+comecar e removido ao terminar com sucesso. Uploads que falharam, ou que
+ficaram pela metade porque o CloudQuest foi encerrado, permanecem na fila e
+sao repetidos (com espera crescente) na proxima execucao. Ha no maximo um
+registro por perfil: o upload sempre envia o estado atual do LocalDir, entao
+varias falhas seguidas se resumem a um unico envio.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+
+from CloudQuest.config.settings import UPLOAD_QUEUE_DB, UPLOAD_QUEUE_BACKOFF, UPLOAD_QUEUE_MAX_BACKOFF
+from CloudQuest.utils.logger import log
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    profile TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    pid INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    next_attempt REAL NOT NULL,
+    last_error TEXT
+)
+"""
+
+
+def _connect():
+    connection = sqlite3.connect(str(UPLOAD_QUEUE_DB), timeout=10, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(_SCHEMA)
+    return connection
+
+
+def _execute(query, params=()):
+    """Executa uma instrucao na fila; falhas do banco nao interrompem a sincronizacao."""
+    try:
+        connection = _connect()
+        try:
+            return connection.execute(query, params).fetchall()
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        log.warning(f"Falha ao acessar a fila de uploads: {e}")
+        return []
+
+
+def _execute_count(query, params=()):
+    """Executa uma instrucao e retorna o numero de linhas alteradas (0 em caso de erro)."""
+    try:
+        connection = _connect()
+        try:
+            return connection.execute(query, params).rowcount
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        log.warning(f"Falha ao acessar a fila de uploads: {e}")
+        return 0
+
+
+def mark_running(profile_name):
+    """
+    Reserva o upload de um perfil para este processo (mantem as tentativas de um registro existente).
+
+    A reserva e atomica entre processos: um registro 'running' de outro
+    processo ainda em execucao nunca e sobrescrito, e a troca de dono so
+    acontece se o registro continuar como foi lido.
+
+    Args:
+        profile_name (str): Nome do perfil
+
+    Returns:
+        bool: True se reservado; False se outra instancia do CloudQuest esta com o perfil
+    """
+    now = time.time()
+    pid = os.getpid()
+    if _execute_count(
+        "INSERT OR IGNORE INTO uploads (profile, state, pid, created_at, updated_at, next_attempt) "
+        "VALUES (?, 'running', ?, ?, ?, ?)",
+        (profile_name, pid, now, now, now)
+    ):
+        return True
+
+    rows = _execute("SELECT state, pid FROM uploads WHERE profile = ?", (profile_name,))
+    if not rows:
+        # Removido entre as duas instrucoes (ou banco indisponivel)
+        return _execute_count(
+            "INSERT OR IGNORE INTO uploads (profile, state, pid, created_at, updated_at, next_attempt) "
+            "VALUES (?, 'running', ?, ?, ?, ?)",
+            (profile_name, pid, now, now, now)
+        ) == 1
+    state, owner = rows[0]
+    if state == 'running' and owner != pid and _pid_alive(owner):
+        return False
+
+    # Troca de dono condicional: falha se outro processo reservou o perfil nesse meio tempo
+    return _execute_count(
+        "UPDATE uploads SET state = 'running', pid = ?, updated_at = ? "
+        "WHERE profile = ? AND state = ? AND pid IS ?",
+        (pid, now, profile_name, state, owner)
+    ) == 1
+
+
+def mark_done(profile_name):
+    """
+    Remove o perfil da fila apos um upload bem-sucedido.
+
+    Args:
+        profile_name (str): Nome do perfil
+    """
+    _execute("DELETE FROM uploads WHERE profile = ?", (profile_name,))
+
+
+def mark_failed(profile_name, error):
+    """
+    Mantem o upload na fila e agenda a proxima tentativa com espera crescente.
+
+    Args:
+        profile_name (str): Nome do perfil
+        error (Exception | str): Erro da tentativa
+    """
+    rows = _execute("SELECT attempts FROM uploads WHERE profile = ?", (profile_name,))
+    attempts = (rows[0][0] if rows else 0) + 1
+    delay = min(UPLOAD_QUEUE_BACKOFF * 2 ** (attempts - 1), UPLOAD_QUEUE_MAX_BACKOFF)
+    now = time.time()
+    _execute(
+        "INSERT INTO uploads (profile, state, pid, attempts, created_at, updated_at, next_attempt, last_error) "
+        "VALUES (?, 'pending', NULL, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(profile) DO UPDATE SET state = 'pending', pid = NULL, attempts = excluded.attempts, "
+        "updated_at = excluded.updated_at, next_attempt = excluded.next_attempt, last_error = excluded.last_error",
+        (profile_name, attempts, now, now, now + delay, str(error))
+    )
+    log.warning(f"Upload de '{profile_name}' mantido na fila (tentativa {attempts}, proxima em {delay:.0f}s)")
+
+
+def _pid_alive(pid):
+    if not pid or pid == os.getpid():
+        return pid == os.getpid()
+    try:
+        import psutil
+        return psutil.pid_exists(pid)
+    except ImportError:
+        return False
+
+
+def pending_uploads(exclude=None):
+    """
+    Lista os perfis com upload pendente cuja proxima tentativa ja venceu.
+
+    Registros 'running' de processos que nao existem mais (CloudQuest encerrado
+    no meio do upload) tambem sao considerados pendentes.
+
+    Args:
+        exclude (str, optional): Perfil a ignorar (ex: o da sessao atual)
+
+    Returns:
+        list: Nomes dos perfis
+    """
+    rows = _execute("SELECT profile, state, pid, next_attempt FROM uploads ORDER BY updated_at")
+    now = time.time()
+    due = []
+    for profile_name, state, pid, next_attempt in rows:
+        if profile_name == exclude:
+            continue
+        if state == 'running' and _pid_alive(pid):
+            continue
+        if state == 'pending' and next_attempt > now:
+            continue
+        due.append(profile_name)
+    return due
+
+
+def replay_pending_uploads(exclude=None):
+    """
+    Repete os uploads pendentes (sem notificacoes).
+
+    Cada perfil e reservado por sync_saves antes do envio; perfis reservados
+    por outra instancia (em jogo ou enviando) sao ignorados.
+
+    Args:
+        exclude (str, optional): Perfil a ignorar (ex: o da sessao atual, cujo
+            upload final ja enviara o estado mais recente)
+
+    Returns:
+        int: Quantidade de uploads concluidos
+    """
+    # Importado aqui: sync_manager registra os uploads nesta fila
+    from CloudQuest.core.profile_manager import list_profiles
+    from CloudQuest.core.sync_manager import sync_saves
+
+    profiles = set(list_profiles())
+    completed = 0
+    for profile_name in pending_uploads(exclude):
+        if profile_name not in profiles:
+            log.warning(f"Perfil removido, descartando upload pendente: {profile_name}")
+            mark_done(profile_name)
+            continue
+
+        log.info(f"Repetindo upload pendente: {profile_name}")
+        if sync_saves("up", profile_name, notify=False):
+            completed += 1
+    return completed
+
+
+def start_replay_worker(exclude=None):
+    """
+    Repete os uploads pendentes em uma thread de segundo plano.
+
+    Args:
+        exclude (str, optional): Perfil a ignorar
+
+    Returns:
+        threading.Thread: Thread iniciada ou None se nao ha pendencias
+    """
+    if not pending_uploads(exclude):
+        return None
+
+    def worker():
+        try:
+            completed = replay_pending_uploads(exclude)
+            log.info(f"Uploads pendentes concluidos: {completed}")
+        except Exception as e:
+            log.error(f"Erro ao repetir uploads pendentes: {e}")
+
+    thread = threading.Thread(target=worker, name="upload-queue", daemon=True)
+    thread.start()
+    return thread
@@ -25,12 +25,17 @@ else:
 sys.path.insert(0, str(BASE_DIR))
 
 # Importacoes dos modulos internos
-from CloudQuest.utils.paths import APP_PATHS
-from CloudQuest.config.settings import TEMP_PROFILE_PATH
-from CloudQuest.core.profile_manager import load_profile
+from CloudQuest.utils.paths import APP_PATHS, ensure_app_dirs
+from CloudQuest.config.settings import (
+    CHECKPOINT_MIN_INTERVAL, BATCH_SYNC_WORKERS, NOTIFIER_BACKEND, UPLOAD_QUEUE_JOIN_TIMEOUT
+)
+from CloudQuest.core.profile_manager import load_profile, list_profiles
+from CloudQuest.core.session_handoff import receive_profile
 from CloudQuest.core.sync_manager import sync_saves
-from CloudQuest.core.game_launcher import launch_game, wait_for_game, unix_launch_game
+from CloudQuest.core.upload_queue import mark_running, start_replay_worker
+from CloudQuest.core.notifications import NOTIFIER_BACKENDS, set_notifier, wait_for_notifications
 from CloudQuest.utils.logger import setup_logger, log
+from CloudQuest.utils.rclone import set_transport
 
 def main():
     """Funcao principal que coordena o fluxo da aplicacao."""
@@ -41,11 +46,38 @@ def main():
     parser.add_argument('--game-path', '-g', help='Caminho do diretorio do jogo')
     parser.add_argument('--silent', '-s', action='store_true', help='Modo silencioso (sem dialogos)')
     parser.add_argument('--config', '-c', action='store_true', help='Iniciar interface de configuracao')
+    parser.add_argument('--notifier', choices=NOTIFIER_BACKENDS,
+                        help='Notificacoes: janelas do CloudQuest (gui), do sistema (desktop), apenas no log (log), '
+                             'nenhuma (none) ou escolha automatica (auto, padrao)')
+    parser.add_argument('--rclone-transport', choices=['subprocess', 'rc'],
+                        help='Transporte do Rclone: um processo por operacao ou daemon rclone rcd compartilhado')
+    parser.add_argument('--stop-rclone-daemon', action='store_true',
+                        help='Encerrar o daemon rclone rcd compartilhado (transporte rc) e sair')
+    parser.add_argument('--checkpoint', nargs='?', type=float, const=CHECKPOINT_MIN_INTERVAL, metavar='SEGUNDOS',
+                        help='Enviar checkpoints dos saves durante o jogo (intervalo minimo opcional em segundos)')
+    parser.add_argument('--wrap', metavar='PERFIL',
+                        help='Executar o comando apos "--" como o jogo (ex: opcao de inicializacao do Steam: '
+                             '--wrap PERFIL -- %%command%%)')
+    parser.add_argument('--handoff', metavar='ARQUIVO',
+                        help='Arquivo com o nome do perfil, criado para esta sessao por um launcher externo')
+    parser.add_argument('--all', action='store_true', help='Sincronizar todos os perfis (sem iniciar jogos)')
+    parser.add_argument('--profiles', nargs='+', metavar='PERFIL', help='Sincronizar os perfis informados (sem iniciar jogos)')
+    parser.add_argument('--direction', choices=['up', 'down'],
+                        help='Direcao da sincronizacao com --all/--profiles: up (local→nuvem) ou down (nuvem→local)')
+    parser.add_argument('--jobs', '-j', type=int, default=BATCH_SYNC_WORKERS,
+                        help=f'Sincronizacoes simultaneas com --all/--profiles (padrao: {BATCH_SYNC_WORKERS})')
     
     # Suporte para uso com o Steam (atraves do atalho)
     # Formato: "CloudQuest.exe [PROFILE_NAME]"
+    # No modo --wrap, tudo apos "--" e o comando do jogo (nao e analisado)
+    argv = sys.argv[1:]
+    wrap_command = []
+    if '--' in argv:
+        separator = argv.index('--')
+        argv, wrap_command = argv[:separator], argv[separator + 1:]
+    
     try:
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
     except SystemExit:
         # Se falhar na analise dos argumentos (por exemplo, com --help), 
         # deixar o argparse lidar com isso normalmente
@@ -55,27 +87,49 @@ def main():
     if args.config:
         run_config_interface()
         return
+    
+    if args.wrap:
+        if not wrap_command:
+            parser.error("--wrap exige o comando do jogo apos '--' (ex: --wrap PERFIL -- %command%)")
+        args.profile = args.wrap
+    
+    batch_mode = args.all or args.profiles
+    if batch_mode and not args.direction:
+        parser.error("--all/--profiles exigem --direction up ou --direction down")
         
-    # Configurar o logger
+    # Criar os diretorios da aplicacao e configurar o logger
+    ensure_app_dirs()
     setup_logger()
 
+    session_start = time.perf_counter()
     log.info("=== Sessao iniciada ===")
     log.info(f"Executando a partir de: {APP_PATHS['APP_DIR']}")
     log.info(f"Base dir: {APP_PATHS['BASE_DIR']}")
+    
+    if args.stop_rclone_daemon:
+        from CloudQuest.utils.rclone_rc import stop_daemon
+        if not stop_daemon():
+            log.info("Nenhum daemon Rclone em execucao")
+        return
 
+    if args.rclone_transport:
+        set_transport(args.rclone_transport)
+    set_notifier(args.notifier or NOTIFIER_BACKEND, silent=args.silent)
+
+    if batch_mode:
+        run_batch_sync(args)
+        return
+
+    replay_worker = None
+    game_exit_code = None
     try:
         # 1. Obter o nome do perfil e o caminho do jogo
         profile_name = args.profile
         game_path = args.game_path
         
-        # Se nao fornecido como argumento, tentar ler do arquivo temporario
-        if not profile_name and TEMP_PROFILE_PATH.exists():
-            try:
-                with open(TEMP_PROFILE_PATH, 'r') as f:
-                    profile_name = f.read().strip()
-                log.info(f"Perfil lido do arquivo temporario: {profile_name}")
-            except Exception as e:
-                log.error(f"Erro ao ler arquivo de perfil: {e}")
+        # Se nao fornecido como argumento, usar o perfil entregue a esta sessao
+        if not profile_name:
+            profile_name = receive_profile(args.handoff)
         
         if not profile_name:
             log.info("Nenhum perfil especificado, iniciando interface de configuracao...")
@@ -98,6 +152,13 @@ def main():
         except Exception as e:
             error_msg = f"Erro ao carregar o perfil: {str(e)}"
             log.error(error_msg)
+            if args.wrap:
+                # O jogo abre mesmo sem sincronizacao
+                log.warning("Iniciando o jogo sem sincronizar os saves")
+                from CloudQuest.core.game_launcher import start_wrapped_game, exit_status
+                game_process = start_wrapped_game(wrap_command)
+                game_process.wait()
+                sys.exit(exit_status(game_process))
             if not is_silent_mode():
                 show_error_message(error_msg)
                 # Sugerir criacao de perfil
@@ -105,21 +166,48 @@ def main():
                     run_config_interface()
             sys.exit(1)
 
+        # Reservar o perfil durante a sessao: outra instancia nao repete o
+        # upload dele enquanto o jogo esta aberto
+        if not mark_running(profile_name):
+            log.warning(f"Outra instancia do CloudQuest esta com o perfil '{profile_name}'")
+
+        # Uploads de sessoes anteriores que falharam ou foram interrompidos.
+        # O perfil atual fica de fora: seu upload final envia o estado mais recente.
+        try:
+            replay_worker = start_replay_worker(exclude=profile_name)
+        except Exception as e:
+            log.error(f"Falha ao verificar uploads pendentes (continuando): {str(e)}")
+
         # 2. Tentar download de saves (nao critico)
         try:
             log.info("Iniciando download de saves...")
+            sync_start = time.perf_counter()
             sync_saves(direction="down", profile_name=profile_name)
+            log.info(f"Download concluido em {time.perf_counter() - sync_start:.2f}s")
         except Exception as e:
             log.error(f"Erro no download (continuando): {str(e)}")
             # Nao precisamos exibir erro ao usuario, pois isso nao e critico
 
         # 3. Iniciar o launcher/jogo (apenas no Windows)
+        # Importado aqui: o psutil so e necessario a partir deste ponto
+        from CloudQuest.core.game_launcher import (
+            launch_game, wait_for_game, unix_launch_game, start_wrapped_game, exit_status
+        )
         game_process = None
+        launcher_pid = None
         
-        if sys.platform == 'win32':
+        if args.wrap:
+            try:
+                log.info("Modo wrapper: iniciando o comando do jogo...")
+                game_process = start_wrapped_game(wrap_command)
+            except Exception as e:
+                error_msg = f"Falha ao iniciar o jogo: {str(e)}"
+                log.error(error_msg)
+                sys.exit(127)
+        elif sys.platform == 'win32':
             try:
                 log.info("Sistema Windows detectado: iniciando o jogo...")
-                game_process = launch_game(profile_name)
+                game_process, launcher_pid = launch_game(profile_name)
             except Exception as e:
                 error_msg = f"Falha ao iniciar o jogo: {str(e)}"
                 log.error(error_msg)
@@ -139,14 +227,35 @@ def main():
 
         # 4. Aguardar o termino do jogo
         if game_process:
+            log.info(f"Jogo detectado {time.perf_counter() - session_start:.2f}s apos o inicio da sessao")
+            
+            # Checkpoints durante o jogo (opcional, pela linha de comando ou pelo perfil)
+            checkpoint_interval = args.checkpoint or profile.get('CheckpointInterval')
+            checkpoint = None
+            if checkpoint_interval:
+                try:
+                    from CloudQuest.core.checkpoint import CheckpointUploader
+                    checkpoint = CheckpointUploader(profile_name, min_interval=float(checkpoint_interval))
+                    checkpoint.start()
+                except Exception as e:
+                    log.error(f"Falha ao iniciar checkpoints (continuando): {str(e)}")
+                    checkpoint = None
+            
             log.info(f"Aguardando o termino do processo (PID: {game_process.pid})...")
-            wait_for_game(game_process)
+            wait_for_game(game_process, profile, launcher_pid)
             log.info(f"Processo finalizado (PID: {game_process.pid})")
+            if args.wrap:
+                game_exit_code = exit_status(game_process)
+                log.info(f"Codigo de saida do jogo: {game_exit_code}")
+            
+            if checkpoint:
+                checkpoint.stop()
 
             # 5. Tentar upload de saves (nao critico)
             try:
                 log.info("Iniciando upload de saves...")
-                sync_saves(direction="up", profile_name=profile_name)
+                if not sync_saves(direction="up", profile_name=profile_name):
+                    log.warning("Upload mantido na fila para a proxima execucao")
             except Exception as e:
                 log.error(f"Erro no upload (continuando): {str(e)}")
 
@@ -157,15 +266,39 @@ def main():
             show_error_message(error_msg)
         sys.exit(1)
     finally:
+        # Aguardar os uploads pendentes por pouco tempo; o que nao terminar
+        # continua na fila para a proxima execucao
+        if replay_worker:
+            replay_worker.join(UPLOAD_QUEUE_JOIN_TIMEOUT)
+            if replay_worker.is_alive():
+                log.info("Uploads pendentes continuam na fila para a proxima execucao")
+
+        # Manter notificacoes ainda visiveis ate completarem o tempo minimo
+        wait_for_notifications(timeout=10)
         log.info("=== Sessao finalizada ===\n")
 
-        # Novo codigo para apagar o arquivo temporario
-        try:
-            if TEMP_PROFILE_PATH.exists():
-                TEMP_PROFILE_PATH.unlink()
-                log.info("Arquivo temporario do perfil removido com sucesso")
-        except Exception as e:
-            log.error(f"Falha ao remover arquivo temporario: {str(e)}")
+    # Modo --wrap: repassar o codigo de saida do jogo ao Steam
+    if game_exit_code:
+        sys.exit(game_exit_code)
+
+
+def run_batch_sync(args):
+    """Sincroniza varios perfis em paralelo (--all / --profiles) e encerra."""
+    from CloudQuest.core.batch_sync import sync_profiles
+    
+    try:
+        profile_names = sorted(list_profiles()) if args.all else args.profiles
+        if not profile_names:
+            log.error("Nenhum perfil encontrado para sincronizar")
+            sys.exit(1)
+        
+        results = sync_profiles(args.direction, profile_names, max_workers=args.jobs)
+    finally:
+        wait_for_notifications(timeout=10)
+        log.info("=== Sessao finalizada ===\n")
+    
+    if not all(result['success'] for result in results):
+        sys.exit(1)
 
 
 def run_config_interface():
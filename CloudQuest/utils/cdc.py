@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Divisao de arquivos em blocos definidos pelo conteudo (CDC).
+
+Segue a estrutura do FastCDC: tamanho minimo ignorado no inicio de cada
+bloco, mascara mais restritiva antes do tamanho medio e mais permissiva depois
+(normalizacao) e corte forcado no tamanho maximo. Como um rolling hash byte a
+byte em Python puro seria lento demais para arquivos de centenas de MB, os
+candidatos a corte sao localizados com busca de bytes em C (bytes.find) e
+confirmados por um CRC32 da janela que termina no candidato. O corte depende
+apenas do conteudo proximo, entao insercoes e remocoes afetam so os blocos
+vizinhos.
+"""
+
+import zlib
+import hashlib
+
+MIN_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+AVG_CHUNK_SIZE = 4 * 1024 * 1024  # 4 MiB
+MAX_CHUNK_SIZE = 16 * 1024 * 1024  # 16 MiB
+
+WINDOW_SIZE = 48  # bytes considerados em cada candidato
+ANCHOR_BYTE = b"\x9b"  # ~1 candidato a cada 256 bytes em dados aleatorios
+# Bits exigidos no CRC32 antes e depois do tamanho medio (normalizacao)
+STRICT_MASK = (1 << 15) - 1
+LOOSE_MASK = (1 << 11) - 1
+
+READ_SIZE = MAX_CHUNK_SIZE
+
+
+def find_cut(data, start, end):
+    """
+    Localiza o fim do bloco que comeca em 'start'.
+
+    Args:
+        data (bytes | bytearray): Buffer com os dados
+        start (int): Inicio do bloco no buffer
+        end (int): Fim dos dados disponiveis no buffer
+
+    Returns:
+        int: Posicao (exclusiva) do fim do bloco
+    """
+    if end - start <= MIN_CHUNK_SIZE:
+        return end
+
+    normal = min(start + AVG_CHUNK_SIZE, end)
+    limit = min(start + MAX_CHUNK_SIZE, end)
+
+    position = start + MIN_CHUNK_SIZE
+    mask = STRICT_MASK
+    while True:
+        if position >= normal:
+            mask = LOOSE_MASK
+        position = data.find(ANCHOR_BYTE, position, normal if mask == STRICT_MASK else limit)
+        if position < 0:
+            if mask == STRICT_MASK:
+                position = normal
+                continue
+            return limit
+
+        position += 1
+        if not zlib.crc32(data[position - WINDOW_SIZE:position]) & mask:
+            return position
+
+
+def iter_chunks(file):
+    """
+    Divide um arquivo em blocos lendo-o em partes (memoria limitada a ~2x o bloco maximo).
+
+    Args:
+        file: Arquivo binario aberto para leitura
+
+    Yields:
+        bytes: Conteudo de cada bloco, em ordem
+    """
+    buffer = bytearray()
+    eof = False
+    while True:
+        while not eof and len(buffer) < MAX_CHUNK_SIZE:
+            block = file.read(READ_SIZE)
+            if not block:
+                eof = True
+            buffer += block
+
+        if not buffer:
+            return
+
+        # Sem o fim do arquivo, so corta quando o bloco maximo cabe no buffer
+        cut = find_cut(buffer, 0, len(buffer))
+        yield bytes(buffer[:cut])
+        del buffer[:cut]
+
+
+def chunk_file(path):
+    """
+    Divide um arquivo em blocos e calcula o hash de cada um.
+
+    Args:
+        path (str | Path): Caminho do arquivo
+
+    Yields:
+        tuple: (hash SHA-256 do bloco, conteudo do bloco)
+    """
+    with open(path, 'rb') as file:
+        for chunk in iter_chunks(file):
+            yield hashlib.sha256(chunk).hexdigest(), chunk
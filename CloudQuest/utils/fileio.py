@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Gravacao segura de arquivos de perfil e de estado.
+
+As gravacoes sao feitas em um arquivo temporario no mesmo diretorio, que
+entao substitui o original com os.replace (atomico): leitores veem sempre a
+versao antiga ou a nova completa, nunca um arquivo pela metade. Para
+leitura-alteracao-gravacao entre processos (varias instancias do CloudQuest
+ou o QuestConfig aberto), file_lock usa um lock consultivo em '<arquivo>.lock'.
+"""
+
+import os
+import json
+import tempfile
+from contextlib import contextmanager
+
+LOCK_SUFFIX = ".lock"
+DEFAULT_FILE_MODE = 0o644
+
+
+def atomic_write(path, data, mode=None):
+    """
+    Grava o conteudo de forma atomica.
+
+    Args:
+        path (str | Path): Arquivo de destino
+        data (str | bytes): Conteudo
+        mode (int, optional): Permissoes do arquivo (padrao: as do arquivo
+            existente ou 0o644)
+    """
+    path = os.fspath(path)
+    directory, name = os.path.split(path)
+    if mode is None:
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = DEFAULT_FILE_MODE
+
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory or None)
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(data, bytes) else 'w',
+                       **({} if isinstance(data, bytes) else {'encoding': 'utf-8'})) as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        if os.name != 'nt':
+            os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path, data, mode=None, **dump_options):
+    """
+    Serializa e grava um JSON de forma atomica.
+
+    Args:
+        path (str | Path): Arquivo de destino
+        data: Objeto serializavel
+        mode (int, optional): Permissoes do arquivo
+        **dump_options: Opcoes do json.dumps (indent, separators...)
+    """
+    dump_options.setdefault('ensure_ascii', False)
+    atomic_write(path, json.dumps(data, **dump_options), mode=mode)
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Lock consultivo exclusivo entre processos para o arquivo informado.
+
+    O lock e feito em '<arquivo>.lock' (que permanece no disco), pois o
+    proprio arquivo e substituido a cada gravacao atomica.
+
+    Args:
+        path (str | Path): Arquivo protegido
+    """
+    lock_path = os.fspath(path) + LOCK_SUFFIX
+    with open(lock_path, 'a+b') as lock_file:
+        if os.name == 'nt':
+            import msvcrt
+            while True:
+                try:
+                    lock_file.seek(0)
+                    # LK_LOCK tenta por ~10s antes de falhar; repetir ate conseguir
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Cache das imagens das notificacoes.
+
+Os icones sao localizados uma unica vez e cada combinacao de icone, tamanho
+e escala (DPI) e redimensionada apenas uma vez: o resultado fica em memoria
+durante a execucao e em IMAGE_CACHE_DIR entre execucoes. O nome do arquivo
+em cache inclui o mtime e o tamanho do original, de modo que um icone
+alterado gera uma nova versao. O Pillow so e importado quando uma imagem
+precisa ser carregada.
+"""
+
+import io
+import sys
+import threading
+from pathlib import Path
+
+from CloudQuest.config.settings import ICONS_DIR, IMAGE_CACHE_DIR
+from CloudQuest.utils.fileio import atomic_write
+from CloudQuest.utils.logger import log
+
+# Imagens redimensionadas: (nome, largura, altura) -> PIL.Image
+_images = {}
+# Caminhos dos icones: nome -> Path ou None
+_asset_paths = {}
+_lock = threading.Lock()
+_icon_dirs = None
+
+
+def _get_icon_dirs():
+    """Diretorios de icones existentes (resolvidos uma unica vez)."""
+    global _icon_dirs
+    if _icon_dirs is None:
+        if getattr(sys, 'frozen', False):
+            # Executando como aplicativo compilado: os assets estao embutidos em _MEIPASS
+            candidates = [Path(sys._MEIPASS) / "assets" / "icons"]
+        else:
+            candidates = [Path("assets") / "icons", ICONS_DIR]
+        _icon_dirs = [directory for directory in candidates if directory.is_dir()]
+    return _icon_dirs
+
+
+def find_asset(name):
+    """
+    Localiza um icone nos diretorios de assets.
+
+    Args:
+        name (str): Nome do arquivo de icone
+
+    Returns:
+        Path: Caminho do icone ou None se nao encontrado
+    """
+    if name not in _asset_paths:
+        path = next((directory / name for directory in _get_icon_dirs() if (directory / name).is_file()), None)
+        if path:
+            log.debug(f"Ícone encontrado: {path}")
+        else:
+            log.warning(f"Ícone não encontrado: {name}")
+        _asset_paths[name] = path
+    return _asset_paths[name]
+
+
+def _cache_path(source, width, height):
+    stat = source.stat()
+    return IMAGE_CACHE_DIR / f"{source.stem}-{width}x{height}-{stat.st_mtime_ns:x}-{stat.st_size:x}.png"
+
+
+def load_image(name, size, scale=1.0):
+    """
+    Retorna um icone ja redimensionado.
+
+    Args:
+        name (str): Nome do arquivo de icone
+        size (tuple): Tamanho logico (largura, altura)
+        scale (float): Escala da tela (DPI); a imagem e gerada em size * scale pixels
+
+    Returns:
+        PIL.Image.Image: Imagem redimensionada ou None se o icone nao existir
+    """
+    width, height = round(size[0] * scale), round(size[1] * scale)
+    key = (name, width, height)
+    with _lock:
+        if key in _images:
+            return _images[key]
+
+        source = find_asset(name)
+        if source is None:
+            return None
+
+        from PIL import Image
+
+        image = None
+        cache_file = _cache_path(source, width, height)
+        try:
+            with Image.open(cache_file) as cached:
+                cached.load()
+                image = cached.copy()
+        except (OSError, ValueError):
+            pass
+
+        if image is None:
+            with Image.open(source) as original:
+                image = original.convert("RGBA").resize((width, height), Image.LANCZOS)
+            try:
+                buffer = io.BytesIO()
+                image.save(buffer, format="PNG")
+                IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                atomic_write(cache_file, buffer.getvalue())
+                log.debug(f"Ícone redimensionado salvo em cache: {cache_file}")
+            except OSError as e:
+                log.debug(f"Falha ao salvar ícone em cache: {e}")
+
+        _images[key] = image
+        return image
@@ -3,6 +3,8 @@
 """
 Utilitarios para determinacao de caminhos do sistema.
 Este modulo centraliza a logica para determinar os caminhos da aplicacao.
+Importar o modulo apenas calcula os caminhos; os diretorios sao criados por
+ensure_app_dirs, chamado no inicio da execucao.
 """
 
 import os
@@ -28,11 +30,18 @@ def get_app_paths() -> Dict[str, Path]:
         BASE_DIR = Path(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
         APP_DIR = BASE_DIR
 
-    # Define o diretório de perfis com base no sistema operacional
+    # Define o diretório de dados (perfis e estado) com base no sistema operacional
     if platform.system() == "Windows":
-        PROFILES_DIR = Path(os.environ.get("APPDATA")) / "cloudquest" / "profiles"
+        DATA_DIR = Path(os.environ.get("APPDATA")) / "cloudquest"
     else:
-        PROFILES_DIR = Path.home() / ".config" / "cloudquest" / "profiles"
+        DATA_DIR = Path.home() / ".config" / "cloudquest"
+    PROFILES_DIR = DATA_DIR / "profiles"
+
+    # Diretorio de cache (dados que podem ser recriados a qualquer momento)
+    if platform.system() == "Windows":
+        CACHE_DIR = Path(os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA")) / "cloudquest" / "cache"
+    else:
+        CACHE_DIR = Path.home() / ".cache" / "cloudquest"
 
     # Diretorios do projeto
     paths = {
@@ -40,18 +49,29 @@ def get_app_paths() -> Dict[str, Path]:
         'APP_DIR': APP_DIR,
         'LOGS_DIR': Path(os.environ.get("APPDATA")) / "cloudquest" / "logs" if platform.system() == "Windows" else Path.home() / ".cache" / "cloudquest" / "logs",
         'CONFIG_DIR': APP_DIR / "config",
+        'DATA_DIR': DATA_DIR,
+        'CACHE_DIR': CACHE_DIR,
         'PROFILES_DIR': PROFILES_DIR,
         'ASSETS_DIR': APP_DIR / "assets",
         'ICONS_DIR': APP_DIR / "assets" / "icons",
         'TEMP_PROFILE_FILE': Path(os.path.join(tempfile.gettempdir(), "cloudquest_profile.txt"))
     }
     
-    # Garantir que diretorios importantes existam
+    return paths
+
+
+def ensure_app_dirs(paths=None):
+    """
+    Garante que os diretorios de logs, dados e perfis existam.
+    
+    Args:
+        paths (Dict[str, Path], optional): Caminhos da aplicacao (padrao: APP_PATHS)
+    """
+    paths = paths or APP_PATHS
     paths['LOGS_DIR'].mkdir(exist_ok=True, parents=True)
     paths['PROFILES_DIR'].mkdir(exist_ok=True, parents=True)
     # paths['ICONS_DIR'].mkdir(exist_ok=True, parents=True) # Removido para evitar criação de pasta vazia
-    
-    return paths
+
 
 # Exportar uma instancia para uso global
 APP_PATHS = get_app_paths() 
\ No newline at end of file
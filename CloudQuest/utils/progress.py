@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Eventos de progresso das transferencias.
+
+Uma sincronizacao cria um ProgressReporter e o ativa na thread atual
+('with reporter:'); as transferencias do Rclone iniciadas dentro do bloco
+enviam suas estatisticas a ele, sem que os modos de sincronizacao precisem
+repassa-lo. O relator converte as estatisticas em ProgressEvent e os entrega
+aos ouvintes (notificacao, linha de comando, log) no maximo a cada
+PROGRESS_UPDATE_INTERVAL segundos. Os ouvintes sao chamados na thread que le
+as estatisticas do Rclone e devem retornar rapidamente.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from CloudQuest.config.settings import PROGRESS_UPDATE_INTERVAL
+from CloudQuest.utils.logger import log
+
+ProgressEvent = namedtuple('ProgressEvent', [
+    'profile',      # nome do perfil
+    'direction',    # 'up' ou 'down'
+    'transferred',  # bytes transferidos
+    'total',        # bytes a transferir (0 se ainda desconhecido)
+    'speed',        # bytes por segundo
+    'eta',          # segundos restantes ou None
+    'files',        # arquivos transferidos
+    'total_files',  # arquivos a transferir
+    'finished',     # True no evento final
+    'success'       # resultado (apenas no evento final)
+])
+
+_current = threading.local()
+
+
+def event_fraction(event):
+    """
+    Args:
+        event (ProgressEvent): Evento de progresso
+
+    Returns:
+        float: Fracao concluida (0 a 1) ou None se o total for desconhecido
+    """
+    if event.finished and event.success:
+        return 1.0
+    if not event.total:
+        return None
+    return min(1.0, event.transferred / event.total)
+
+
+class ProgressReporter:
+    """Distribui o progresso de uma sincronizacao aos ouvintes registrados."""
+
+    def __init__(self, profile_name, direction, min_interval=PROGRESS_UPDATE_INTERVAL):
+        """
+        Args:
+            profile_name (str): Nome do perfil
+            direction (str): Direcao da sincronizacao ('up' ou 'down')
+            min_interval (float): Segundos minimos entre eventos
+        """
+        self.profile_name = profile_name
+        self.direction = direction
+        self.min_interval = min_interval
+        self.last_event = None
+        self._listeners = []
+        self._last_emit = 0.0
+
+    def add_listener(self, listener):
+        """
+        Registra um ouvinte.
+
+        Args:
+            listener (callable): Recebe cada ProgressEvent
+        """
+        self._listeners.append(listener)
+
+    def update(self, stats):
+        """
+        Recebe as estatisticas do Rclone (log JSON ou core/stats).
+
+        Args:
+            stats (dict): Estatisticas (bytes, totalBytes, speed, eta, transfers...)
+        """
+        transferred = stats.get('bytes', 0)
+        total = stats.get('totalBytes', 0)
+        now = time.monotonic()
+        # Eventos intermediarios sao descartados; o de conclusao sempre passa
+        if now - self._last_emit < self.min_interval and not (total and transferred >= total):
+            return
+        self._last_emit = now
+        eta = stats.get('eta')
+        self._emit(ProgressEvent(
+            profile=self.profile_name,
+            direction=self.direction,
+            transferred=transferred,
+            total=total,
+            speed=stats.get('speed', 0),
+            eta=eta if isinstance(eta, (int, float)) else None,
+            files=stats.get('transfers', 0),
+            total_files=stats.get('totalTransfers', 0),
+            finished=False,
+            success=None
+        ))
+
+    def finish(self, success=True):
+        """
+        Envia o evento final.
+
+        Args:
+            success (bool): Resultado da sincronizacao
+        """
+        last = self.last_event
+        self._emit(ProgressEvent(
+            profile=self.profile_name,
+            direction=self.direction,
+            transferred=last.transferred if last else 0,
+            total=last.total if last else 0,
+            speed=0,
+            eta=None,
+            files=last.files if last else 0,
+            total_files=last.total_files if last else 0,
+            finished=True,
+            success=success
+        ))
+
+    def _emit(self, event):
+        self.last_event = event
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                log.debug(f"Erro no ouvinte de progresso: {e}")
+
+    def __enter__(self):
+        stack = getattr(_current, 'stack', None)
+        if stack is None:
+            stack = _current.stack = []
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current.stack.remove(self)
+        return False
+
+
+def current_reporter():
+    """
+    Returns:
+        ProgressReporter: Relator ativo na thread atual ou None
+    """
+    stack = getattr(_current, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def current_callback():
+    """
+    Callback de estatisticas do relator ativo, para as transferencias do Rclone.
+
+    Deve ser obtido na thread que iniciou a sincronizacao: a leitura das
+    estatisticas acontece em outra thread.
+
+    Returns:
+        callable: reporter.update ou None se nao houver relator ativo
+    """
+    reporter = current_reporter()
+    return reporter.update if reporter else None
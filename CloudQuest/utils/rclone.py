@@ -5,59 +5,129 @@ CloudQuest - Wrapper para o Rclone.
 """
 
 import os
+import json
+import shutil
 import subprocess
+import tempfile
+import threading
 import time
 import platform
+from collections import deque
+from contextlib import contextmanager
 
-from CloudQuest.utils.logger import log, setup_logger
-from CloudQuest.config.settings import RCLONE_TIMEOUT, RCLONE_MAX_RETRIES, RCLONE_RETRY_WAIT
+from CloudQuest.utils.logger import log
+from CloudQuest.utils.progress import current_callback
+from CloudQuest.config.settings import (
+    RCLONE_TIMEOUT, RCLONE_MAX_RETRIES, RCLONE_RETRY_WAIT, RCLONE_TRANSPORT, RCLONE_STALL_TIMEOUT,
+    RCLONE_STATS_INTERVAL, RCLONE_PROGRESS_LOG_INTERVAL, RCLONE_LOG_TAIL_LINES
+)
 
-# Garantir que o logger esteja configurado
-setup_logger()
+# Transporte ativo ("subprocess" ou "rc")
+_transport = RCLONE_TRANSPORT
 
-def test_rclone_config(rclone_path, cloud_remote):
+def set_transport(transport):
     """
-    Verifica se o Rclone esta configurado corretamente.
+    Define o transporte usado nas operacoes do Rclone.
     
     Args:
-        rclone_path (str): Caminho para o executavel do Rclone
-        cloud_remote (str): Nome do remote a ser verificado
+        transport (str): "subprocess" (um processo por operacao) ou "rc" (daemon rclone rcd)
+    """
+    global _transport
+    if transport not in ("subprocess", "rc"):
+        raise ValueError(f"Transporte do Rclone invalido: {transport}")
+    _transport = transport
+    log.info(f"Transporte do Rclone: {transport}")
+
+def _get_daemon(rclone_path):
+    """
+    Retorna o daemon rc quando esse transporte esta ativo.
+    
+    Se o daemon nao puder ser iniciado, a sessao volta ao modo subprocess.
+    
+    Returns:
+        RcloneDaemon: Daemon em execucao ou None no modo subprocess
+    """
+    global _transport
+    if _transport != "rc":
+        return None
+    
+    from CloudQuest.utils.rclone_rc import get_daemon
+    try:
+        return get_daemon(rclone_path)
+    except Exception as e:
+        log.warning(f"Daemon Rclone indisponivel, usando subprocessos: {e}")
+        _transport = "subprocess"
+        return None
+
+# Prioridade das operacoes iniciadas pela thread atual
+_priority = threading.local()
+
+@contextmanager
+def low_priority():
+    """
+    Executa os processos do Rclone iniciados nesta thread com prioridade baixa
+    de CPU e IO (usado nos checkpoints durante o jogo).
+    """
+    previous = getattr(_priority, 'low', False)
+    _priority.low = True
+    try:
+        yield
+    finally:
+        _priority.low = previous
+
+def _apply_priority(process):
+    """Reduz a prioridade do processo do Rclone quando solicitado pela thread atual."""
+    if not getattr(_priority, 'low', False):
+        return
+    
+    try:
+        import psutil
+        child = psutil.Process(process.pid)
+        if os.name == 'nt':
+            child.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+            child.ionice(psutil.IOPRIO_LOW)
+        else:
+            child.nice(10)
+            if hasattr(child, 'ionice'):
+                child.ionice(psutil.IOPRIO_CLASS_IDLE)
+    except Exception as e:
+        log.debug(f"Falha ao reduzir prioridade do Rclone (PID: {process.pid}): {e}")
+
+def locate_rclone(rclone_path):
+    """
+    Localiza o executavel do Rclone sem iniciar processos.
+    
+    Args:
+        rclone_path (str): Caminho ou nome do executavel do Rclone
         
     Returns:
-        bool: True se a configuracao esta correta
+        str: Caminho absoluto do executavel
         
     Raises:
         FileNotFoundError: Se o Rclone nao for encontrado
-        ValueError: Se o remote nao estiver configurado
     """
-    log.info("Verificando configuracao do Rclone...")
-    
-    # Verificar se o Rclone está disponível no sistema
-    if platform.system() == "Windows":
-        # Para Windows, verifica se o executável existe
-        if not os.path.exists(rclone_path):
+    located = shutil.which(rclone_path)
+    if not located:
+        if platform.system() == "Windows":
             raise FileNotFoundError(f"Arquivo do Rclone nao encontrado: {rclone_path}")
+        raise FileNotFoundError(f"Rclone não instalado ou não encontrado no PATH: {rclone_path}")
+    return os.path.abspath(located)
+
+
+def list_remotes(rclone_path):
+    """
+    Lista os remotes configurados no Rclone.
+    
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
         
-    else:
-        # No Linux, verifica se o rclone está instalado e disponível no PATH
-        try:
-            # Tenta executar o comando 'which rclone' para verificar se está instalado
-            result = subprocess.run(
-                ["which", rclone_path] if rclone_path == "rclone" else ["which", "rclone"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            
-            if result.returncode != 0:
-                raise FileNotFoundError(f"Rclone não instalado ou não encontrado no PATH")
-                
-            log.info(f"Rclone encontrado em: {result.stdout.strip()}")
-        except Exception as e:
-            log.error(f"Erro ao verificar instalação do Rclone: {str(e)}")
-            raise FileNotFoundError(f"Não foi possível verificar a instalação do Rclone: {str(e)}")
-        
-    # Listar remotes disponiveis
+    Returns:
+        list: Nomes dos remotes (sem ':')
+    """
+    daemon = _get_daemon(rclone_path)
+    if daemon:
+        return daemon.list_remotes()
+    
     try:
         result = subprocess.run(
             [rclone_path, "listremotes"],
@@ -67,17 +137,65 @@ def test_rclone_config(rclone_path, cloud_remote):
             creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
             shell=False
         )
+    except subprocess.CalledProcessError as e:
+        log.error(f"Erro ao executar Rclone: {e}")
+        log.error(f"Saida de erro: {e.stderr}")
+        raise
+    
+    return [line.strip().rstrip(':') for line in result.stdout.splitlines() if line.strip()]
+
+
+def get_rclone_version(rclone_path):
+    """
+    Obtem a versao do Rclone.
+    
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        
+    Returns:
+        str: Versao (ex: 'v1.66.0') ou None se nao identificada
+    """
+    daemon = _get_daemon(rclone_path)
+    if daemon:
+        return daemon.call('core/version').get('version')
+    
+    result = subprocess.run(
+        [rclone_path, "version"],
+        capture_output=True,
+        text=True,
+        check=True,
+        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+        shell=False
+    )
+    first_line = result.stdout.splitlines()[0] if result.stdout else ""
+    return first_line.split()[-1] if first_line else None
+
+
+def test_rclone_config(rclone_path, cloud_remote):
+    """
+    Verifica se o Rclone esta configurado corretamente.
+    
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        cloud_remote (str): Nome do remote a ser verificado
+        
+    Returns:
+        bool: True se a configuracao esta correta
         
-        remotes = result.stdout.splitlines()
-        if f"{cloud_remote}:" not in remotes:
+    Raises:
+        FileNotFoundError: Se o Rclone nao for encontrado
+        ValueError: Se o remote nao estiver configurado
+    """
+    log.info("Verificando configuracao do Rclone...")
+    
+    log.info(f"Rclone encontrado em: {locate_rclone(rclone_path)}")
+    
+    try:
+        if cloud_remote not in list_remotes(rclone_path):
             raise ValueError(f"Remote '{cloud_remote}' nao configurado")
         
         log.info("Configuracao do Rclone validada")
         return True
-    except subprocess.CalledProcessError as e:
-        log.error(f"Erro ao executar Rclone: {e}")
-        log.error(f"Saida de erro: {e.stderr}")
-        raise
     except Exception as e:
         log.error(f"Falha na verificacao do Rclone: {str(e)}")
         raise
@@ -97,13 +215,17 @@ def create_remote_dir(rclone_path, cloud_remote, cloud_dir):
     """
     try:
         log.info(f"Verificando/criando diretorio remoto: {cloud_remote}:{cloud_dir}")
-        subprocess.run(
-            [rclone_path, "mkdir", f"{cloud_remote}:{cloud_dir}"],
-            capture_output=True,
-            check=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
-            shell=False
-        )
+        daemon = _get_daemon(rclone_path)
+        if daemon:
+            daemon.mkdir(f"{cloud_remote}:", cloud_dir)
+        else:
+            subprocess.run(
+                [rclone_path, "mkdir", f"{cloud_remote}:{cloud_dir}"],
+                capture_output=True,
+                check=True,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+                shell=False
+            )
         log.info(f"Diretorio remoto verificado/criado: {cloud_remote}:{cloud_dir}")
         return True
     except subprocess.CalledProcessError as e:
@@ -114,7 +236,438 @@ def create_remote_dir(rclone_path, cloud_remote, cloud_dir):
         return False
 
 
-def execute_rclone_sync(rclone_path, source, destination):
+def read_remote_file(rclone_path, remote_path):
+    """
+    Le o conteudo de um arquivo remoto com 'rclone cat'.
+    
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_path (str): Caminho completo do arquivo (remote:dir/arquivo)
+        
+    Returns:
+        str: Conteudo do arquivo ou None se inexistente/inacessivel
+    """
+    daemon = _get_daemon(rclone_path)
+    if daemon:
+        from CloudQuest.utils.rclone_rc import split_remote_file
+        remote_fs, remote_name = split_remote_file(remote_path)
+        with tempfile.TemporaryDirectory(prefix="cloudquest_") as temp_dir:
+            try:
+                daemon.copy_file(remote_fs, remote_name, temp_dir, remote_name)
+                with open(os.path.join(temp_dir, remote_name), 'r', encoding='utf-8') as file:
+                    return file.read() or None
+            except Exception as e:
+                log.debug(f"Arquivo remoto indisponivel {remote_path}: {e}")
+                return None
+    
+    try:
+        result = subprocess.run(
+            [rclone_path, "cat", remote_path],
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            timeout=RCLONE_TIMEOUT,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+            shell=False
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        log.warning(f"Falha ao ler arquivo remoto {remote_path}: {e}")
+        return None
+    
+    if result.returncode != 0:
+        log.debug(f"Arquivo remoto indisponivel {remote_path}: {result.stderr.strip()}")
+        return None
+    
+    # 'rclone cat' de um arquivo inexistente em diretorio existente nao gera erro
+    return result.stdout or None
+
+
+def write_remote_file(rclone_path, remote_path, content):
+    """
+    Grava um arquivo remoto pequeno com 'rclone rcat'.
+    
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_path (str): Caminho completo do arquivo (remote:dir/arquivo)
+        content (str): Conteudo a ser gravado
+        
+    Returns:
+        bool: True se gravado com sucesso
+    """
+    daemon = _get_daemon(rclone_path)
+    if daemon:
+        from CloudQuest.utils.rclone_rc import split_remote_file
+        remote_fs, remote_name = split_remote_file(remote_path)
+        with tempfile.TemporaryDirectory(prefix="cloudquest_") as temp_dir:
+            try:
+                with open(os.path.join(temp_dir, remote_name), 'w', encoding='utf-8') as file:
+                    file.write(content)
+                daemon.copy_file(temp_dir, remote_name, remote_fs, remote_name)
+                return True
+            except Exception as e:
+                log.warning(f"Falha ao gravar arquivo remoto {remote_path}: {e}")
+                return False
+    
+    try:
+        result = subprocess.run(
+            [rclone_path, "rcat", remote_path],
+            input=content,
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            timeout=RCLONE_TIMEOUT,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+            shell=False
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        log.warning(f"Falha ao gravar arquivo remoto {remote_path}: {e}")
+        return False
+    
+    if result.returncode != 0:
+        log.warning(f"Falha ao gravar arquivo remoto {remote_path}: {result.stderr.strip()}")
+        return False
+    
+    return True
+
+
+def _stderr_tail(stream):
+    """Le o final da saida de erro gravada em um arquivo temporario."""
+    stream.seek(0)
+    lines = stream.read().decode('utf-8', errors='replace').strip().splitlines()
+    return "\n".join(lines[-RCLONE_LOG_TAIL_LINES:])
+
+
+def upload_stream(rclone_path, remote_path, writer):
+    """
+    Envia um arquivo remoto gerado sob demanda, sem arquivo intermediario.
+    
+    No modo subprocess o conteudo e escrito diretamente na entrada do
+    'rclone rcat'; no modo rc e gravado em um arquivo temporario e copiado.
+    
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_path (str): Caminho completo do arquivo (remote:dir/arquivo)
+        writer (callable): Recebe um arquivo binario aberto para escrita
+        
+    Raises:
+        Exception: Se o envio falhar
+    """
+    daemon = _get_daemon(rclone_path)
+    if daemon:
+        from CloudQuest.utils.rclone_rc import split_remote_file
+        remote_fs, remote_name = split_remote_file(remote_path)
+        with tempfile.TemporaryDirectory(prefix="cloudquest_") as temp_dir:
+            with open(os.path.join(temp_dir, remote_name), 'wb') as file:
+                writer(file)
+            daemon.copy_file(temp_dir, remote_name, remote_fs, remote_name)
+        return
+    
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            [rclone_path, "rcat", remote_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+            shell=False
+        )
+        _apply_priority(process)
+        try:
+            try:
+                writer(process.stdin)
+            finally:
+                process.stdin.close()
+            process.wait(timeout=RCLONE_TIMEOUT)
+        except BrokenPipeError:
+            # O Rclone encerrou antes do fim do envio; o erro vem da saida dele
+            process.wait(timeout=RCLONE_TIMEOUT)
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        
+        if process.returncode != 0:
+            raise Exception(f"Falha ao enviar {remote_path} (codigo {process.returncode}): {_stderr_tail(stderr)}")
+
+
+def download_stream(rclone_path, remote_path, reader):
+    """
+    Le um arquivo remoto como fluxo, sem arquivo intermediario.
+    
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_path (str): Caminho completo do arquivo (remote:dir/arquivo)
+        reader (callable): Recebe um arquivo binario aberto para leitura
+        
+    Raises:
+        Exception: Se a leitura falhar
+    """
+    daemon = _get_daemon(rclone_path)
+    if daemon:
+        from CloudQuest.utils.rclone_rc import split_remote_file
+        remote_fs, remote_name = split_remote_file(remote_path)
+        with tempfile.TemporaryDirectory(prefix="cloudquest_") as temp_dir:
+            daemon.copy_file(remote_fs, remote_name, temp_dir, remote_name)
+            with open(os.path.join(temp_dir, remote_name), 'rb') as file:
+                reader(file)
+        return
+    
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            [rclone_path, "cat", remote_path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+            shell=False
+        )
+        _apply_priority(process)
+        try:
+            reader(process.stdout)
+            # Descartar o restante (ex: preenchimento final do tar)
+            while process.stdout.read(1024 * 1024):
+                pass
+            process.stdout.close()
+            process.wait(timeout=RCLONE_TIMEOUT)
+        except BaseException:
+            process.kill()
+            process.wait()
+            log.debug(f"Saida do Rclone: {_stderr_tail(stderr)}")
+            raise
+        
+        if process.returncode != 0:
+            raise Exception(f"Falha ao ler {remote_path} (codigo {process.returncode}): {_stderr_tail(stderr)}")
+
+
+def list_remote_files(rclone_path, remote_dir):
+    """
+    Lista recursivamente os arquivos de um diretorio remoto.
+    
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_dir (str): Diretorio remoto (remote:dir)
+        
+    Returns:
+        list: Caminhos relativos ao diretorio (vazia se o diretorio nao existir)
+    """
+    daemon = _get_daemon(rclone_path)
+    if daemon:
+        return daemon.list_files(remote_dir)
+    
+    result = subprocess.run(
+        [rclone_path, "lsf", remote_dir, "--recursive", "--files-only"],
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        timeout=RCLONE_TIMEOUT,
+        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+        shell=False
+    )
+    if result.returncode != 0:
+        # Codigo 3: diretorio inexistente
+        if result.returncode == 3:
+            return []
+        raise Exception(f"Falha ao listar {remote_dir}: {result.stderr.strip()}")
+    
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def delete_remote_files(rclone_path, remote_dir, files):
+    """
+    Remove arquivos de um diretorio remoto.
+    
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+        remote_dir (str): Diretorio remoto (remote:dir)
+        files (list): Caminhos relativos a remover
+    """
+    if not files:
+        return
+    
+    daemon = _get_daemon(rclone_path)
+    if daemon:
+        for name in files:
+            daemon.delete_file(remote_dir, name)
+        return
+    
+    with tempfile.NamedTemporaryFile('w', suffix=".txt", prefix="cloudquest_delete_",
+                                     encoding='utf-8', delete=False) as file_list:
+        file_list.write("\n".join(files) + "\n")
+    try:
+        result = subprocess.run(
+            [rclone_path, "delete", remote_dir, "--files-from-raw", file_list.name],
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            timeout=RCLONE_TIMEOUT,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+            shell=False
+        )
+    finally:
+        os.unlink(file_list.name)
+    
+    if result.returncode != 0:
+        raise Exception(f"Falha ao remover arquivos de {remote_dir}: {result.stderr.strip()}")
+
+
+def join_remote_path(base, name):
+    """
+    Junta um caminho remoto (remote:dir) com um nome de arquivo.
+    
+    Args:
+        base (str): Caminho remoto base
+        name (str): Nome relativo a ser adicionado
+        
+    Returns:
+        str: Caminho remoto completo
+    """
+    if base.endswith(":"):
+        return f"{base}{name}"
+    return f"{base.rstrip('/')}/{name}"
+
+
+def format_size(size):
+    """
+    Formata um tamanho em bytes para exibicao (ex: '12.3 MiB').
+    
+    Args:
+        size (float): Tamanho em bytes
+        
+    Returns:
+        str: Tamanho formatado
+    """
+    size = float(size or 0)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_stats(stats):
+    """
+    Resume as estatisticas do Rclone (bytes, porcentagem, velocidade e ETA).
+    
+    Args:
+        stats (dict): Estatisticas no formato do Rclone ('stats' do log JSON ou core/stats)
+        
+    Returns:
+        str: Resumo legivel
+    """
+    transferred = stats.get('bytes', 0)
+    total = stats.get('totalBytes', 0)
+    percent = f" ({transferred * 100 // total}%)" if total else ""
+    eta = stats.get('eta')
+    eta_text = f"{eta:.0f}s" if isinstance(eta, (int, float)) else "-"
+    return (f"{format_size(transferred)} / {format_size(total)}{percent}, "
+            f"{format_size(stats.get('speed', 0))}/s, ETA {eta_text}, "
+            f"{stats.get('transfers', 0)}/{stats.get('totalTransfers', 0)} arquivos")
+
+
+def stats_progress_key(stats):
+    """Valores que indicam avanco da transferencia (usados na deteccao de travamento)."""
+    return (stats.get('bytes', 0), stats.get('transfers', 0), stats.get('checks', 0),
+            stats.get('listed', 0), stats.get('deletes', 0))
+
+
+def _run_streaming(command, stall_timeout=RCLONE_STALL_TIMEOUT, progress_callback=None):
+    """
+    Executa o Rclone consumindo o log JSON linha a linha.
+    
+    As estatisticas periodicas alimentam o progresso e a deteccao de travamento:
+    o processo so e interrompido apos 'stall_timeout' segundos sem avanco, nao
+    importa a duracao total. Apenas as ultimas linhas do log ficam em memoria.
+    
+    Args:
+        command (list): Comando do Rclone (sem as opcoes de log)
+        stall_timeout (float): Segundos sem progresso antes de abortar
+        progress_callback (callable, optional): Recebe o dict de estatisticas a cada atualizacao
+        
+    Raises:
+        TimeoutError: Se a transferencia ficar parada alem do limite
+        Exception: Se o Rclone terminar com erro
+    """
+    command = command + [
+        "--use-json-log",
+        "--log-level=NOTICE",
+        f"--stats={RCLONE_STATS_INTERVAL}s",
+        "--stats-log-level=NOTICE"
+    ]
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+        shell=False
+    )
+    _apply_priority(process)
+    
+    tail = deque(maxlen=RCLONE_LOG_TAIL_LINES)
+    state = {'last_progress': time.monotonic(), 'key': None, 'last_log': time.monotonic()}
+    
+    def reader():
+        for line in process.stderr:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                tail.append(line)
+                continue
+            
+            stats = entry.get('stats')
+            if stats is None:
+                message = entry.get('msg', line)
+                tail.append(message)
+                if entry.get('level') in ('error', 'critical'):
+                    log.warning(f"Rclone: {message}")
+                else:
+                    log.debug(f"Rclone: {message}")
+                continue
+            
+            now = time.monotonic()
+            key = stats_progress_key(stats)
+            if key != state['key']:
+                state['key'] = key
+                state['last_progress'] = now
+            if now - state['last_log'] >= RCLONE_PROGRESS_LOG_INTERVAL:
+                state['last_log'] = now
+                log.info(f"Progresso: {format_stats(stats)}")
+            if progress_callback:
+                try:
+                    progress_callback(stats)
+                except Exception as e:
+                    log.debug(f"Erro no callback de progresso: {e}")
+    
+    reader_thread = threading.Thread(target=reader, name="rclone-log", daemon=True)
+    reader_thread.start()
+    
+    try:
+        while True:
+            try:
+                process.wait(timeout=RCLONE_STATS_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                stalled = time.monotonic() - state['last_progress']
+                if stalled > stall_timeout:
+                    raise TimeoutError(f"Rclone sem progresso ha {stalled:.0f} segundos.")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        reader_thread.join(timeout=5)
+    
+    if process.returncode != 0:
+        details = "\n".join(tail)
+        raise Exception(f"Codigo de erro {process.returncode}\nSaida: {details}")
+
+
+def execute_rclone_sync(rclone_path, source, destination, files=None, update=True, excludes=None,
+                        progress_callback=None):
     """
     Executa o comando Rclone para sincronizacao com tratamento de erros e retentativas.
     
@@ -122,6 +675,14 @@ def execute_rclone_sync(rclone_path, source, destination):
         rclone_path (str): Caminho para o executavel do Rclone
         source (str): Origem da sincronizacao
         destination (str): Destino da sincronizacao
+        files (list, optional): Caminhos relativos a transferir. Quando informado,
+            apenas esses arquivos sao copiados e o destino nao e listado.
+        update (bool): Ignorar arquivos mais novos no destino (--update)
+        excludes (list, optional): Padroes de exclusao do Rclone (ignorados
+            quando 'files' e informado)
+        progress_callback (callable, optional): Recebe as estatisticas do Rclone
+            (bytes, totalBytes, speed, eta, ...) durante a transferencia (padrao:
+            o ProgressReporter ativo na thread, se houver)
         
     Returns:
         bool: True se bem sucedido
@@ -132,63 +693,69 @@ def execute_rclone_sync(rclone_path, source, destination):
     max_retries = RCLONE_MAX_RETRIES
     retry_count = 0
     success = False
+    progress_callback = progress_callback or current_callback()
     
     log.info(f"Sincronizando: {source} -> {destination}")
     
-    while not success and retry_count < max_retries:
-        try:
-            retry_count += 1
-            log.info(f"Tentativa {retry_count}/{max_retries}")
-            
-            # Construir o comando
-            command = [
-                rclone_path,
-                "copy",
-                source,
-                destination,
-                "--progress",
-                "--update",
-                "--log-level=DEBUG",
-                "--log-file=rclone.log",
-                "--stats=5h",
-                "--multi-thread-streams=8",
-                "--disable-http2",
-                "--ignore-checksum",
-                "--create-empty-src-dirs"
-            ]
-
-            # Executar o comando
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
-                shell=False
-            )
-            
-            # Aguardar com timeout
+    # Lista de arquivos para --files-from-raw (um caminho relativo por linha)
+    files_from = None
+    if files is not None:
+        log.info(f"Transferencia parcial: {len(files)} arquivo(s)")
+        with tempfile.NamedTemporaryFile('w', suffix=".txt", prefix="cloudquest_files_",
+                                         encoding='utf-8', delete=False) as file_list:
+            file_list.write("\n".join(files) + "\n")
+            files_from = file_list.name
+    
+    try:
+        while not success and retry_count < max_retries:
             try:
-                stdout, stderr = process.communicate(timeout=RCLONE_TIMEOUT)
+                retry_count += 1
+                log.info(f"Tentativa {retry_count}/{max_retries}")
+                
+                daemon = _get_daemon(rclone_path)
+                if daemon:
+                    daemon.copy(source, destination, files_from=files_from, update=update, excludes=excludes,
+                                progress_callback=progress_callback)
+                    success = True
+                    log.info("Sincronizacao bem-sucedida")
+                    continue
                 
-                if process.returncode != 0:
-                    error_msg = f"Codigo de erro {process.returncode}\nSaida: {stderr}"
-                    log.error(error_msg)
-                    raise Exception(error_msg)
+                # Construir o comando
+                command = [
+                    rclone_path,
+                    "copy",
+                    source,
+                    destination,
+                    "--multi-thread-streams=8",
+                    "--disable-http2",
+                    "--ignore-checksum",
+                    "--create-empty-src-dirs"
+                ]
+                if update:
+                    command.append("--update")
+                if files_from:
+                    # --files-from-raw nao pode ser combinado com outros filtros
+                    command.extend(["--files-from-raw", files_from, "--no-traverse"])
+                else:
+                    for pattern in excludes or []:
+                        command.extend(["--exclude", pattern])
                 
+                # Executar o comando acompanhando o progresso pelo log JSON
+                _run_streaming(command, progress_callback=progress_callback)
                 success = True
                 log.info("Sincronizacao bem-sucedida")
-                
-            except subprocess.TimeoutExpired:
-                process.kill()
-                stdout, stderr = process.communicate()
-                log.error(f"Timeout: Rclone excedeu {RCLONE_TIMEOUT} segundos.")
-                
-        except Exception as e:
-            log.warning(f"Falha na tentativa {retry_count}: {str(e)}")
-            if retry_count < max_retries:
-                log.info(f"Aguardando {RCLONE_RETRY_WAIT} segundos antes da proxima tentativa...")
-                time.sleep(RCLONE_RETRY_WAIT)
+            
+            except Exception as e:
+                log.warning(f"Falha na tentativa {retry_count}: {str(e)}")
+                if retry_count < max_retries:
+                    log.info(f"Aguardando {RCLONE_RETRY_WAIT} segundos antes da proxima tentativa...")
+                    time.sleep(RCLONE_RETRY_WAIT)
+    finally:
+        if files_from:
+            try:
+                os.unlink(files_from)
+            except OSError:
+                pass
     
     if not success:
         raise Exception(f"Falha apos {max_retries} tentativas: {source} -> {destination}")
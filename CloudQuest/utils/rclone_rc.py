@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Transporte do Rclone via daemon 'rclone rcd'.
+
+Um unico processo 'rclone rcd' escutando em 127.0.0.1 atende todas as
+operacoes pela API HTTP de controle remoto (rc). O daemon continua ativo
+entre sessoes, reaproveitando tokens OAuth e conexoes ja abertas para o
+download, o upload e outros perfis.
+
+Ciclo de vida: o daemon e iniciado na primeira operacao com o transporte rc
+e fica registrado em RCLONE_RC_STATE_FILE. Ele so termina com stop_daemon()
+(ou 'CloudQuest --stop-rclone-daemon'), quando outro executavel do Rclone o
+substitui ou ao encerrar a sessao do usuario. Dentro de um processo, a
+disponibilidade do daemon so e verificada de novo depois de uma chamada que
+falhou por conexao.
+"""
+
+import os
+import json
+import time
+import uuid
+import base64
+import socket
+import secrets
+import threading
+import subprocess
+import urllib.error
+import urllib.request
+
+from CloudQuest.utils.fileio import write_json_atomic
+from CloudQuest.utils.logger import log
+from CloudQuest.utils.rclone import format_stats, stats_progress_key
+from CloudQuest.config.settings import (
+    RCLONE_RC_STATE_FILE, RCLONE_RC_START_TIMEOUT, RCLONE_RC_POLL_INTERVAL, RCLONE_TIMEOUT,
+    RCLONE_STALL_TIMEOUT, RCLONE_PROGRESS_LOG_INTERVAL
+)
+
+# Chamadas rapidas (noop, listremotes, status de jobs)
+RC_CALL_TIMEOUT = 10  # segundos
+
+
+class RcloneRcError(Exception):
+    """Erro retornado pela API rc do Rclone."""
+
+
+def split_remote_file(path):
+    """
+    Separa um caminho de arquivo do Rclone em (fs do diretorio, nome do arquivo).
+
+    Args:
+        path (str): Caminho no formato 'remote:dir/arquivo' ou caminho local
+
+    Returns:
+        tuple: (fs, nome)
+    """
+    head, separator, name = path.rpartition('/')
+    if separator:
+        return (head or '/'), name
+    if ':' in path:
+        remote, _, name = path.partition(':')
+        return f"{remote}:", name
+    return '.', path
+
+
+class RcloneDaemon:
+    """Cliente de um daemon 'rclone rcd' local, iniciado sob demanda."""
+
+    def __init__(self, rclone_path):
+        """
+        Args:
+            rclone_path (str): Caminho para o executavel do Rclone
+        """
+        self.rclone_path = rclone_path
+        self.url = None
+        self._auth = None
+        # Ultima verificacao bem-sucedida ainda valida (nenhuma chamada falhou desde entao)
+        self._alive = False
+        # Conexoes locais nao devem passar por proxies do sistema
+        self._opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+    def _set_endpoint(self, url, user, password):
+        self.url = url
+        token = base64.b64encode(f"{user}:{password}".encode('utf-8')).decode('ascii')
+        self._auth = f"Basic {token}"
+
+    def call(self, method, params=None, timeout=RC_CALL_TIMEOUT):
+        """
+        Executa um metodo da API rc.
+
+        Args:
+            method (str): Metodo (ex: 'operations/mkdir')
+            params (dict, optional): Parametros do metodo
+            timeout (float): Timeout da requisicao em segundos
+
+        Returns:
+            dict: Resposta do metodo
+
+        Raises:
+            RcloneRcError: Se o Rclone retornar erro
+            OSError: Se o daemon nao estiver acessivel
+        """
+        request = urllib.request.Request(
+            f"{self.url}{method}",
+            data=json.dumps(params or {}).encode('utf-8'),
+            headers={'Content-Type': 'application/json', 'Authorization': self._auth},
+            method='POST'
+        )
+        try:
+            with self._opener.open(request, timeout=timeout) as response:
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            try:
+                error = json.loads(e.read()).get('error', str(e))
+            except ValueError:
+                error = str(e)
+            raise RcloneRcError(f"{method}: {error}") from None
+        except OSError:
+            # Daemon possivelmente encerrado: verificar de novo na proxima operacao
+            self._alive = False
+            raise
+
+        return json.loads(body) if body else {}
+
+    def _is_alive(self):
+        try:
+            self.call('rc/noop')
+        except (OSError, RcloneRcError, ValueError):
+            self._alive = False
+            return False
+        self._alive = True
+        return True
+
+    def _load_state(self):
+        try:
+            with open(RCLONE_RC_STATE_FILE, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self, state):
+        try:
+            # Contem as credenciais do daemon: somente o usuario pode ler
+            write_json_atomic(RCLONE_RC_STATE_FILE, state, mode=0o600, indent=4)
+        except OSError as e:
+            log.warning(f"Falha ao salvar estado do daemon Rclone: {e}")
+
+    def ensure_running(self):
+        """
+        Reutiliza o daemon registrado no arquivo de estado ou inicia um novo.
+
+        Depois da primeira verificacao, nao faz nenhuma chamada enquanto as
+        operacoes continuarem funcionando.
+
+        Raises:
+            RuntimeError: Se o daemon nao responder a tempo
+        """
+        if self._alive or (self.url and self._is_alive()):
+            return
+
+        state = self._load_state()
+        if state and state.get('rclone_path') == self.rclone_path:
+            self._set_endpoint(state['url'], state['user'], state['password'])
+            if self._is_alive():
+                log.info(f"Reutilizando daemon Rclone em {self.url} (PID: {state.get('pid')})")
+                return
+        elif state:
+            # Daemon de outro executavel: encerrar antes de substituir
+            self._set_endpoint(state['url'], state['user'], state['password'])
+            if self._is_alive():
+                try:
+                    self.call('core/quit')
+                except (OSError, RcloneRcError, ValueError):
+                    pass
+
+        self._start()
+
+    def _start(self):
+        # Porta livre escolhida pelo sistema
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+        user = "cloudquest"
+        password = secrets.token_urlsafe(24)
+        command = [self.rclone_path, "rcd", f"--rc-addr=127.0.0.1:{port}", "--log-level=NOTICE"]
+        # Credenciais via ambiente para nao expo-las na linha de comando
+        env = dict(os.environ, RCLONE_RC_USER=user, RCLONE_RC_PASS=password)
+
+        # O daemon deve sobreviver ao fim desta sessao
+        if os.name == 'nt':
+            creationflags = (subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+                             | subprocess.DETACHED_PROCESS)
+            process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.DEVNULL, env=env, creationflags=creationflags, shell=False)
+        else:
+            process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.DEVNULL, env=env, start_new_session=True, shell=False)
+
+        self._set_endpoint(f"http://127.0.0.1:{port}/", user, password)
+        log.info(f"Iniciando daemon Rclone em {self.url} (PID: {process.pid})")
+
+        deadline = time.time() + RCLONE_RC_START_TIMEOUT
+        while time.time() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Daemon Rclone encerrou na inicializacao (codigo {process.returncode})")
+            if self._is_alive():
+                self._save_state({
+                    'pid': process.pid,
+                    'url': self.url,
+                    'user': user,
+                    'password': password,
+                    'rclone_path': self.rclone_path
+                })
+                return
+            time.sleep(0.1)
+
+        process.kill()
+        raise RuntimeError(f"Daemon Rclone nao respondeu apos {RCLONE_RC_START_TIMEOUT} segundos")
+
+    def run_job(self, method, params, stall_timeout=RCLONE_STALL_TIMEOUT, progress_callback=None):
+        """
+        Executa um metodo de forma assincrona, acompanhando o job ate o fim.
+        
+        O job so e interrompido apos 'stall_timeout' segundos sem progresso.
+        
+        Args:
+            method (str): Metodo da API rc
+            params (dict): Parametros do metodo
+            stall_timeout (float): Segundos sem progresso antes de abortar
+            progress_callback (callable, optional): Recebe o dict de estatisticas a cada consulta
+            
+        Returns:
+            dict: Saida do job
+            
+        Raises:
+            RcloneRcError: Se o job falhar
+            TimeoutError: Se o job ficar parado alem do limite
+        """
+        group = f"cloudquest-{uuid.uuid4().hex[:12]}"
+        job_id = self.call(method, dict(params, _async=True, _group=group))['jobid']
+        log.debug(f"Job rc {job_id} iniciado: {method}")
+        
+        last_progress = last_log = time.monotonic()
+        progress_key = None
+        try:
+            while True:
+                status = self.call('job/status', {'jobid': job_id})
+                if status.get('finished'):
+                    if not status.get('success'):
+                        raise RcloneRcError(status.get('error') or f"Job {job_id} falhou")
+                    return status.get('output') or {}
+                
+                stats = self.call('core/stats', {'group': group})
+                now = time.monotonic()
+                key = stats_progress_key(stats)
+                if key != progress_key:
+                    progress_key = key
+                    last_progress = now
+                elif now - last_progress > stall_timeout:
+                    self.call('job/stop', {'jobid': job_id})
+                    raise TimeoutError(f"Rclone sem progresso ha {now - last_progress:.0f} segundos.")
+                
+                if now - last_log >= RCLONE_PROGRESS_LOG_INTERVAL:
+                    last_log = now
+                    log.info(f"Progresso: {format_stats(stats)}")
+                if progress_callback:
+                    try:
+                        progress_callback(stats)
+                    except Exception as e:
+                        log.debug(f"Erro no callback de progresso: {e}")
+                
+                time.sleep(RCLONE_RC_POLL_INTERVAL)
+        finally:
+            try:
+                self.call('core/stats-delete', {'group': group})
+            except (OSError, RcloneRcError, ValueError):
+                pass
+    
+    def list_remotes(self):
+        """Retorna os remotes configurados (sem ':')."""
+        return self.call('config/listremotes').get('remotes') or []
+
+    def mkdir(self, fs, remote):
+        """Cria um diretorio remoto (operations/mkdir)."""
+        self.call('operations/mkdir', {'fs': fs, 'remote': remote}, timeout=RCLONE_TIMEOUT)
+
+    def copy(self, source, destination, files_from=None, update=True, excludes=None, progress_callback=None):
+        """
+        Copia um diretorio (sync/copy) com as mesmas opcoes do modo subprocess.
+
+        Args:
+            source (str): Origem (remote:dir ou caminho local)
+            destination (str): Destino (remote:dir ou caminho local)
+            files_from (str, optional): Arquivo com a lista de caminhos a copiar
+            update (bool): Ignorar arquivos mais novos no destino
+            excludes (list, optional): Padroes de exclusao
+            progress_callback (callable, optional): Recebe as estatisticas do job
+        """
+        config = {
+            'UpdateOlder': update,
+            'MultiThreadStreams': 8,
+            'IgnoreChecksum': True
+        }
+        filters = {}
+        if files_from:
+            config['NoTraverse'] = True
+            filters['FilesFromRaw'] = [files_from]
+        elif excludes:
+            filters['ExcludeRule'] = list(excludes)
+
+        params = {
+            'srcFs': source,
+            'dstFs': destination,
+            'createEmptySrcDirs': True,
+            '_config': config
+        }
+        if filters:
+            params['_filter'] = filters
+
+        self.run_job('sync/copy', params, progress_callback=progress_callback)
+
+    def list_files(self, remote_dir):
+        """Lista recursivamente os arquivos de um diretorio (operations/list)."""
+        try:
+            result = self.call('operations/list', {
+                'fs': remote_dir,
+                'remote': '',
+                'opt': {'recurse': True, 'filesOnly': True, 'noModTime': True, 'noMimeType': True}
+            }, timeout=RCLONE_TIMEOUT)
+        except RcloneRcError as e:
+            if "directory not found" in str(e):
+                return []
+            raise
+        return [item['Path'] for item in result.get('list') or []]
+    
+    def delete_file(self, fs, remote):
+        """Remove um unico arquivo (operations/deletefile)."""
+        self.call('operations/deletefile', {'fs': fs, 'remote': remote}, timeout=RCLONE_TIMEOUT)
+    
+    def copy_file(self, source_fs, source_name, destination_fs, destination_name):
+        """Copia um unico arquivo (operations/copyfile)."""
+        self.call('operations/copyfile', {
+            'srcFs': source_fs,
+            'srcRemote': source_name,
+            'dstFs': destination_fs,
+            'dstRemote': destination_name
+        }, timeout=RCLONE_TIMEOUT)
+
+    def stop(self):
+        """Encerra o daemon (core/quit)."""
+        try:
+            self.call('core/quit')
+        finally:
+            self._alive = False
+
+
+_daemons = {}
+_daemons_lock = threading.Lock()
+
+
+def get_daemon(rclone_path):
+    """
+    Retorna o daemon compartilhado para um executavel do Rclone, iniciando-o se necessario.
+
+    Args:
+        rclone_path (str): Caminho para o executavel do Rclone
+
+    Returns:
+        RcloneDaemon: Daemon em execucao
+    """
+    with _daemons_lock:
+        daemon = _daemons.get(rclone_path)
+        if daemon is None:
+            daemon = RcloneDaemon(rclone_path)
+            _daemons[rclone_path] = daemon
+        daemon.ensure_running()
+        return daemon
+
+
+def stop_daemon():
+    """
+    Encerra o daemon registrado no arquivo de estado (de qualquer executavel).
+
+    Returns:
+        bool: True se havia um daemon ativo e ele foi encerrado
+    """
+    with _daemons_lock:
+        _daemons.clear()
+        daemon = RcloneDaemon(None)
+        state = daemon._load_state()
+        if not state:
+            return False
+        daemon._set_endpoint(state['url'], state['user'], state['password'])
+        stopped = False
+        if daemon._is_alive():
+            try:
+                daemon.stop()
+            except (OSError, RcloneRcError, ValueError) as e:
+                # O daemon pode encerrar antes de responder
+                if daemon._is_alive():
+                    log.warning(f"Falha ao encerrar o daemon Rclone: {e}")
+                    return False
+            stopped = True
+            log.info(f"Daemon Rclone encerrado (PID: {state.get('pid')})")
+        try:
+            os.remove(RCLONE_RC_STATE_FILE)
+        except OSError:
+            pass
+        return stopped
@@ -5,13 +5,15 @@ Gerenciador de configuracoes da aplicacao.
 """
 
 import os
-import json
 import configparser
 import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import platform # Adicionado para verificar o SO
 
+from CloudQuest.core.profile_manager import KEY_MAPPING, load_profile, save_profile
+from CloudQuest.core.profile_index import get_profile_index
+
 from ..interfaces.services import ConfigService
 from ..utils.logger import setup_logger, write_log
 
@@ -61,10 +63,10 @@ class AppConfigService:
             # Nome do arquivo baseado no nome interno do jogo
             internal_name = config_data.get("internal_name", "unknown_game")
             
-            # Salvar arquivo de configuracao
+            # Salvar arquivo de configuracao (no formato lido pelo CloudQuest)
             config_file = profiles_dir / f"{internal_name}.json"
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=4, ensure_ascii=False)
+            if not save_profile(internal_name, config_data, profiles_dir):
+                return None
             
             write_log(f"Configuracoes salvas em: {config_file}")
             
@@ -81,7 +83,7 @@ class AppConfigService:
             return None
     
     def load_game_config(self, game_name_internal: str, profiles_dir: Path) -> Optional[Dict[str, Any]]:
-        """Carrega a configuracao de um jogo a partir do arquivo JSON."""
+        """Carrega a configuracao de um jogo a partir do arquivo JSON (nas chaves usadas por save_game_config)."""
         try:
             config_file = profiles_dir / f"{game_name_internal}.json"
             
@@ -89,8 +91,11 @@ class AppConfigService:
                 write_log(f"Arquivo de configuracao nao encontrado: {config_file}", level='WARNING')
                 return None
             
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
+            config_data = load_profile(game_name_internal, profiles_dir).to_dict()
+            # O perfil e lido nas chaves do CloudQuest; voltar as do QuestConfig
+            for questconfig_key, profile_key in KEY_MAPPING.items():
+                if profile_key in config_data:
+                    config_data[questconfig_key] = config_data.pop(profile_key)
             
             write_log(f"Configuracao carregada: {game_name_internal}")
             return config_data
@@ -99,6 +104,18 @@ class AppConfigService:
             write_log(f"Erro ao carregar configuracao: {str(e)}", level='ERROR')
             return None
     
+    def list_game_configs(self, search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Lista os perfis configurados sem abrir cada arquivo (indice de perfis)."""
+        index = get_profile_index()
+        if search:
+            return [index.get(name) for name in index.search(search)]
+        return index.all()
+    
+    def find_game_config_by_app_id(self, app_id: str) -> Optional[str]:
+        """Retorna o nome interno do perfil de um AppID (ou None)."""
+        names = get_profile_index().find_by_app_id(app_id)
+        return names[0] if names else None
+    
     def get_default_values(self) -> Dict[str, Any]:
         """Retorna valores padrao para os campos do formulario."""
         if platform.system() == "Windows":
@@ -22,7 +22,15 @@ class ConfigService(Protocol):
         ...
     
     def load_game_config(self, game_name_internal: str, profiles_dir: Path) -> Optional[Dict[str, Any]]:
-        """Carrega a configuracao de um jogo"""
+        """Carrega a configuracao de um jogo (mesmas chaves aceitas por save_game_config)"""
+        ...
+    
+    def list_game_configs(self, search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Lista os perfis configurados (dados do indice de perfis)"""
+        ...
+    
+    def find_game_config_by_app_id(self, app_id: str) -> Optional[str]:
+        """Retorna o nome interno do perfil de um AppID"""
         ...
     
     def get_default_values(self) -> Dict[str, Any]:
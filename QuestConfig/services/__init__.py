@@ -10,6 +10,8 @@ from typing import Dict, Any, Optional
 
 from ..interfaces.services import ConfigService, GameInfoService, SaveDetectorService, ShortcutService
 from ..core.config import AppConfigService
+from .http_cache import HttpCache, get_http_cache
+from .http_session import get_http_session
 from .steam import SteamService
 from .pcgamingwiki import PCGamingWikiService
 from .save import SaveDetectorService as SaveDetectorServiceImpl
@@ -19,13 +21,24 @@ from .shortcut import ShortcutCreatorService
 class ServiceFactory:
     """Factory para criar instancias de servicos."""
     
+    def __init__(self, http_session=None, http_cache: Optional[HttpCache] = None):
+        """
+        Args:
+            http_session: Sessao HTTP compartilhada pelos servicos (padrao: get_http_session())
+            http_cache: Cache das respostas HTTP (padrao: cache compartilhado, ou um
+                cache proprio quando a sessao e informada)
+        """
+        self.http_session = http_session or get_http_session()
+        if http_cache is None:
+            http_cache = HttpCache(session=http_session) if http_session else get_http_cache()
+        self.http_cache = http_cache
+    
     @staticmethod
     def create_config_service(app_paths: Dict[str, Path]) -> ConfigService:
         """Cria uma instancia do servico de configuracao."""
         return AppConfigService(app_paths)
     
-    @staticmethod
-    def create_game_info_service(service_name: str = "steam") -> GameInfoService:
+    def create_game_info_service(self, service_name: str = "steam") -> GameInfoService:
         """
         Cria uma instancia do servico de informacoes de jogos.
         
@@ -36,9 +49,9 @@ class ServiceFactory:
             Servico de informacoes de jogos
         """
         if service_name.lower() == "pcgamingwiki":
-            return PCGamingWikiService()
+            return PCGamingWikiService(self.http_session, self.http_cache)
         else:
-            return SteamService()
+            return SteamService(self.http_session, self.http_cache)
     
     @staticmethod
     def create_save_detector_service(executable_path: Optional[str] = None) -> SaveDetectorService:
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python3
+"""
+Cache persistente das respostas HTTP das APIs consultadas (PCGamingWiki, Steam).
+
+Cada requisicao (URL + parametros) e guardada em um arquivo JSON proprio em
+HTTP_CACHE_DIR. Dentro do prazo (TTL) a resposta e devolvida sem acessar a
+rede; depois dele, a requisicao e revalidada com If-None-Match/If-Modified-Since
+quando o servidor informou ETag/Last-Modified. Respostas que indicam que o
+jogo nao existe (404 ou o criterio 'is_miss' do chamador) tambem sao guardadas,
+com um prazo menor, para que AppIDs desconhecidos nao sejam consultados a cada
+abertura. Sem rede, uma resposta vencida ainda e usada.
+"""
+
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+
+from CloudQuest.config.settings import HTTP_CACHE_DIR
+from CloudQuest.utils.fileio import write_json_atomic
+
+from ..utils.logger import write_log
+from .http_session import get_http_session
+
+DEFAULT_TTL = 24 * 3600  # segundos
+NEGATIVE_TTL = 24 * 3600  # segundos para respostas de "nao encontrado"
+MISS_STATUSES = (404, 410)
+
+
+class HttpCache:
+    """Cache de respostas JSON em disco, com revalidacao condicional."""
+
+    def __init__(self, directory: Path = HTTP_CACHE_DIR, session: Optional[requests.Session] = None):
+        """
+        Args:
+            directory: Diretorio dos arquivos de cache
+            session: Sessao HTTP usada nas requisicoes (padrao: sessao compartilhada)
+        """
+        self.directory = Path(directory)
+        self.session = session or get_http_session()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Chave da requisicao (URL e parametros em ordem)."""
+        request = url
+        if params:
+            request += "?" + urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+        return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None, ttl: float = DEFAULT_TTL,
+                 negative_ttl: float = NEGATIVE_TTL, is_miss: Optional[Callable[[Any], bool]] = None,
+                 headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Retorna a resposta JSON de uma requisicao GET, usando o cache quando possivel.
+
+        Args:
+            url: URL da requisicao
+            params: Parametros da query string
+            ttl: Segundos em que uma resposta e usada sem revalidar
+            negative_ttl: Segundos em que um "nao encontrado" e usado sem revalidar
+            is_miss: Indica se uma resposta valida significa "nao encontrado"
+            headers: Cabecalhos adicionais
+            timeout: Tempo limite da requisicao (padrao: o da sessao)
+
+        Returns:
+            JSON decodificado ou None se o recurso nao existe (404/410)
+
+        Raises:
+            requests.RequestException: Falha na requisicao sem resposta em cache
+        """
+        key = self.cache_key(url, params)
+        entry = self._load(key)
+        now = time.time()
+
+        if entry is not None:
+            max_age = negative_ttl if entry.get('miss') else ttl
+            if now - entry.get('stored_at', 0) < max_age:
+                return entry.get('data')
+
+        request_headers = dict(headers or {})
+        if entry is not None and not entry.get('miss'):
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+            if response.status_code == 304 and entry is not None:
+                entry['stored_at'] = now
+                self._store(key, entry)
+                write_log(f"Cache HTTP revalidado: {url}", level='DEBUG')
+                return entry.get('data')
+
+            if response.status_code in MISS_STATUSES:
+                data, miss = None, True
+            else:
+                response.raise_for_status()
+                data = response.json()
+                miss = bool(is_miss and is_miss(data))
+        except (requests.RequestException, ValueError) as e:
+            if entry is not None:
+                write_log(f"Usando resposta em cache vencida para {url}: {str(e)}", level='WARNING')
+                return entry.get('data')
+            raise
+
+        self._store(key, {
+            'url': url,
+            'params': params,
+            'stored_at': now,
+            'miss': miss,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'data': data
+        })
+        return data
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        try:
+            with open(self.directory / f"{key}.json", 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.directory / f"{key}.json", entry, ensure_ascii=False)
+        except (OSError, TypeError, ValueError) as e:
+            write_log(f"Falha ao gravar cache HTTP: {str(e)}", level='WARNING')
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Cache HTTP compartilhado pelos servicos (usa a sessao HTTP compartilhada)."""
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache()
+        return _http_cache
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python3
+"""
+Sessao HTTP compartilhada pelos servicos do QuestConfig.
+
+Uma unica requests.Session mantem as conexoes abertas (keep-alive, um pool
+por host), de modo que as consultas em sequencia a PCGamingWiki e a Steam
+reaproveitam a conexao TCP/TLS. A sessao tambem define o User-Agent, o tempo
+limite padrao e repete as requisicoes que recebem 429 ou 5xx, com espera
+crescente (respeitando o Retry-After).
+"""
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "QuestConfig/1.0 (+https://github.com/Mallor705/CloudQuest)"
+DEFAULT_TIMEOUT = (5, 15)  # segundos (conexao, leitura)
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5  # segundos; dobra a cada tentativa
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_HOSTS = 10  # hosts com pool de conexoes mantido
+POOL_SIZE = 4  # conexoes por host
+
+
+class PooledSession(requests.Session):
+    """requests.Session com tempo limite padrao."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        """
+        Args:
+            timeout: Tempo limite usado quando a requisicao nao informa um
+        """
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().request(method, url, **kwargs)
+
+
+def create_http_session(user_agent: str = USER_AGENT, timeout=DEFAULT_TIMEOUT,
+                        retries: int = RETRY_TOTAL) -> requests.Session:
+    """
+    Cria uma sessao HTTP com pool de conexoes e repeticao automatica.
+
+    Args:
+        user_agent: User-Agent enviado em todas as requisicoes
+        timeout: Tempo limite padrao (segundos ou tupla conexao/leitura)
+        retries: Tentativas adicionais em falhas de conexao, 429 e 5xx
+
+    Returns:
+        requests.Session: Sessao configurada
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = PooledSession(timeout)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers['User-Agent'] = user_agent
+    return session
+
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Sessao HTTP compartilhada (criada na primeira chamada)."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = create_http_session()
+        return _http_session
@@ -14,14 +14,27 @@ from typing import Dict, List, Optional, Any
 
 from ..utils.logger import write_log
 from ..interfaces.services import GameInfoService
+from .http_cache import HttpCache, get_http_cache
+from .http_session import get_http_session
+
+# Prazos do cache das respostas (segundos); "nao encontrado" usa o prazo padrao do cache
+PAGE_ID_TTL = 30 * 24 * 3600
+WIKITEXT_TTL = 7 * 24 * 3600
+STEAM_STORE_TTL = 7 * 24 * 3600
 
 
 class PCGamingWikiService(GameInfoService):
     """Servico para consultar informacoes na PCGamingWiki."""
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, http_cache: Optional[HttpCache] = None):
+        """
+        Args:
+            session: Sessao HTTP (padrao: sessao compartilhada)
+            http_cache: Cache das respostas HTTP (padrao: cache compartilhado)
+        """
         self.base_url = "https://www.pcgamingwiki.com/w/api.php"
-        self.user_agent = "QuestConfig/1.0 (+https://github.com/Mallor705/CloudQuest)"
+        self.session = session or get_http_session()
+        self.http_cache = http_cache or (HttpCache(session=session) if session else get_http_cache())
     
     def get_game_info_by_steam_appid(self, app_id: str) -> Optional[Dict]:
         """
@@ -72,8 +85,7 @@ class PCGamingWikiService(GameInfoService):
             }
             
             # Fazer a consulta
-            headers = {'User-Agent': self.user_agent}
-            response = requests.get(self.base_url, params=params, headers=headers, timeout=10)
+            response = self.session.get(self.base_url, params=params)
             
             if response.status_code != 200:
                 write_log(f"Resposta invalida da PCGamingWiki: {response.status_code}", level='WARNING')
@@ -120,14 +132,12 @@ class PCGamingWikiService(GameInfoService):
         }
         
         try:
-            response = requests.get(
-                url, 
+            data = self.http_cache.get_json(
+                url,
                 params=params,
-                headers={'User-Agent': self.user_agent},
-                timeout=15
+                ttl=PAGE_ID_TTL,
+                is_miss=lambda data: not (data and data.get("cargoquery")),
             )
-            response.raise_for_status()
-            data = response.json()
             
             if data and "cargoquery" in data and len(data["cargoquery"]) > 0:
                 write_log(f"PCGamingWiki: Encontrado PageID para AppID {steam_app_id}")
@@ -158,16 +168,14 @@ class PCGamingWikiService(GameInfoService):
         }
         
         try:
-            response = requests.get(
-                url, 
+            data = self.http_cache.get_json(
+                url,
                 params=params,
-                headers={'User-Agent': self.user_agent},
-                timeout=15
+                ttl=WIKITEXT_TTL,
+                is_miss=lambda data: not (data and "*" in data.get("parse", {}).get("wikitext", {})),
             )
-            response.raise_for_status()
-            data = response.json()
 
-            if "parse" in data and "wikitext" in data["parse"] and "*" in data["parse"]["wikitext"]:
+            if data and "parse" in data and "wikitext" in data["parse"] and "*" in data["parse"]["wikitext"]:
                 write_log(f"PCGamingWiki: Wikitext obtido para PageID {page_id}")
                 return data["parse"]["wikitext"]["*"]
             else:
@@ -860,14 +868,13 @@ class PCGamingWikiService(GameInfoService):
         """
         try:
             url = f"https://store.steampowered.com/api/appdetails?appids={app_id}"
-            headers = {'User-Agent': self.user_agent}
-            response = requests.get(url, headers=headers, timeout=5)
+            data = self.http_cache.get_json(
+                url,
+                ttl=STEAM_STORE_TTL,
+                is_miss=lambda data: not (data or {}).get(app_id, {}).get('success', False)
+            )
             
-            if response.status_code != 200:
-                return None
-                
-            data = response.json()
-            if data.get(app_id, {}).get('success', False):
+            if data and data.get(app_id, {}).get('success', False):
                 return data[app_id]['data']
             return None
         except Exception:
@@ -13,14 +13,21 @@ from typing import Dict, List, Optional, Any
 from ..interfaces.services import GameInfoService
 from ..utils.logger import write_log
 from ..utils.text_utils import normalize_game_name
-from .pcgamingwiki import PCGamingWikiService
+from .http_cache import HttpCache, get_http_cache
+from .pcgamingwiki import PCGamingWikiService, STEAM_STORE_TTL
 
 
 class SteamService:
     """Implementacao do servico de informacoes de jogos da Steam."""
     
-    def __init__(self):
-        self.pcgaming_wiki = PCGamingWikiService()
+    def __init__(self, session: Optional[requests.Session] = None, http_cache: Optional[HttpCache] = None):
+        """
+        Args:
+            session: Sessao HTTP (padrao: sessao compartilhada)
+            http_cache: Cache das respostas HTTP (padrao: cache compartilhado)
+        """
+        self.http_cache = http_cache or (HttpCache(session=session) if session else get_http_cache())
+        self.pcgaming_wiki = PCGamingWikiService(session, self.http_cache)
     
     def detect_appid_from_file(self, executable_path: str) -> Optional[str]:
         """
@@ -64,11 +71,13 @@ class SteamService:
         
         try:
             write_log(f"Consultando API Steam para AppID: {app_id}")
-            headers = {'User-Agent': 'QuestConfig/1.0'}
-            response = requests.get(api_url, headers=headers, timeout=15)
-            data = response.json()
+            data = self.http_cache.get_json(
+                api_url,
+                ttl=STEAM_STORE_TTL,
+                is_miss=lambda data: not (data or {}).get(app_id, {}).get('success', False)
+            )
             
-            if data[app_id]['success'] and data[app_id]['data']:
+            if data and data[app_id]['success'] and data[app_id]['data']:
                 game_name = data[app_id]['data']['name']
                 
                 # Buscar local de save utilizando o PCGamingWiki
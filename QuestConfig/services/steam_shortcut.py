@@ -2,7 +2,6 @@ import os
 import sys
 import platform
 import binascii
-import requests
 import json
 from urllib.parse import urlparse
 from pathlib import Path
@@ -21,6 +20,12 @@ if platform.system() == "Windows":
     except ImportError:
         print("O módulo 'winreg' não pôde ser importado. Se você estiver no Windows, isso pode ser um problema.")
 
+try:
+    from .http_session import get_http_session
+except ImportError:
+    # Executado diretamente como script
+    from http_session import get_http_session
+
 # Configuração da API do SteamGridDB
 STEAMGRIDDB_API_URL = "https://www.steamgriddb.com/api/v2"
 STEAMGRIDDB_API_KEY = None  # Será definida pelo usuário
@@ -42,7 +47,7 @@ def get_steamgriddb_api_key():
             return False
     return True
 
-def search_game_steamgriddb(game_name):
+def search_game_steamgriddb(game_name, session=None):
     """Busca um jogo no SteamGridDB pelo nome."""
     if not STEAMGRIDDB_API_KEY:
         return None
@@ -51,8 +56,8 @@ def search_game_steamgriddb(game_name):
     params = {"term": game_name}
     
     try:
-        response = requests.get(f"{STEAMGRIDDB_API_URL}/search/autocomplete", 
-                              headers=headers, params=params, timeout=10)
+        response = (session or get_http_session()).get(f"{STEAMGRIDDB_API_URL}/search/autocomplete",
+                                                       headers=headers, params=params)
         response.raise_for_status()
         
         data = response.json()
@@ -64,12 +69,13 @@ def search_game_steamgriddb(game_name):
     
     return None
 
-def get_game_assets_steamgriddb(game_id):
+def get_game_assets_steamgriddb(game_id, session=None):
     """Obtém os assets de um jogo do SteamGridDB."""
     if not STEAMGRIDDB_API_KEY:
         return {}
     
     headers = {"Authorization": f"Bearer {STEAMGRIDDB_API_KEY}"}
+    session = session or get_http_session()
     assets = {}
     
     # Tipos de assets disponíveis
@@ -82,8 +88,8 @@ def get_game_assets_steamgriddb(game_id):
     
     for endpoint, asset_type in asset_types.items():
         try:
-            response = requests.get(f"{STEAMGRIDDB_API_URL}/{endpoint}/game/{game_id}",
-                                  headers=headers, timeout=10)
+            response = session.get(f"{STEAMGRIDDB_API_URL}/{endpoint}/game/{game_id}",
+                                   headers=headers)
             response.raise_for_status()
             
             data = response.json()
@@ -95,10 +101,10 @@ def get_game_assets_steamgriddb(game_id):
     
     return assets
 
-def download_asset(url, filepath):
+def download_asset(url, filepath, session=None):
     """Baixa um asset de uma URL para um arquivo local."""
     try:
-        response = requests.get(url, timeout=30)
+        response = (session or get_http_session()).get(url, timeout=30)
         response.raise_for_status()
         
         with open(filepath, 'wb') as f:
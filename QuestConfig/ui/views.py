@@ -289,14 +289,19 @@ class QuestConfigView:
         # Configurar tema
         AppTheme.setup_theme()
         
-        # Inicializar servicos
-        from ..services import ServiceFactory
-        factory = ServiceFactory()
-        
-        self.config_service = config_service or factory.create_config_service(app_paths)
-        self.steam_service = steam_service or factory.create_game_info_service("steam")
-        self.pcgamingwiki_service = pcgamingwiki_service or factory.create_game_info_service("pcgamingwiki")
-        self.shortcut_service = shortcut_service or factory.create_shortcut_service(app_paths.get('batch_path'))
+        # Inicializar servicos (a factory so e criada se algum servico nao foi informado)
+        if not all((config_service, steam_service, pcgamingwiki_service, shortcut_service)):
+            from ..services import ServiceFactory
+            factory = ServiceFactory()
+            config_service = config_service or factory.create_config_service(app_paths)
+            steam_service = steam_service or factory.create_game_info_service("steam")
+            pcgamingwiki_service = pcgamingwiki_service or factory.create_game_info_service("pcgamingwiki")
+            shortcut_service = shortcut_service or factory.create_shortcut_service(app_paths.get('batch_path'))
+        
+        self.config_service = config_service
+        self.steam_service = steam_service
+        self.pcgamingwiki_service = pcgamingwiki_service
+        self.shortcut_service = shortcut_service
         
         # Variaveis de entrada
         self.executable_path = ctk.StringVar()
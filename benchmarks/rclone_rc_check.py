@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Verificacao do transporte rc do Rclone.
+
+Inicia um daemon 'rclone rcd' isolado (diretorios de usuario temporarios),
+copia um diretorio com run_job para o remote ':local:' e confere os arquivos
+no destino, o tempo de cada copia e que o daemon so e verificado (rc/noop) uma
+vez por processo. O daemon e encerrado no fim. Sem o executavel do Rclone, a
+verificacao e ignorada (codigo de saida 0).
+
+Uso:
+    python benchmarks/rclone_rc_check.py [--rclone CAMINHO] [--files N] [--runs N]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+
+def isolate_user_dirs(home):
+    """Aponta os diretorios do usuario para 'home' (antes de importar o CloudQuest)."""
+    for name in ("HOME", "APPDATA", "LOCALAPPDATA", "USERPROFILE"):
+        os.environ[name] = home
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificacao do transporte rc do Rclone")
+    parser.add_argument('--rclone', default=shutil.which("rclone"), help="Executavel do Rclone (padrao: PATH)")
+    parser.add_argument('--files', type=int, default=20, help="Arquivos copiados por execucao")
+    parser.add_argument('--runs', type=int, default=3, help="Copias executadas")
+    args = parser.parse_args()
+
+    if not args.rclone or not os.path.exists(args.rclone):
+        print("Rclone nao encontrado: verificacao ignorada")
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="cloudquest_rc_") as home:
+        isolate_user_dirs(home)
+        sys.path.insert(0, str(REPO_DIR))
+        from CloudQuest.utils.paths import ensure_app_dirs
+        from CloudQuest.utils.rclone_rc import get_daemon, stop_daemon
+        ensure_app_dirs()
+
+        source = Path(home) / "source"
+        source.mkdir()
+        for index in range(args.files):
+            (source / f"save_{index}.dat").write_bytes(os.urandom(4096))
+
+        probes = 0
+        problems = []
+        try:
+            daemon = get_daemon(args.rclone)
+            original_call = daemon.call
+
+            def counting_call(method, *call_args, **call_kwargs):
+                nonlocal probes
+                if method == 'rc/noop':
+                    probes += 1
+                return original_call(method, *call_args, **call_kwargs)
+
+            daemon.call = counting_call
+
+            for run in range(max(1, args.runs)):
+                destination = Path(home) / f"destination_{run}"
+                start = time.perf_counter()
+                get_daemon(args.rclone).run_job('sync/copy', {
+                    'srcFs': str(source),
+                    'dstFs': f":local:{destination}"
+                })
+                elapsed = time.perf_counter() - start
+                copied = sorted(path.name for path in destination.iterdir()) if destination.exists() else []
+                print(f"Copia {run + 1}: {len(copied)} arquivos em {elapsed * 1000:.1f} ms")
+                if copied != sorted(path.name for path in source.iterdir()):
+                    problems.append(f"copia {run + 1} incompleta ({len(copied)} de {args.files} arquivos)")
+        finally:
+            stop_daemon()
+
+        if probes:
+            problems.append(f"{probes} verificacoes rc/noop apos o inicio do daemon")
+
+    for problem in problems:
+        print(f"FALHA: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CloudQuest - Benchmark do tempo de inicializacao.
+
+Mede com 'python -X importtime' o custo de importar o ponto de entrada (o que
+toda execucao pelo atalho do Steam paga antes de qualquer trabalho util) e
+registra o resultado em um historico JSONL, para acompanhar a evolucao entre
+versoes. Tambem verifica que a importacao nao carrega bibliotecas pesadas
+(interface grafica, psutil, watchdog) e nao cria arquivos ou diretorios.
+
+Uso:
+    python benchmarks/startup_benchmark.py [--runs N] [--module MODULO]
+        [--history ARQUIVO] [--no-record] [--max-regression PORCENTAGEM]
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_HISTORY = Path(__file__).resolve().parent / "startup_history.jsonl"
+DEFAULT_MODULE = "CloudQuest.main"
+# Modulos que nao devem ser carregados apenas por importar o ponto de entrada
+LAZY_MODULES = ("customtkinter", "tkinter", "PIL", "psutil", "watchdog", "requests")
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module):
+    """
+    Importa o modulo em um processo novo, com diretorios de usuario vazios.
+
+    Args:
+        module (str): Modulo a importar
+
+    Returns:
+        dict: total (us), modulos {nome: cumulativo em us} e arquivos criados
+    """
+    with tempfile.TemporaryDirectory(prefix="cloudquest_startup_") as home:
+        env = dict(os.environ, HOME=home, APPDATA=home, USERPROFILE=home, PYTHONDONTWRITEBYTECODE="1")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_DIR, env=env, capture_output=True, text=True
+        )
+        created = sorted(str(path.relative_to(home)) for path in Path(home).rglob("*"))
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    if result.returncode != 0 or module not in modules:
+        raise RuntimeError(f"Falha ao importar {module}:\n{result.stderr[-2000:]}")
+
+    return {'total': modules[module], 'modules': modules, 'created': created}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def last_record(history_file, module):
+    """Ultimo registro do historico para o mesmo modulo e interpretador."""
+    try:
+        with open(history_file, 'r', encoding='utf-8') as file:
+            records = [json.loads(line) for line in file if line.strip()]
+    except (OSError, ValueError):
+        return None
+    records = [record for record in records
+               if record.get('module') == module and record.get('python') == platform.python_version()]
+    return records[-1] if records else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de inicializacao do CloudQuest")
+    parser.add_argument('--runs', type=int, default=7, help="Execucoes (a mediana e registrada)")
+    parser.add_argument('--module', default=DEFAULT_MODULE, help=f"Modulo medido (padrao: {DEFAULT_MODULE})")
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY, help="Arquivo de historico (JSONL)")
+    parser.add_argument('--no-record', action='store_true', help="Nao gravar o resultado no historico")
+    parser.add_argument('--top', type=int, default=10, help="Modulos mais caros exibidos")
+    parser.add_argument('--max-regression', type=float, metavar='PORCENTAGEM',
+                        help="Falhar se a mediana piorar mais que isso em relacao ao ultimo registro")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    totals = sorted(run['total'] for run in runs)
+    median_run = min(runs, key=lambda run: abs(run['total'] - statistics.median(totals)))
+
+    print(f"{args.module}: mediana {statistics.median(totals) / 1000:.1f} ms, "
+          f"minimo {totals[0] / 1000:.1f} ms ({len(runs)} execucoes, {len(median_run['modules'])} modulos)")
+    print("Modulos mais caros (cumulativo):")
+    heaviest = sorted(((us, name) for name, us in median_run['modules'].items() if name != args.module),
+                      reverse=True)[:args.top]
+    for us, name in heaviest:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    problems = []
+    loaded = sorted({name.split('.')[0] for name in median_run['modules']} & set(LAZY_MODULES))
+    if loaded:
+        problems.append(f"bibliotecas carregadas na importacao: {', '.join(loaded)}")
+    if median_run['created']:
+        problems.append(f"arquivos criados na importacao: {', '.join(median_run['created'])}")
+
+    previous = last_record(args.history, args.module)
+    median_ms = statistics.median(totals) / 1000
+    if previous:
+        change = (median_ms - previous['median_ms']) / previous['median_ms'] * 100
+        print(f"Ultimo registro ({previous.get('revision') or '?'}, {previous['date']}): "
+              f"{previous['median_ms']:.1f} ms ({change:+.1f}%)")
+        if args.max_regression is not None and change > args.max_regression:
+            problems.append(f"regressao de {change:.1f}% (limite: {args.max_regression}%)")
+
+    if not args.no_record:
+        record = {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'module': args.module,
+            'python': platform.python_version(),
+            'platform': platform.system(),
+            'median_ms': round(median_ms, 2),
+            'min_ms': round(totals[0] / 1000, 2),
+            'modules': len(median_run['modules']),
+            'heaviest': {name: round(us / 1000, 2) for us, name in heaviest[:5]}
+        }
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record) + "\n")
+
+    for problem in problems:
+        print(f"ERRO: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())